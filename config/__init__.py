@@ -1,12 +1,13 @@
 import os
-from google.cloud import bigquery
+from scripts.data_processing.storage import get_backend
 
 # Set up authentication
 SERVICE_ACCOUNT_PATH = os.path.join(os.path.dirname(__file__), "cloud_credentials.json")
-os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = SERVICE_ACCOUNT_PATH
+os.environ.setdefault("GOOGLE_APPLICATION_CREDENTIALS", SERVICE_ACCOUNT_PATH)
 
-# Initialize BigQuery Client
-client = bigquery.Client()
+# Storage backend: BigQuery by default, MAGICIAN_BACKEND=local for DuckDB over local Parquet.
+# Shared with every other module; the BigQuery client itself is only created on first query.
+backend = get_backend()
 
 # Define dataset and table path
 PROJECT_ID = "cloud4marketing-281206"
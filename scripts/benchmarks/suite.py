@@ -0,0 +1,279 @@
+"""
+⏱️ Offline benchmark suite for the indicator pipeline.
+
+Every run generates deterministic synthetic prices (`scripts.benchmarks.synthetic`), serves
+them from a throwaway `LocalBackend`, and times + memory-profiles each stage at each size:
+
+    python -m scripts.benchmarks.suite run [--sizes small,medium] [--stages ...] [--repeat 3]
+    python -m scripts.benchmarks.suite compare OLD.json NEW.json [--threshold 0.1]
+
+`run` writes one JSON file (default: benchmark_results/<utc time>-<commit>.json); `compare`
+prints both runs side by side and exits non-zero if any stage got slower or hungrier than
+`threshold` allows.
+"""
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+from contextlib import redirect_stdout
+import numpy as np
+import pandas as pd
+from scripts.benchmarks.synthetic import DEFAULT_END, synthetic_prices
+
+# 📏 Sizes: (assets, hours). Everything stays inside the 6-month price retention window.
+SIZES = {
+    "small": (5, 720),
+    "medium": (20, 2160),
+    "large": (50, 4320),
+}
+DEFAULT_SIZES = ["small", "medium"]
+
+RESULTS_DIR = "benchmark_results"
+REPEAT = 3
+THRESHOLD = 0.10          # Allowed slowdown / memory growth before `compare` calls it a regression
+MIN_SECONDS = 0.25        # Below this, run-to-run noise alone can exceed the threshold
+MIN_PEAK_MB = 1.0
+
+# Far enough that no partition of the synthetic store ever counts as stale
+NEVER_STALE = pd.Timedelta(days=365 * 100)
+
+
+# 🏗️ Stages: setup (untimed, before every repeat) and run (timed). Each run returns (result, rows).
+def _ingest_setup(ctx):
+    from scripts.indicators.feature_store import FeatureStore
+    shutil.rmtree(os.path.join(ctx["workdir"], "prices"), ignore_errors=True)
+    ctx["price_store"] = FeatureStore(os.path.join(ctx["workdir"], "prices"))
+
+
+def _ingest(ctx):
+    """Incremental pull from the backend into an empty price store, then the full read-back."""
+    from scripts.data_processing.fetch_prices import sync_prices
+    from scripts.indicators.schema import PRICE_SCHEMA, apply_schema
+    sync_prices(backend=ctx["backend"], store=ctx["price_store"], now=ctx["now"])
+    ctx["prices"] = apply_schema(ctx["price_store"].read(), PRICE_SCHEMA)
+    return ctx["prices"], len(ctx["prices"])
+
+
+def _compute_indicators(ctx):
+    from scripts.indicators.compute_indicators import compute_indicators
+    ctx["indicators"] = compute_indicators(ctx["prices"], seed_state=False)
+    return ctx["indicators"], len(ctx["indicators"])
+
+
+def _store_write_setup(ctx):
+    from scripts.indicators.feature_store import STORE_ROOT
+    from scripts.indicators.arrow_cache import ARROW_CACHE_FILE
+    shutil.rmtree(STORE_ROOT, ignore_errors=True)
+    if os.path.exists(ARROW_CACHE_FILE):
+        os.remove(ARROW_CACHE_FILE)
+
+
+def _store_write(ctx):
+    from scripts.data_processing.storage import cache_root
+    from scripts.indicators.feature_store import STORE_ROOT, FeatureStore
+    FeatureStore(cache_root(STORE_ROOT, ctx["backend"])).write(ctx["indicators"], now=ctx["now"])
+    return None, len(ctx["indicators"])
+
+
+def _load_indicators(ctx):
+    """`load_indicators` from the feature store; the first repeat also builds the Arrow cache."""
+    from scripts.indicators.setup_indicators import load_indicators
+    df = load_indicators(max_age=NEVER_STALE, backend=ctx["backend"])
+    return df, len(df)
+
+
+def _optimal_timeframe(ctx):
+    """`get_optimal_timeframe` for one asset (its cost depends on history length, not asset count)."""
+    from scripts.indicators.compute_indicators import get_optimal_timeframe
+    indicators = ctx["indicators"]
+    first = indicators["asset"].astype(str) == indicators["asset"].astype(str).iloc[0]
+    asset_data = indicators[first].reset_index(drop=True)
+    return get_optimal_timeframe(asset_data), len(asset_data)
+
+
+STAGES = {
+    "ingest": (_ingest_setup, _ingest),
+    "compute_indicators": (None, _compute_indicators),
+    "store_write": (_store_write_setup, _store_write),
+    "load_indicators": (None, _load_indicators),
+    "optimal_timeframe": (None, _optimal_timeframe),
+}
+
+
+def measure(stage, ctx, repeat=REPEAT):
+    """
+    Times `repeat` runs of a stage, then runs it once more under tracemalloc for the peak of
+    Python + NumPy allocations (tracing slows code down, so it never overlaps the timings).
+    """
+    setup, run = STAGES[stage]
+    seconds, cpu_seconds = [], []
+    for _ in range(repeat):
+        if setup:
+            setup(ctx)
+        started, cpu_started = time.perf_counter(), time.process_time()
+        with redirect_stdout(io.StringIO()):
+            _, rows = run(ctx)
+        seconds.append(time.perf_counter() - started)
+        cpu_seconds.append(time.process_time() - cpu_started)
+
+    if setup:
+        setup(ctx)
+    tracemalloc.start()
+    with redirect_stdout(io.StringIO()):
+        run(ctx)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(seconds)
+    return {
+        "stage": stage,
+        "seconds": best,
+        "cpu_seconds": min(cpu_seconds),
+        "all_seconds": seconds,
+        "peak_mb": peak / 1024 ** 2,
+        "rows": int(rows),
+        "rows_per_second": rows / best if best else None,
+    }
+
+
+def run_size(size, stages, repeat=REPEAT, seed=0):
+    """Runs the stages (in pipeline order) for one size inside a fresh temporary directory."""
+    from scripts.data_processing.storage import LocalBackend
+    from scripts.data_processing.fetch_prices import RAW_TABLE
+
+    n_assets, hours = SIZES[size]
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            backend = LocalBackend(os.path.join(workdir, "warehouse"))
+            backend.write(synthetic_prices(n_assets, hours, seed=seed), RAW_TABLE)
+            ctx = {"workdir": workdir, "backend": backend, "now": DEFAULT_END + pd.Timedelta(hours=1)}
+
+            # Every stage needs the outputs of the ones before it, even when it isn't being measured
+            results = []
+            for stage in STAGES:
+                if stage in stages:
+                    result = measure(stage, ctx, repeat)
+                    results.append({"size": size, "assets": n_assets, "hours": hours, **result})
+                    print(f"  {size:<7} {stage:<20} {result['seconds']:8.3f}s  {result['peak_mb']:8.1f} MB peak")
+                else:
+                    setup, run = STAGES[stage]
+                    if setup:
+                        setup(ctx)
+                    with redirect_stdout(io.StringIO()):
+                        run(ctx)
+                if all(s in [r["stage"] for r in results] for s in stages):
+                    break
+        finally:
+            os.chdir(original_cwd)
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    import sklearn
+    import pyarrow
+    return {
+        "commit": commit,
+        "created_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "pyarrow": pyarrow.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def run_suite(sizes=DEFAULT_SIZES, stages=None, repeat=REPEAT, output=None, seed=0):
+    """Runs the suite and writes the results JSON. Returns the path written."""
+    stages = list(stages or STAGES)
+    unknown = [s for s in stages if s not in STAGES] + [s for s in sizes if s not in SIZES]
+    if unknown:
+        raise ValueError(f"🤨 Unknown stage/size {unknown}. Stages: {list(STAGES)}, sizes: {list(SIZES)}")
+
+    env = environment()
+    print(f"⏱️ Benchmarking {stages} at sizes {sizes} ({repeat} repeats, commit {env['commit']})")
+    results = []
+    for size in sizes:
+        results.extend(run_size(size, stages, repeat, seed))
+
+    output = output or os.path.join(
+        RESULTS_DIR, f"{pd.Timestamp(env['created_at']).strftime('%Y%m%dT%H%M%S')}-{env['commit']}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"environment": env, "seed": seed, "repeat": repeat, "results": results}, f, indent=2)
+    print(f"💾 Results written to {output}")
+    return output
+
+
+def compare(old_path, new_path, threshold=THRESHOLD):
+    """
+    Lines up two result files by (size, stage).
+
+    Returns:
+        pd.DataFrame: Old/new seconds and peak MB, their ratios, and a `regression` flag (time
+        or memory up by more than `threshold`, ignoring measurements too small to trust).
+    """
+    frames = []
+    for path in (old_path, new_path):
+        with open(path) as f:
+            frames.append(pd.DataFrame(json.load(f)["results"])[["size", "stage", "seconds", "peak_mb"]])
+    df = frames[0].merge(frames[1], on=["size", "stage"], suffixes=("_old", "_new"))
+
+    df["time_ratio"] = df["seconds_new"] / df["seconds_old"]
+    df["memory_ratio"] = df["peak_mb_new"] / df["peak_mb_old"]
+    slower = (df["time_ratio"] > 1 + threshold) & (df["seconds_new"] >= MIN_SECONDS)
+    hungrier = (df["memory_ratio"] > 1 + threshold) & (df["peak_mb_new"] >= MIN_PEAK_MB)
+    df["regression"] = np.select([slower & hungrier, slower, hungrier], ["time+memory", "time", "memory"], "")
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the indicator pipeline.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks and write a results JSON")
+    run.add_argument("--sizes", default=",".join(DEFAULT_SIZES), help=f"Comma-separated, from {list(SIZES)}")
+    run.add_argument("--stages", default=",".join(STAGES), help=f"Comma-separated, from {list(STAGES)}")
+    run.add_argument("--repeat", type=int, default=REPEAT)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--output", default=None)
+
+    cmp = commands.add_parser("compare", help="Compare two result files and flag regressions")
+    cmp.add_argument("old")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=THRESHOLD)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        run_suite(args.sizes.split(","), args.stages.split(","), args.repeat, args.output, args.seed)
+        return 0
+
+    df = compare(args.old, args.new, args.threshold)
+    with pd.option_context("display.width", 200, "display.float_format", "{:.3f}".format):
+        print(df.to_string(index=False))
+    regressions = df[df["regression"] != ""]
+    if len(regressions):
+        print(f"❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        return 1
+    print(f"✅ No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
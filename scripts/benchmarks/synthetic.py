@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from scripts.indicators.schema import PRICE_SCHEMA, apply_schema
+
+# 🧪 Synthetic `coinbase_hourly_prices` defaults
+DEFAULT_END = pd.Timestamp("2025-01-01 00:00", tz="UTC")  # Last bar (fixed, so runs are comparable)
+GAP_RATE = 0.002       # Chance that an outage (1-12 missing bars) starts at any given hour
+SPIKE_RATE = 0.001     # Chance of a one-bar price spike (a wick of 10-30%) at any given hour
+MAX_GAP_HOURS = 12
+
+
+def synthetic_asset(asset_index, hours, end=DEFAULT_END, seed=0, gap_rate=GAP_RATE, spike_rate=SPIKE_RATE):
+    """
+    Hourly OHLCV bars for one synthetic asset: a geometric random walk with its own start price
+    and volatility, lognormal volume, occasional spikes, and outages (missing bars).
+
+    The bars of asset `i` depend only on (`seed`, `i`, `hours`, `end`), so adding assets never
+    changes the existing ones.
+    """
+    rng = np.random.default_rng([seed, asset_index])
+    start_price = float(np.exp(rng.uniform(np.log(0.05), np.log(50_000))))
+    volatility = rng.uniform(0.004, 0.02)
+
+    log_returns = rng.normal(0.0, volatility, size=hours)
+    close = start_price * np.exp(np.cumsum(log_returns))
+    open_ = np.concatenate([[start_price], close[:-1]])
+    wick_up = np.abs(rng.normal(0.0, volatility / 2, size=hours))
+    wick_down = np.abs(rng.normal(0.0, volatility / 2, size=hours))
+    high = np.maximum(open_, close) * (1 + wick_up)
+    low = np.minimum(open_, close) * (1 - wick_down)
+    volume = rng.lognormal(mean=np.log(1_000 / np.sqrt(start_price) + 1), sigma=0.6, size=hours)
+
+    # ⚡ Spikes: a wick far outside the usual range, plus a volume burst
+    spikes = np.flatnonzero(rng.random(hours) < spike_rate)
+    size = rng.uniform(0.1, 0.3, size=len(spikes))
+    up = rng.random(len(spikes)) < 0.5
+    high[spikes[up]] *= 1 + size[up]
+    low[spikes[~up]] *= 1 - size[~up]
+    volume[spikes] *= rng.uniform(5, 20, size=len(spikes))
+
+    # 🕳️ Gaps: outages of 1-MAX_GAP_HOURS consecutive missing bars
+    keep = np.ones(hours, dtype=bool)
+    for start in np.flatnonzero(rng.random(hours) < gap_rate):
+        keep[start:start + rng.integers(1, MAX_GAP_HOURS + 1)] = False
+
+    timestamps = pd.date_range(end=end, periods=hours, freq="h")
+    return pd.DataFrame({
+        "asset": f"SYN{asset_index:03d}",
+        "timestamp": timestamps[keep],
+        "open_price": open_[keep],
+        "high_price": high[keep],
+        "low_price": low[keep],
+        "close_price": close[keep],
+        "volume": volume[keep],
+    })
+
+
+def synthetic_prices(n_assets, hours, end=DEFAULT_END, seed=0, gap_rate=GAP_RATE, spike_rate=SPIKE_RATE):
+    """
+    🧪 Deterministic stand-in for `coinbase_hourly_prices`: `n_assets` x `hours` hourly bars
+    (minus gaps) ending at `end`, sorted by asset and timestamp, in the `PRICE_SCHEMA` dtypes.
+    """
+    frames = [synthetic_asset(i, hours, end, seed, gap_rate, spike_rate) for i in range(n_assets)]
+    return apply_schema(pd.concat(frames, ignore_index=True), PRICE_SCHEMA)
@@ -1,22 +1,43 @@
-from google.cloud import bigquery
+import sys
 import os
 
+# Get absolute path to the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from scripts.data_processing.query_executor import run_queries
+from scripts.data_processing.storage import get_backend
+
 # Set up authentication
 os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = "C:/Users/eddie/OneDrive/code/magician/config/cloud4marketing-281206-f732ef8736c7.json"
 
-# Initialize BigQuery Client
-client = bigquery.Client()
+# Storage backend (BigQuery unless MAGICIAN_BACKEND=local)
+backend = get_backend()
 
 # Define dataset
 PROJECT_ID = "cloud4marketing-281206"
 DATASET_ID = "crypto_price"
 
+# Row counts cost one query per table, so they are opt-in: `check_existing_tables.py --row-counts`
+COUNT_ROWS = "--row-counts" in sys.argv[1:]
+
 try:
-    tables = client.list_tables(f"{PROJECT_ID}.{DATASET_ID}")
-    
+    tables = backend.tables(f"{PROJECT_ID}.{DATASET_ID}")
+
     print("\n✅ Tables currently in `crypto_price` dataset:")
-    for table in tables:
-        print(f"- {table.table_id}")
+    if not COUNT_ROWS:
+        for table in tables:
+            print(f"- {table}")
+    else:
+        # Row counts for every table, all submitted at once
+        results = run_queries(
+            {table: f"SELECT COUNT(*) AS row_count FROM `{PROJECT_ID}.{DATASET_ID}.{table}`" for table in tables},
+            backend,
+        )
+        for table, result in results.items():
+            rows = f"{int(result.df['row_count'].iloc[0]):,} rows" if result.ok else f"⚠️ {result.error}"
+            print(f"- {table} ({rows})")
 
 except Exception as e:
     print(f"\n❌ Error fetching tables: {e}")
@@ -0,0 +1,171 @@
+"""
+🏹 Arrow streaming reads.
+
+`read_batches` / `read_frame` pull a table through the backend's `read_table` as a stream of
+Arrow record batches instead of a `SELECT *` that is downloaded page by page over REST:
+
+- BigQuery: a Storage Read API session with several parallel streams. The column selection
+  and row filter are pushed to the server, so only the requested columns of matching rows
+  are ever sent.
+- Local: an Arrow dataset scan of the table's Parquet files (same projection and filters), so
+  the same code runs, and can be tested, offline.
+
+Filters are `(column, op, value)` tuples, as in `pyarrow.parquet` (op: `=`, `!=`, `<`, `<=`,
+`>`, `>=`, `in`, `not in`). They are ANDed together.
+
+`read_frame` casts every batch to the project's compact dtypes (`scripts.indicators.schema`)
+as it arrives, so the full-width float64 copy never exists at once. `read_batches` hands the
+raw stream to streaming consumers such as the data-quality scanner.
+"""
+import queue
+import threading
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from scripts.data_processing.storage import get_backend
+from scripts.indicators.schema import apply_schema
+
+# ⚙️ Defaults
+READ_STREAMS = 4      # Parallel streams per read session (the server may hand out fewer)
+QUEUE_BATCHES = 16    # Decoded batches buffered ahead of the consumer (bounds memory)
+
+# Compact pandas dtype -> the Arrow type a batch is cast to before conversion
+ARROW_TYPES = {
+    "float32": pa.float32(),
+    "float64": pa.float64(),
+    "int32": pa.int32(),
+    "int64": pa.int64(),
+    "datetime64[ns, UTC]": pa.timestamp("ns", tz="UTC"),
+}
+
+_SQL_OPS = {"=": "=", "==": "=", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">=",
+            "in": "IN", "not in": "NOT IN"}
+
+
+def _sql_literal(value):
+    if isinstance(value, pd.Timestamp) or hasattr(value, "isoformat"):
+        return f"TIMESTAMP('{pd.Timestamp(value).isoformat()}')"
+    if isinstance(value, str):
+        return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+    return repr(value)
+
+
+def row_restriction(filters):
+    """Filters -> a BigQuery `row_restriction` (bare columns on the left, so pruning still works)."""
+    clauses = []
+    for column, op, value in filters or ():
+        if op not in _SQL_OPS:
+            raise ValueError(f"🤨 Unsupported filter operator '{op}'. Supported: {list(_SQL_OPS)}")
+        if op in ("in", "not in"):
+            rendered = f"({', '.join(_sql_literal(v) for v in value)})"
+        else:
+            rendered = _sql_literal(value)
+        clauses.append(f"`{column}` {_SQL_OPS[op]} {rendered}")
+    return " AND ".join(clauses)
+
+
+def filter_expression(filters):
+    """Filters -> a `pyarrow.dataset` expression (None when there are none)."""
+    if not filters:
+        return None
+    normalized = [
+        (column, op, pd.Timestamp(value) if hasattr(value, "isoformat") else value)
+        for column, op, value in filters
+    ]
+    return pq.filters_to_expression(normalized)
+
+
+def merge_streams(streams, max_workers=READ_STREAMS, buffer=QUEUE_BATCHES):
+    """
+    Drains several batch iterators on background threads and yields their batches in arrival
+    order (order *within* a stream is kept, order across streams is not). The first error
+    raised by any stream is re-raised to the consumer.
+    """
+    streams = list(streams)
+    if len(streams) <= 1:
+        for stream in streams:
+            yield from stream
+        return
+
+    batches = queue.Queue(maxsize=buffer)
+    done = object()
+    stop = threading.Event()
+    pending = list(streams)
+    lock = threading.Lock()
+
+    def drain():
+        while not stop.is_set():
+            with lock:
+                if not pending:
+                    break
+                stream = pending.pop(0)
+            try:
+                for batch in stream:
+                    while not stop.is_set():
+                        try:
+                            batches.put(batch, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+            except Exception as error:
+                batches.put(error)
+                return
+        batches.put(done)
+
+    workers = [threading.Thread(target=drain, daemon=True) for _ in range(min(max_workers, len(streams)))]
+    for worker in workers:
+        worker.start()
+    try:
+        finished = 0
+        while finished < len(workers):
+            item = batches.get()
+            if item is done:
+                finished += 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+
+
+def read_batches(table, columns=None, filters=None, backend=None, max_streams=READ_STREAMS):
+    """
+    Streams `table` from the storage backend.
+
+    Returns:
+        pa.RecordBatchReader: The projected, filtered rows (no particular order across streams).
+    """
+    return (backend or get_backend()).read_table(table, columns=columns, filters=filters, max_streams=max_streams)
+
+
+def compact_batch(batch, schema):
+    """Casts one record batch to the compact dtypes of a `scripts.indicators.schema` mapping."""
+    arrays, names = [], []
+    for name, column in zip(batch.schema.names, batch.columns):
+        dtype = schema.get(name)
+        if dtype == "category":
+            if not pa.types.is_dictionary(column.type):
+                column = column.cast(pa.string()).dictionary_encode()
+        elif dtype in ARROW_TYPES and column.type != ARROW_TYPES[dtype]:
+            column = column.cast(ARROW_TYPES[dtype])
+        arrays.append(column)
+        names.append(name)
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+def read_frame(table, columns=None, filters=None, schema=None, backend=None, max_streams=READ_STREAMS):
+    """
+    Reads `table` into pandas, casting each batch to `schema` (a `scripts.indicators.schema`
+    dtype mapping, e.g. `INDICATOR_SCHEMA`) as it streams in.
+
+    Returns:
+        pd.DataFrame: The rows in `schema`'s dtypes (unsorted; sort if order matters).
+    """
+    reader = read_batches(table, columns, filters, backend, max_streams)
+    batches = [compact_batch(batch, schema) if schema else batch for batch in reader]
+    if not batches:
+        empty = pd.DataFrame({name: pd.Series(dtype=object) for name in reader.schema.names})
+        return apply_schema(empty, schema) if schema else empty
+    df = pa.Table.from_batches(batches).to_pandas()
+    return apply_schema(df, schema) if schema else df
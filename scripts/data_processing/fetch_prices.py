@@ -0,0 +1,91 @@
+import os
+import pandas as pd
+from scripts.data_processing.arrow_reader import read_frame
+from scripts.data_processing.storage import cache_root, get_backend
+from scripts.indicators.feature_store import FeatureStore
+from scripts.indicators.schema import PRICE_SCHEMA, apply_schema
+
+# 🌐 BigQuery Configuration
+PROJECT_ID = "cloud4marketing-281206"
+DATASET_ID = "crypto_price"
+RAW_TABLE = f"{PROJECT_ID}.{DATASET_ID}.coinbase_hourly_prices"
+
+# 📂 Local File Storage
+PRICE_STORE_ROOT = os.path.join("feature_store", "coinbase_hourly_prices")  # One subdirectory per backend
+RETENTION = pd.DateOffset(months=6)  # Rows older than this are evicted locally
+WATERMARK_BUCKET = "1D"  # Watermarks are floored to this, so assets a few hours apart share one read
+PRICE_COLUMNS = ["asset", "timestamp", "open_price", "high_price", "low_price", "close_price", "volume"]
+
+
+def retention_start(now=None):
+    now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+    return now - RETENTION
+
+
+def incremental_filters(since, inclusive=False):
+    """
+    Row filter for every raw bar after `since`. It compares the bare `timestamp` column to a
+    constant, so BigQuery can prune partitions and only scan new data.
+    """
+    return [("timestamp", ">=" if inclusive else ">", pd.Timestamp(since))]
+
+
+def sync_prices(backend=None, store=None, now=None):
+    """
+    🔄 Pulls only the bars newer than the local per-asset high-water marks.
+
+    - Watermarks (clamped to the retention window) are floored to `WATERMARK_BUCKET`, and each
+      bucket is read once, from its start, with an `asset IN (...)` filter. Assets that are
+      a few hours apart share one read, while one stale or delisted asset never drags every
+      other asset's history along. Bars re-read from the start of a bucket are dropped
+      against the watermarks (and the keyed merge dedupes any overlap). Assets the cache has never seen are read from the retention start.
+      Only the OHLCV columns of matching rows are streamed (`scripts.data_processing.arrow_reader`)
+    - New rows are merged into the asset/month partitions and rows past retention are evicted
+
+    Returns:
+        pd.DataFrame: The rows that were new to the local cache.
+    """
+    backend = backend or get_backend()
+    store = store or FeatureStore(cache_root(PRICE_STORE_ROOT, backend))
+    cutoff = retention_start(now)
+    watermarks = store.watermarks()
+
+    groups = {}
+    for asset, mark in watermarks.items():
+        groups.setdefault(max(pd.Timestamp(mark), cutoff).floor(WATERMARK_BUCKET), []).append(asset)
+    reads = [incremental_filters(since, inclusive=True) + [("asset", "in", assets)]
+             for since, assets in groups.items()]
+    # Assets with no watermark yet (new listings, or an empty cache)
+    unseen = [("asset", "not in", list(watermarks))] if watermarks else []
+    reads.append(incremental_filters(cutoff, inclusive=True) + unseen)
+
+    frames = [read_frame(RAW_TABLE, columns=PRICE_COLUMNS, filters=filters, schema=PRICE_SCHEMA, backend=backend)
+              for filters in reads]
+    df = apply_schema(pd.concat(frames, ignore_index=True), PRICE_SCHEMA)
+    df = df.sort_values(["asset", "timestamp"], kind="stable")
+
+    # Bars re-read from the start of a bucket are already stored; leaving them out keeps their
+    # partitions (and the manifest fingerprint) untouched when nothing new arrived
+    seen = pd.to_datetime(df["asset"].astype(str).map(watermarks), utc=True)
+    df = df[seen.isna() | (df["timestamp"] > seen)]
+    store.write(df, now=now, merge=True)
+    store.evict(cutoff)
+    return df.reset_index(drop=True)
+
+
+def load_prices(columns=None, assets=None, start=None, end=None, backend=None):
+    """
+    Syncs the local raw-price cache and returns the retained history (sorted by asset, timestamp),
+    in the `PRICE_SCHEMA` dtypes.
+
+    Args:
+        columns (list): Columns to load (asset and timestamp are always included).
+        assets (str | list): Asset(s) to load (default: all).
+        start / end: Optional [start, end) timestamp bounds.
+        backend: Storage backend to pull from (default: `get_backend()`).
+    """
+    backend = backend or get_backend()
+    store = FeatureStore(cache_root(PRICE_STORE_ROOT, backend))
+    new_rows = sync_prices(backend=backend, store=store)
+    print(f"📡 Pulled {len(new_rows)} new hourly bars.")
+    return apply_schema(store.read(columns=columns, assets=assets, start=start, end=end), PRICE_SCHEMA)
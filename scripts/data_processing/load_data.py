@@ -1,52 +1,80 @@
 import pandas as pd
-from sklearn.model_selection import train_test_split  
 import os
-from google.cloud import bigquery  # ✅ Ensure this import is present
-from scripts.indicators.compute_indicators import get_optimal_timeframe  # Import the new function
+from scripts.indicators.compute_indicators import compute_optimal_timeframes  # Best horizon per asset
+from scripts.indicators.setup_indicators import load_indicators  # Memory-mapped feature cache
+from scripts.models.walk_forward import holdout_split  # Time-ordered split (no future bars in training)
+from scripts.monitoring.instrumentation import instrument
 
-# 🔥 Set the path to your credentials file
-os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = r"C:\Users\eddie\OneDrive\code\magician\config\cloud_credentials.json"
-
-# ✅ Now initialize the BigQuery client
-client = bigquery.Client()
+# 🔥 Path to your credentials file (set by the CLI entry point; only read by the BigQuery backend)
+CREDENTIALS_PATH = r"C:\Users\eddie\OneDrive\code\magician\config\cloud_credentials.json"
 
+@instrument("load_data")
 def load_data():
     """
     🍽 **load_data() – Your Data, Served Hot**
     
-    - Loads historical crypto data from BigQuery
-    - Splits it into training/testing sets
+    - Loads historical crypto data from the local feature store (refreshed from the storage backend)
+    - Searches each asset's best timeframe on its own series and builds its target from it
+    - Splits it chronologically into training/testing sets (purged, so no future bars leak into training)
     - Because training on fresh data is like cooking with rotten vegetables
 
     🚨 NOTE: This assumes data is already cleaned!
     """
 
-    print("📡 Fetching data from BigQuery...")
+    print("📡 Loading technical indicators (memory-mapped local cache, storage backend as fallback)...")
+
+    df = load_indicators()
+
+    # Best timeframe per asset (searched asset by asset, so no shift crosses an asset boundary)
+    optimal_timeframes = compute_optimal_timeframes(df)
 
-    client = bigquery.Client()
-    query = """
-        SELECT * FROM `cloud4marketing-281206.crypto_price.technical_indicators`
-        WHERE DATETIME(timestamp) >= DATETIME_SUB(CURRENT_DATETIME(), INTERVAL 6 MONTH)
+    return split_data(add_targets(df, optimal_timeframes))
+
+
+def add_targets(df, optimal_timeframes):
+    """
+    🎯 Adds a `target` column: each asset's close price `timeframe` hours ahead, using the
+    asset's best timeframe from `optimal_timeframes` (asset, timeframe). Rows whose target
+    lies past the end of the history (or whose asset has no timeframe) are dropped.
     """
-    df = client.query(query).to_dataframe()
+    horizons = dict(zip(optimal_timeframes["asset"].astype(str), optimal_timeframes["timeframe"]))
+    df = df.sort_values(["asset", "timestamp"]).reset_index(drop=True)
+    horizon = df["asset"].astype(str).map(horizons)
 
-    # Fetch optimal timeframes for each asset
-    optimal_timeframes = get_optimal_timeframe(df)
+    parts = []
+    for asset, rows in df.groupby("asset", observed=True, sort=False).indices.items():
+        if pd.isna(horizon.iloc[rows[0]]):
+            continue
+        part = df.iloc[rows].copy()
+        part["target"] = part["close_price"].shift(-int(horizon.iloc[rows[0]]))
+        parts.append(part)
+    if not parts:
+        raise ValueError("🚨 None of the assets has an optimal timeframe to build targets from.")
+    return pd.concat(parts, ignore_index=True).dropna(subset=["target"]).reset_index(drop=True)
 
-    # 📊 Split into X (features) and y (target)
+
+def split_data(df):
+    """
+    📊 Splits a frame with a `target` column into a purged chronological (X_train, X_test, y_train, y_test).
+    X and y are indexed by the row timestamps, so models can purge in time rather than in rows.
+    """
     if "target" not in df.columns:
         raise ValueError("🚨 'target' column is missing! Did we forget to define what we're predicting?")
 
-    X = df.drop(columns=["asset", "timestamp", "target"])  
-    y = df["target"]  
+    df = df.sort_values(["timestamp", "asset"]).reset_index(drop=True)
+    times = pd.DatetimeIndex(df["timestamp"], name="timestamp")
+    X = df.drop(columns=["asset", "timestamp", "target"]).set_axis(times)
+    y = df["target"].set_axis(times)
 
     print(f"✅ Data loaded! Total rows: {df.shape[0]}, Features: {X.shape[1]}")
-    print(f"🔍 Sample Data:\n{df.head(5)}\n")
-    
-    return train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # ⏩ Train on the past, test on the future
+    train_mask, test_mask = holdout_split(df["timestamp"], test_size=0.2)
+    return X[train_mask], X[test_mask], y[train_mask], y[test_mask]
 
 # If run as a script, execute and print a sample
 if __name__ == "__main__":
+    os.environ.setdefault("GOOGLE_APPLICATION_CREDENTIALS", CREDENTIALS_PATH)
     X_train, X_test, y_train, y_test = load_data()
     print("📊 Training Sample:")
     print(X_train.head(3))
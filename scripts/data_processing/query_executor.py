@@ -0,0 +1,150 @@
+"""
+⚡ Concurrent query execution.
+
+Submits every query at once instead of one after another, so the wall time of a batch of
+checks approaches its slowest query rather than the sum of all of them:
+
+    results = run_queries({"row_count": "SELECT COUNT(*) ...", "assets": "SELECT DISTINCT ..."})
+    results["row_count"].df
+
+- Bounded concurrency: at most `max_concurrency` queries are in flight.
+- Per-query timeout: each attempt gets `timeout` seconds. Backends whose `query` takes a
+  `timeout` (BigQuery) get it too, and cancel the job once it runs out.
+- Retries: transient failures (connection errors, HTTP 429/5xx from the BigQuery client)
+  are retried up to `retries` times with exponential backoff. Anything else, such as a SQL
+  error, fails at once. Timeouts are not retried by default: a query that ran out of time
+  will most likely do so again, and each retry would be billed.
+- Results can be consumed as they complete (`QueryExecutor.as_completed`).
+
+The backends' clients are blocking, so each query runs in a worker thread. A timed-out
+attempt stops being waited for; unless the backend cancelled it, its thread runs to
+completion in the background. Anything with a `query(sql)` method works as the backend,
+including the local DuckDB backend and fakes in tests.
+"""
+import time
+import asyncio
+import inspect
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from scripts.data_processing.storage import get_backend
+
+# ⚙️ Defaults
+MAX_CONCURRENCY = 8
+QUERY_TIMEOUT = 300.0    # Seconds per attempt
+RETRIES = 2              # Extra attempts after a transient failure
+RETRY_BACKOFF = 1.0      # Seconds before the first retry (doubled for each one after)
+
+# HTTP statuses worth retrying (google.api_core exceptions carry theirs in `.code`)
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def is_transient(error):
+    """Whether a failed attempt is worth retrying (timeouts are not: see the module docstring)."""
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        return False
+    if isinstance(error, ConnectionError):
+        return True
+    return getattr(error, "code", None) in TRANSIENT_STATUS_CODES
+
+
+class QueryResult:
+    """Outcome of one query: its frame, or the error of its last attempt."""
+
+    def __init__(self, name, sql, df=None, error=None, attempts=0, seconds=0.0):
+        self.name = name
+        self.sql = sql
+        self.df = df
+        self.error = error
+        self.attempts = attempts
+        self.seconds = seconds
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        status = f"{len(self.df)} rows" if self.ok else f"{type(self.error).__name__}: {self.error}"
+        return f"QueryResult({self.name!r}, {status}, attempts={self.attempts}, {self.seconds:.2f}s)"
+
+
+class QueryExecutor:
+    """
+    🚀 **Async query executor**
+
+    Args:
+        backend: Anything with `query(sql) -> pd.DataFrame` (default: `get_backend()`).
+        max_concurrency (int): Queries in flight at once.
+        timeout (float): Seconds per attempt (None: wait forever).
+        retries (int): Extra attempts after a transient failure.
+        backoff (float): Seconds before the first retry, doubled for each one after.
+        retry_if (callable): `retry_if(error) -> bool` (default: `is_transient`).
+    """
+
+    def __init__(self, backend=None, max_concurrency=MAX_CONCURRENCY, timeout=QUERY_TIMEOUT,
+                 retries=RETRIES, backoff=RETRY_BACKOFF, retry_if=is_transient):
+        self.backend = backend or get_backend()
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.retry_if = retry_if
+        # Backends that can enforce the timeout themselves (and cancel the job) are given it
+        if timeout is not None and "timeout" in inspect.signature(self.backend.query).parameters:
+            self._query = partial(self.backend.query, timeout=timeout)
+        else:
+            self._query = self.backend.query
+
+    async def _run(self, name, sql, slots, pool):
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        for attempt in range(1, self.retries + 2):
+            try:
+                async with slots:
+                    df = await asyncio.wait_for(loop.run_in_executor(pool, self._query, sql), self.timeout)
+                return QueryResult(name, sql, df=df, attempts=attempt, seconds=time.perf_counter() - started)
+            except Exception as error:
+                if isinstance(error, asyncio.TimeoutError):
+                    error = TimeoutError(f"Query '{name}' took longer than {self.timeout}s")
+                if attempt > self.retries or not self.retry_if(error):
+                    return QueryResult(name, sql, error=error, attempts=attempt,
+                                       seconds=time.perf_counter() - started)
+                # The slot is free while we back off, so other queries keep running
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+
+    async def as_completed(self, queries):
+        """
+        Runs `queries` (name -> SQL) concurrently and yields each `QueryResult` as soon as it
+        finishes. Failures are yielded too (check `.ok`), so one bad query never hides the rest.
+        """
+        slots = asyncio.Semaphore(self.max_concurrency)
+        # Own pool: the default executor is capped by the CPU count, but these threads just wait
+        pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="query")
+        tasks = [asyncio.create_task(self._run(name, sql, slots, pool)) for name, sql in queries.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            pool.shutdown(wait=False)
+
+    async def gather(self, queries):
+        """Runs every query; returns name -> `QueryResult` in the order the queries were given."""
+        results = {result.name: result async for result in self.as_completed(queries)}
+        return {name: results[name] for name in queries}
+
+    def run(self, queries):
+        """Blocking wrapper around `gather` for scripts."""
+        return asyncio.run(self.gather(queries))
+
+
+def run_queries(queries, backend=None, **kwargs):
+    """
+    Runs `queries` (name -> SQL) concurrently against `backend`.
+
+    Keyword arguments go to `QueryExecutor` (`max_concurrency`, `timeout`, `retries`, ...).
+
+    Returns:
+        dict: Name -> `QueryResult`, in the order the queries were given.
+    """
+    return QueryExecutor(backend, **kwargs).run(queries)
@@ -0,0 +1,349 @@
+import os
+import re
+import glob
+import uuid
+import hashlib
+import threading
+from functools import lru_cache
+import pandas as pd
+from scripts.monitoring.instrumentation import record_bytes_scanned
+
+# ⚙️ Backend Selection
+BACKEND_ENV = "MAGICIAN_BACKEND"  # "bigquery" (default) or "local"
+LOCAL_ROOT_ENV = "MAGICIAN_LOCAL_ROOT"
+
+# 📂 Local File Storage
+LOCAL_ROOT = "warehouse"  # One directory of Parquet files per `project.dataset.table`
+
+# BigQuery-only syntax the local engine rewrites before running a query
+_TABLE_REF = re.compile(r"`([\w-]+\.[\w-]+\.[\w-]+)`")
+_IDENTIFIER = re.compile(r"`([^`]+)`")
+_DIFF_UNIT = re.compile(
+    r"\bTIMESTAMP_DIFF\(((?:[^()]|\([^()]*\))*?),\s*(MICROSECOND|MILLISECOND|SECOND|MINUTE|HOUR|DAY)\s*\)",
+    re.IGNORECASE,
+)
+_RENAMES = [
+    (re.compile(r"\bTIMESTAMP\(", re.IGNORECASE), "bq_timestamp("),
+    (re.compile(r"\bPERCENTILE_CONT\(", re.IGNORECASE), "quantile_cont("),
+]
+_MACROS = [
+    "CREATE OR REPLACE MACRO bq_timestamp(x) AS CAST(x AS TIMESTAMPTZ)",
+    "CREATE OR REPLACE MACRO current_datetime() AS CAST(current_timestamp AS TIMESTAMP)",
+    "CREATE OR REPLACE MACRO datetime_sub(d, i) AS d - i",
+    "CREATE OR REPLACE MACRO timestamp_sub(d, i) AS d - i",
+    "CREATE OR REPLACE MACRO bq_timestamp_diff(a, b, unit) AS date_sub(unit, b, a)",
+]
+
+
+def translate_sql(sql):
+    """
+    Rewrites the BigQuery SQL used in this repo into DuckDB SQL: backtick identifiers become
+    double-quoted, `TIMESTAMP_DIFF(a, b, HOUR)` gets a quoted unit, and the remaining
+    BigQuery functions map onto macros registered by `LocalBackend`.
+    """
+    sql = _DIFF_UNIT.sub(lambda m: f"bq_timestamp_diff({m.group(1)}, '{m.group(2).lower()}')", sql)
+    for pattern, replacement in _RENAMES:
+        sql = pattern.sub(replacement, sql)
+    return _IDENTIFIER.sub(r'"\1"', sql)
+
+
+class BigQueryBackend:
+    """
+    ☁️ Runs queries and loads against BigQuery. The client is created on first use, so
+    importing a module that holds a backend never needs credentials.
+    """
+
+    name = "bigquery"
+    cache_key = "bigquery"   # Local caches of this backend's data live under `<cache root>/bigquery`
+
+    def __init__(self, client=None, read_client=None):
+        self._client = client
+        self._read_client = read_client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from google.cloud import bigquery
+            self._client = bigquery.Client()
+        return self._client
+
+    def storage_client(self, required=False):
+        """
+        The shared BigQuery Storage Read API client. Without `google-cloud-bigquery-storage`,
+        query results fall back to REST paging (None), and `read_table` raises.
+        """
+        if self._read_client is None:
+            try:
+                from google.cloud import bigquery_storage
+            except ImportError as e:
+                if required:
+                    raise ImportError(
+                        "🚨 Table reads need the Storage Read API: `pip install google-cloud-bigquery-storage`"
+                    ) from e
+                return None
+            self._read_client = bigquery_storage.BigQueryReadClient()
+        return self._read_client
+
+    def query(self, sql, timeout=None):
+        """
+        Runs `sql` and returns the result as a DataFrame. With `timeout` (seconds), a job still
+        running after it is cancelled server-side and a TimeoutError is raised, so it stops
+        being billed and no thread is left waiting on it.
+        """
+        job = self.client.query(sql)
+        try:
+            job.result(timeout=timeout)
+        except TimeoutError:
+            job.cancel()
+            raise TimeoutError(f"Query job {job.job_id} took longer than {timeout}s and was cancelled")
+        df = job.to_dataframe(bqstorage_client=self.storage_client())
+        record_bytes_scanned(job.total_bytes_processed)
+        return df
+
+    def batches(self, sql, batch_size=None):
+        """
+        Streams the result as Arrow record batches over the Storage Read API when available
+        (ORDER BY results arrive in order: they are read as a single stream).
+        """
+        job = self.client.query(sql)
+        rows = job.result(page_size=batch_size)
+        record_bytes_scanned(job.total_bytes_processed)
+        return rows.to_arrow_iterable(bqstorage_client=self.storage_client())
+
+    def read_table(self, table, columns=None, filters=None, max_streams=4):
+        """
+        Reads a table through a Storage Read API session: `columns` and `filters` (see
+        `scripts.data_processing.arrow_reader`) are applied server-side, and the session's
+        streams are downloaded in parallel.
+
+        Returns:
+            pa.RecordBatchReader
+        """
+        import pyarrow as pa
+        from google.cloud.bigquery_storage import types
+        from scripts.data_processing.arrow_reader import merge_streams, row_restriction
+
+        read_client = self.storage_client(required=True)
+        project, dataset, table_id = table.split(".")
+        requested = types.ReadSession(
+            table=f"projects/{project}/datasets/{dataset}/tables/{table_id}",
+            data_format=types.DataFormat.ARROW,
+            read_options=types.ReadSession.TableReadOptions(
+                selected_fields=list(columns or []), row_restriction=row_restriction(filters),
+            ),
+        )
+        session = read_client.create_read_session(
+            parent=f"projects/{self.client.project}", read_session=requested, max_stream_count=max_streams,
+        )
+        record_bytes_scanned(session.estimated_total_bytes_scanned)
+        schema = pa.ipc.read_schema(pa.py_buffer(session.arrow_schema.serialized_schema))
+
+        def stream(name):
+            for message in read_client.read_rows(name):
+                yield pa.ipc.read_record_batch(
+                    pa.py_buffer(message.arrow_record_batch.serialized_record_batch), schema
+                )
+
+        streams = [stream(s.name) for s in session.streams]
+        return pa.RecordBatchReader.from_batches(schema, merge_streams(streams, max_streams))
+
+    def append(self, df, table):
+        from google.cloud import bigquery
+        job_config = bigquery.LoadJobConfig(write_disposition="WRITE_APPEND")
+        self.client.load_table_from_dataframe(df, table, job_config=job_config).result()
+
+    def tables(self, dataset):
+        return [table.table_id for table in self.client.list_tables(dataset)]
+
+    def sink(self):
+        from scripts.data_processing.upload import BigQuerySink
+        return BigQuerySink(self.client)
+
+
+class LocalBackend:
+    """
+    🧪 **Offline stand-in for BigQuery**: an embedded DuckDB engine over Parquet files.
+
+    Each table `project.dataset.table` is the directory `<root>/project.dataset.table/`, and
+    every Parquet file under it is part of the table. Queries are written in BigQuery SQL
+    and translated (`translate_sql`), so the same query strings run in both backends.
+
+    Every thread queries through its own cursor (with its own temporary table views), so
+    concurrent queries (`scripts.data_processing.query_executor`) are safe.
+    """
+
+    name = "local"
+
+    def __init__(self, root=LOCAL_ROOT):
+        self.root = root
+        # One cache namespace per warehouse directory, so two warehouses never share cached rows
+        self.cache_key = f"local-{hashlib.sha1(os.path.abspath(root).encode()).hexdigest()[:8]}"
+        self._conn = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def conn(self):
+        with self._lock:
+            if self._conn is None:
+                try:
+                    import duckdb
+                except ImportError as e:
+                    raise ImportError("🚨 The local backend needs DuckDB: `pip install duckdb`") from e
+                conn = duckdb.connect()
+                conn.execute("SET TimeZone = 'UTC'")
+                for macro in _MACROS:
+                    conn.execute(macro)
+                self._conn = conn
+        return self._conn
+
+    @property
+    def cursor(self):
+        """This thread's cursor on the shared database (macros are shared, views are not)."""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._local.cursor = self.conn.cursor()
+            cursor.execute("SET TimeZone = 'UTC'")
+        return cursor
+
+    def table_dir(self, table):
+        return os.path.join(self.root, table)
+
+    def _files(self, table):
+        return sorted(glob.glob(os.path.join(self.table_dir(table), "**", "*.parquet"), recursive=True))
+
+    def exists(self, table):
+        return bool(self._files(table))
+
+    def _register(self, table):
+        files = self._files(table)
+        if not files:
+            raise FileNotFoundError(f"🚨 Table `{table}` has no local data under {self.table_dir(table)}")
+        file_list = ", ".join("'" + f.replace("'", "''") + "'" for f in files)
+        self.cursor.execute(
+            f'CREATE OR REPLACE TEMP VIEW "{table}" AS SELECT * FROM read_parquet([{file_list}], union_by_name = true)'
+        )
+
+    def _execute(self, sql):
+        # Views are re-created per query so they pick up files written since the last one
+        tables = sorted(set(_TABLE_REF.findall(sql)))
+        for table in tables:
+            self._register(table)
+        result = self.cursor.execute(translate_sql(sql))
+        # Upper bound (DuckDB may skip row groups): the Parquet bytes behind every table read
+        record_bytes_scanned(sum(os.path.getsize(f) for table in tables for f in self._files(table)))
+        return result
+
+    def query(self, sql):
+        return self._execute(sql).df()
+
+    def batches(self, sql, batch_size=100_000):
+        """Streams the result as Arrow record batches instead of materializing it."""
+        return iter(self._execute(sql).fetch_record_batch(batch_size))
+
+    def read_table(self, table, columns=None, filters=None, max_streams=4):
+        """
+        Offline stand-in for the Storage Read API: an Arrow dataset scan of the table's Parquet
+        files with the same column projection and `filters`, reading up to `max_streams`
+        files ahead in parallel.
+
+        Returns:
+            pa.RecordBatchReader
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        from scripts.data_processing.arrow_reader import filter_expression
+
+        files = self._files(table)
+        if not files:
+            raise FileNotFoundError(f"🚨 Table `{table}` has no local data under {self.table_dir(table)}")
+        record_bytes_scanned(sum(os.path.getsize(f) for f in files))
+        dataset = ds.dataset(files, format="parquet")
+        scanner = dataset.scanner(columns=columns, filter=filter_expression(filters), fragment_readahead=max_streams)
+        return pa.RecordBatchReader.from_batches(scanner.projected_schema, scanner.to_batches())
+
+    def write(self, df, table):
+        """Replaces the table's contents with `df` (one Parquet file)."""
+        path = self.table_dir(table)
+        os.makedirs(path, exist_ok=True)
+        tmp_path = os.path.join(path, "data.parquet.tmp")
+        df.to_parquet(tmp_path, index=False)
+        for old in self._files(table):
+            os.remove(old)
+        os.replace(tmp_path, os.path.join(path, "data.parquet"))
+
+    def append(self, df, table):
+        """Appends by adding one more Parquet file; existing files are never rewritten."""
+        path = self.table_dir(table)
+        os.makedirs(path, exist_ok=True)
+        df.to_parquet(os.path.join(path, f"part-{uuid.uuid4().hex}.parquet"), index=False)
+
+    def tables(self, dataset):
+        prefix = f"{dataset}."
+        return sorted(
+            name[len(prefix):] for name in os.listdir(self.root)
+            if name.startswith(prefix) and self.exists(name)
+        ) if os.path.isdir(self.root) else []
+
+    def sink(self):
+        return LocalSink(self)
+
+
+class LocalSink:
+    """
+    Upload sink (see `upload_delta`) for `LocalBackend`: the stage -> MERGE flow becomes an
+    in-memory staging frame merged into the table's Parquet files (incoming rows win).
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.staged = {}
+        self.identity = f"local:{os.path.abspath(backend.root)}"
+
+    def max_values(self, table, column, by):
+        if not self.backend.exists(table):
+            return {}
+        rows = self.backend.query(f"SELECT `{by}` AS key, MAX(`{column}`) AS value FROM `{table}` GROUP BY `{by}`")
+        return {str(key): value for key, value in zip(rows["key"], rows["value"])}
+
+    def stage(self, table, df):
+        staging = f"{table}__staging"
+        self.staged[staging] = df
+        return staging
+
+    def merge(self, staging, table, columns, keys):
+        rows = self.staged[staging][columns]
+        if self.backend.exists(table):
+            current = self.backend.query(f"SELECT * FROM `{table}`")
+            rows = pd.concat([current, rows], ignore_index=True).drop_duplicates(keys, keep="last")
+        self.backend.write(rows.reset_index(drop=True), table)
+
+    def drop(self, staging):
+        self.staged.pop(staging, None)
+
+
+def get_backend(name=None):
+    """
+    🔌 Returns the shared storage backend (one per process, so every stage reuses one client).
+
+    `name` defaults to the `MAGICIAN_BACKEND` environment variable: `bigquery` (default) or
+    `local` (DuckDB over Parquet under `MAGICIAN_LOCAL_ROOT`, default `warehouse/`).
+    """
+    return _shared_backend((name or os.getenv(BACKEND_ENV, "bigquery")).lower())
+
+
+def cache_root(root, backend=None):
+    """
+    `root` namespaced by backend (`<root>/<backend.cache_key>`), so rows cached locally from
+    one backend (e.g. a local warehouse) are never served as another's (BigQuery).
+    """
+    return os.path.join(root, (backend or get_backend()).cache_key)
+
+
+@lru_cache(maxsize=None)
+def _shared_backend(name):
+    if name == "bigquery":
+        return BigQueryBackend()
+    if name == "local":
+        return LocalBackend(os.getenv(LOCAL_ROOT_ENV, LOCAL_ROOT))
+    raise ValueError(f"🤨 Unknown storage backend '{name}'. Supported backends: ['bigquery', 'local']")
@@ -0,0 +1,189 @@
+import os
+import json
+import re
+import sqlite3
+import pandas as pd
+
+# 📂 Local File Storage
+UPLOAD_WATERMARKS_FILE = "upload_watermarks.json"  # Last uploaded timestamp per (sink, target table)
+KEY_COLUMNS = ["asset", "timestamp"]
+
+
+class BigQuerySink:
+    """
+    ☁️ Uploads to BigQuery by loading a staging table (Parquet load job) and MERGE-ing it
+    into the target, so readers never see a truncated table.
+    """
+
+    def __init__(self, client=None):
+        if client is None:
+            from scripts.data_processing.storage import get_backend
+            client = get_backend("bigquery").client  # The shared, lazily created client
+        self.client = client
+
+    @property
+    def identity(self):
+        """Where uploads land; upload watermarks are kept per identity."""
+        return f"bigquery:{getattr(self.client, 'project', None)}"
+
+    def max_values(self, table, column, by):
+        from google.api_core.exceptions import NotFound
+        try:
+            rows = self.client.query(
+                f"SELECT `{by}` AS key, MAX(`{column}`) AS value FROM `{table}` GROUP BY `{by}`"
+            ).result()
+        except NotFound:
+            return {}
+        return {str(row.key): row.value for row in rows}
+
+    def stage(self, table, df):
+        from google.cloud import bigquery
+        staging = f"{table}__staging"
+        job_config = bigquery.LoadJobConfig(
+            write_disposition="WRITE_TRUNCATE",
+            source_format=bigquery.SourceFormat.PARQUET,
+        )
+        self.client.load_table_from_dataframe(df, staging, job_config=job_config).result()
+        return staging
+
+    def merge(self, staging, table, columns, keys):
+        on = " AND ".join(f"T.`{k}` = S.`{k}`" for k in keys)
+        updates = ", ".join(f"`{c}` = S.`{c}`" for c in columns if c not in keys)
+        names = ", ".join(f"`{c}`" for c in columns)
+        values = ", ".join(f"S.`{c}`" for c in columns)
+        matched = f"WHEN MATCHED THEN UPDATE SET {updates}" if updates else ""
+
+        self.client.query(f"CREATE TABLE IF NOT EXISTS `{table}` AS SELECT * FROM `{staging}` WHERE FALSE").result()
+        self.client.query(f"""
+            MERGE `{table}` T
+            USING `{staging}` S
+            ON {on}
+            {matched}
+            WHEN NOT MATCHED THEN INSERT ({names}) VALUES ({values})
+        """).result()
+
+    def drop(self, staging):
+        self.client.delete_table(staging, not_found_ok=True)
+
+
+class SQLiteSink:
+    """
+    🧪 Local stand-in for `BigQuerySink` (stdlib sqlite3): same stage -> MERGE flow, implemented
+    as an upsert on a unique (keys) index. Timestamps are stored as ISO-8601 text.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.conn = sqlite3.connect(path)
+        # An in-memory database dies with its connection, so its watermarks must not outlive it
+        self.identity = f"sqlite:{id(self.conn)}" if path == ":memory:" else f"sqlite:{os.path.abspath(path)}"
+
+    @staticmethod
+    def _name(table):
+        return re.sub(r"\W", "_", table)
+
+    def _exists(self, table):
+        row = self.conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (self._name(table),))
+        return row.fetchone() is not None
+
+    def max_values(self, table, column, by):
+        if not self._exists(table):
+            return {}
+        rows = self.conn.execute(f'SELECT "{by}", MAX("{column}") FROM "{self._name(table)}" GROUP BY "{by}"')
+        return {str(key): value for key, value in rows}
+
+    def stage(self, table, df):
+        staging = f"{table}__staging"
+        df = df.copy()
+        for col in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                df[col] = pd.to_datetime(df[col], utc=True).map(lambda ts: ts.isoformat())
+        df.to_sql(self._name(staging), self.conn, if_exists="replace", index=False)
+        return staging
+
+    def merge(self, staging, table, columns, keys):
+        src, dst = self._name(staging), self._name(table)
+        names = ", ".join(f'"{c}"' for c in columns)
+        updates = ", ".join(f'"{c}" = excluded."{c}"' for c in columns if c not in keys)
+        conflict = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+
+        if not self._exists(table):
+            self.conn.execute(f'CREATE TABLE "{dst}" AS SELECT * FROM "{src}" WHERE 0')
+            self.conn.execute(f'CREATE UNIQUE INDEX "{dst}__keys" ON "{dst}" ({", ".join(keys)})')
+        self.conn.execute(
+            f'INSERT INTO "{dst}" ({names}) SELECT {names} FROM "{src}" WHERE true '
+            f'ON CONFLICT ({", ".join(keys)}) {conflict}'
+        )
+        self.conn.commit()
+
+    def drop(self, staging):
+        self.conn.execute(f'DROP TABLE IF EXISTS "{self._name(staging)}"')
+        self.conn.commit()
+
+    def read(self, table):
+        return pd.read_sql(f'SELECT * FROM "{self._name(table)}"', self.conn)
+
+
+def _utc(ts):
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def _load_watermarks(path):
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def _save_watermarks(path, marks):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(marks, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def upload_delta(df, table, sink, keys=KEY_COLUMNS, watermark_column="timestamp", by="asset",
+                 watermarks_path=UPLOAD_WATERMARKS_FILE):
+    """
+    ⬆️ Uploads only what changed since the last upload, then MERGEs it into `table`.
+
+    - Each `by` group (asset) skips rows at or before its last uploaded `watermark_column`
+      value. Watermarks are kept locally per sink (`sink.identity`, e.g. the BigQuery project
+      or the local warehouse path) and table, so uploads to one backend never make another
+      skip rows; the sink is asked for MAX() only the first time
+    - The delta is bulk-loaded into a staging table and merged on `keys`, so reruns are
+      idempotent and the target is never empty mid-upload
+    - Pass `watermark_column=None` for small keyed tables (e.g. one row per asset) to merge all rows
+
+    Returns:
+        int: Number of rows uploaded.
+    """
+    marks = _load_watermarks(watermarks_path)
+    sink_marks = marks.setdefault(sink.identity, {})
+    delta = df
+
+    if watermark_column is not None:
+        table_marks = sink_marks.get(table) or sink.max_values(table, watermark_column, by)
+        if table_marks:
+            seen = df[by].astype(str).map({k: _utc(v) for k, v in table_marks.items() if v is not None})
+            values = pd.to_datetime(df[watermark_column], utc=True)
+            delta = df[seen.isna() | (values > seen)]
+
+    if delta.empty:
+        return 0
+
+    staging = sink.stage(table, delta)
+    try:
+        sink.merge(staging, table, list(delta.columns), list(keys))
+    finally:
+        sink.drop(staging)
+
+    if watermark_column is not None:
+        table_marks = dict(sink_marks.get(table) or {})
+        newest = pd.to_datetime(delta[watermark_column], utc=True).groupby(delta[by].astype(str)).max()
+        for key, value in newest.items():
+            if key not in table_marks or _utc(table_marks[key]) < value:
+                table_marks[key] = value.isoformat()
+        sink_marks[table] = table_marks
+        _save_watermarks(watermarks_path, marks)
+    return len(delta)
@@ -6,8 +6,8 @@ import matplotlib.pyplot as plt
 # Ensure Python can find the `scripts/` folder
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "scripts")))
 
-# Import BigQuery config
-from config import client, TABLE_PATH
+# Import storage config
+from config import backend, TABLE_PATH
 
 # Fetch data for BTC
 query = f"""
@@ -17,7 +17,7 @@ query = f"""
     ORDER BY timestamp DESC
     LIMIT 1000
 """
-df = client.query(query).to_dataframe()
+df = backend.query(query)
 
 # Convert timestamp to datetime
 df["timestamp"] = pd.to_datetime(df["timestamp"])
@@ -0,0 +1,332 @@
+import os
+import glob
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from scripts.data_processing.storage import get_backend
+
+# 🌐 BigQuery Configuration
+PROJECT_ID = "cloud4marketing-281206"
+DATASET_ID = "crypto_price"
+TABLE_PATH = f"{PROJECT_ID}.{DATASET_ID}.coinbase_hourly_prices"
+
+# Define known assets (optional)
+KNOWN_ASSETS = ["BTC", "ETH", "SOL", "ADA", "XRP", "LTC", "DOGE", "AVAX"]
+
+PRICE_COLUMNS = ["open_price", "high_price", "low_price", "close_price"]
+SCAN_COLUMNS = ["asset", "timestamp"] + PRICE_COLUMNS + ["volume"]
+BATCH_SIZE = 100_000
+
+# 🚦 Thresholds (same as the SQL checks the scanner replaces)
+GAP_HOURS = 1                 # time_gaps: hour_diff > 1
+LONG_GAP_HOURS = 5            # missing_consecutive_hours: hour_diff >= 5
+PRICE_JUMP_PCT = 20           # anomalies: |close / prev_close - 1| in %
+VOLUME_SPIKE_RATIO = 10       # spikes_in_volume: volume / prev_volume
+VOLUME_OUTLIER_QUANTILE = 0.99
+VOLUME_OUTLIER_FACTOR = 2     # outliers_in_volume: volume > 2 x the asset's p99
+
+CHECKS = [
+    "missing_values",
+    "duplicate_timestamps",
+    "out_of_order_rows",
+    "time_gaps",
+    "missing_consecutive_hours",
+    "anomalies",
+    "outliers_in_volume",
+    "negative_or_zero_prices",
+    "negative_prices",
+    "negative_volume",
+    "spikes_in_volume",
+    "invalid_asset_symbols",
+]
+
+HOUR_US = 3_600_000_000
+
+
+def _epoch_us(column):
+    """Timestamp column -> (int64 microseconds since epoch, validity mask)."""
+    column = pc.cast(column, pa.timestamp("us", tz=getattr(column.type, "tz", None)))
+    valid = pc.is_valid(column).to_numpy(zero_copy_only=False)
+    values = pc.fill_null(pc.cast(column, pa.int64()), 0).to_numpy(zero_copy_only=False)
+    return values.astype(np.int64, copy=False), valid
+
+
+def _floats(column):
+    """Numeric column -> float64 array with nulls as NaN."""
+    return pc.cast(column, pa.float64()).to_numpy(zero_copy_only=False)
+
+
+def _to_timestamps(values):
+    return pd.to_datetime(values, unit="us", utc=True)
+
+
+class DataQualityReport:
+    """
+    📋 Result of one data-quality scan: one DataFrame of offending rows per check, plus
+    how much data was scanned.
+    """
+
+    def __init__(self, issues, rows_scanned, batches, assets):
+        self.issues = issues
+        self.rows_scanned = rows_scanned
+        self.batches = batches
+        self.assets = assets
+
+    def counts(self):
+        return {check: len(df) for check, df in self.issues.items()}
+
+    @property
+    def is_clean(self):
+        return not any(self.counts().values())
+
+    def summary(self):
+        return pd.DataFrame(list(self.counts().items()), columns=["check", "issues"])
+
+    def to_dict(self, max_rows=20):
+        """JSON-serializable summary with up to `max_rows` sample rows per check."""
+        samples = {}
+        for check, df in self.issues.items():
+            sample = df.head(max_rows).copy()
+            for col in sample.columns:
+                if pd.api.types.is_datetime64_any_dtype(sample[col]):
+                    sample[col] = sample[col].map(lambda ts: None if pd.isna(ts) else ts.isoformat())
+            samples[check] = sample.astype(object).where(sample.notna(), None).to_dict("records")
+        return {
+            "rows_scanned": self.rows_scanned,
+            "batches": self.batches,
+            "assets": self.assets,
+            "counts": self.counts(),
+            "samples": samples,
+        }
+
+
+class DataQualityScanner:
+    """
+    🔍 **Single-pass, vectorized OHLCV data-quality checks**
+
+    Feed Arrow record batches to `update()`, then call `report()`. Every check runs on whole
+    NumPy arrays per batch. The LAG-style checks (gaps, duplicates, price jumps, volume
+    spikes) carry each asset's last row across batches, so results match the per-check SQL
+    as long as each asset's rows arrive in time order (rows that don't are reported under
+    `out_of_order_rows`). Volume outliers need the asset's full-history p99, so volumes are
+    kept (one float per row) and compared once the scan ends.
+
+    Rows with a null asset or timestamp only count towards `missing_values`.
+    """
+
+    def __init__(self, known_assets=KNOWN_ASSETS):
+        self.known_assets = None if known_assets is None else set(known_assets)
+        self.asset_ids = {}
+        self.asset_names = []
+        self.seen = np.zeros(0, dtype=bool)
+        self.last_ts = np.zeros(0, dtype=np.int64)
+        self.last_close = np.zeros(0)
+        self.last_volume = np.zeros(0)
+        self.rows_scanned = 0
+        self.batches = 0
+        self.found = {check: [] for check in CHECKS}
+        self.volume_chunks = []
+
+    def _asset_column_ids(self, column):
+        """Asset column -> int64 ids (-1 for null), registering assets seen for the first time."""
+        encoded = pc.dictionary_encode(pc.cast(column, pa.string()))
+        if isinstance(encoded, pa.ChunkedArray):
+            encoded = encoded.combine_chunks()
+        for name in encoded.dictionary.to_pylist():
+            if name not in self.asset_ids:
+                self.asset_ids[name] = len(self.asset_names)
+                self.asset_names.append(name)
+
+        n_assets = len(self.asset_names)
+        if len(self.seen) < n_assets:
+            grow = n_assets - len(self.seen)
+            self.seen = np.concatenate([self.seen, np.zeros(grow, dtype=bool)])
+            self.last_ts = np.concatenate([self.last_ts, np.zeros(grow, dtype=np.int64)])
+            self.last_close = np.concatenate([self.last_close, np.full(grow, np.nan)])
+            self.last_volume = np.concatenate([self.last_volume, np.full(grow, np.nan)])
+
+        # The trailing -1 is what null indices (filled with -1) map to
+        lookup = np.array([self.asset_ids[name] for name in encoded.dictionary.to_pylist()] + [-1], dtype=np.int64)
+        indices = pc.fill_null(encoded.indices, -1).to_numpy(zero_copy_only=False).astype(np.int64)
+        return lookup[indices]
+
+    def _record(self, check, mask, ids, ts, **columns):
+        if not mask.any():
+            return
+        names = np.asarray(self.asset_names + [None], dtype=object)
+        frame = {"asset": names[ids[mask]], "timestamp": _to_timestamps(ts[mask])}
+        for name, values in columns.items():
+            values = values[mask]
+            frame[name] = _to_timestamps(values) if name.endswith("timestamp") else values
+        self.found[check].append(pd.DataFrame(frame))
+
+    def update(self, batch):
+        """Runs every check on one Arrow record batch (or table)."""
+        n = batch.num_rows
+        self.rows_scanned += n
+        self.batches += 1
+        if n == 0:
+            return
+
+        ids = self._asset_column_ids(batch.column("asset"))
+        ts, ts_valid = _epoch_us(batch.column("timestamp"))
+        prices = {col: _floats(batch.column(col)) for col in PRICE_COLUMNS}
+        volume = _floats(batch.column("volume"))
+
+        # 🕳️ Missing values (null or NaN in any column)
+        missing = (ids < 0) | ~ts_valid | np.isnan(volume)
+        for values in prices.values():
+            missing |= np.isnan(values)
+        self._record("missing_values", missing, ids, np.where(ts_valid, ts, np.nan))
+
+        # Everything below needs a real asset and timestamp; sort each asset's rows by time
+        keep = np.flatnonzero((ids >= 0) & ts_valid)
+        order = keep[np.lexsort((ts[keep], ids[keep]))]
+        ids, ts, volume = ids[order], ts[order], volume[order]
+        prices = {col: values[order] for col, values in prices.items()}
+        close = prices["close_price"]
+        m = len(ids)
+        if m == 0:
+            return
+
+        # ⏮️ Previous row per asset: shift within the batch, state from earlier batches at each run start
+        first = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        last = np.r_[first[1:] - 1, m - 1]
+        run_ids = ids[first]
+
+        has_prev = np.ones(m, dtype=bool)
+        prev_ts = np.empty(m, dtype=np.int64)
+        prev_close = np.empty(m)
+        prev_volume = np.empty(m)
+        prev_ts[1:], prev_close[1:], prev_volume[1:] = ts[:-1], close[:-1], volume[:-1]
+        has_prev[first] = self.seen[run_ids]
+        prev_ts[first] = self.last_ts[run_ids]
+        prev_close[first] = self.last_close[run_ids]
+        prev_volume[first] = self.last_volume[run_ids]
+
+        end_ids = ids[last]
+        self.seen[end_ids] = True
+        self.last_ts[end_ids] = ts[last]
+        self.last_close[end_ids] = close[last]
+        self.last_volume[end_ids] = volume[last]
+
+        # ⏱️ Time checks
+        diff = ts - prev_ts
+        hours = diff // HOUR_US
+        self._record("duplicate_timestamps", has_prev & (diff == 0), ids, ts)
+        self._record("out_of_order_rows", has_prev & (diff < 0), ids, ts, prev_timestamp=prev_ts)
+        self._record("time_gaps", has_prev & (hours > GAP_HOURS), ids, ts, prev_timestamp=prev_ts, hour_diff=hours)
+        self._record("missing_consecutive_hours", has_prev & (hours >= LONG_GAP_HOURS), ids, ts,
+                     prev_timestamp=prev_ts, hour_diff=hours)
+
+        # 📈 Price and volume jumps
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct_change = np.round(np.abs((close - prev_close) / prev_close) * 100, 2)
+            volume_ratio = np.round(volume / prev_volume, 2)
+        self._record("anomalies", has_prev & (pct_change > PRICE_JUMP_PCT), ids, ts,
+                     prev_close=prev_close, close=close, pct_change=pct_change)
+        self._record("spikes_in_volume", has_prev & (prev_volume != 0) & (volume_ratio > VOLUME_SPIKE_RATIO), ids, ts,
+                     prev_volume=prev_volume, volume=volume, volume_ratio=volume_ratio)
+
+        # ➖ Sign checks
+        nonpositive = np.zeros(m, dtype=bool)
+        negative = np.zeros(m, dtype=bool)
+        for values in prices.values():
+            nonpositive |= values <= 0
+            negative |= values < 0
+        self._record("negative_or_zero_prices", nonpositive, ids, ts, **prices)
+        self._record("negative_prices", negative, ids, ts, **prices)
+        self._record("negative_volume", volume < 0, ids, ts, volume=volume)
+
+        self.volume_chunks.append((ids, ts, volume))
+
+    def _volume_outliers(self):
+        if not self.volume_chunks:
+            return
+        ids, ts, volume = (np.concatenate(parts) for parts in zip(*self.volume_chunks))
+        # Linear interpolation, like PERCENTILE_CONT (NaN volumes are ignored)
+        thresholds = pd.Series(volume).groupby(ids).quantile(VOLUME_OUTLIER_QUANTILE)
+        threshold = thresholds.reindex(np.arange(len(self.asset_names))).to_numpy()[ids]
+        self._record("outliers_in_volume", volume > threshold * VOLUME_OUTLIER_FACTOR, ids, ts,
+                     volume=volume, vol_threshold=threshold)
+
+    def report(self):
+        """Finishes the scan-wide checks and returns a `DataQualityReport`."""
+        self._volume_outliers()
+        self.volume_chunks = []
+
+        issues = {}
+        for check in CHECKS:
+            frames = self.found[check]
+            issues[check] = (
+                pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["asset", "timestamp"])
+            )
+
+        # Extra rows sharing a timestamp -> one row per (asset, timestamp) with its total count
+        dups = issues["duplicate_timestamps"]
+        issues["duplicate_timestamps"] = (
+            dups.groupby(["asset", "timestamp"]).size().add(1).rename("count").reset_index()
+            if not dups.empty else pd.DataFrame(columns=["asset", "timestamp", "count"])
+        )
+
+        invalid = [] if self.known_assets is None else sorted(set(self.asset_names) - self.known_assets)
+        issues["invalid_asset_symbols"] = pd.DataFrame({"asset": invalid})
+
+        return DataQualityReport(issues, self.rows_scanned, self.batches, len(self.asset_names))
+
+
+def scan_batches(batches, known_assets=KNOWN_ASSETS):
+    """Scans an iterable of Arrow record batches once and returns the report."""
+    scanner = DataQualityScanner(known_assets)
+    for batch in batches:
+        scanner.update(batch)
+    return scanner.report()
+
+
+def sorted_batches(batches, batch_size=BATCH_SIZE):
+    """
+    Puts an unordered stream of scan batches in (asset, timestamp) order on the client: the
+    batches are collected as one Arrow table (scan columns only), sorted by Arrow and
+    re-sliced into `batch_size` batches.
+    """
+    batches = list(batches)
+    if not batches:
+        return []
+    table = pa.Table.from_batches(batches).sort_by([("asset", "ascending"), ("timestamp", "ascending")])
+    return table.to_batches(max_chunksize=batch_size)
+
+
+def scan_table(table=TABLE_PATH, backend=None, batch_size=BATCH_SIZE, known_assets=KNOWN_ASSETS):
+    """
+    Streams `table` from the storage backend (BigQuery, or DuckDB over local Parquet) as
+    Arrow batches and scans it once.
+
+    There is no ORDER BY: BigQuery would sort the whole table into a single output stream.
+    The rows are read unordered (in parallel streams where the backend supports it) and put
+    in (asset, timestamp) order by `sorted_batches` before the scan.
+    """
+    backend = backend or get_backend()
+    query = f"SELECT {', '.join(SCAN_COLUMNS)} FROM `{table}`"
+    return scan_batches(sorted_batches(backend.batches(query, batch_size), batch_size), known_assets)
+
+
+def scan_parquet(path, batch_size=BATCH_SIZE, known_assets=KNOWN_ASSETS):
+    """
+    Scans Parquet files without a query engine: a file, a list of files, or a directory
+    (every `*.parquet` under it, in path order). The asset/month price cache
+    (`feature_store/coinbase_hourly_prices`) already yields each asset's rows in time order.
+    """
+    if isinstance(path, (list, tuple)):
+        files = list(path)
+    elif os.path.isdir(path):
+        files = sorted(glob.glob(os.path.join(path, "**", "*.parquet"), recursive=True))
+    else:
+        files = [path]
+
+    def batches():
+        for file in files:
+            yield from pq.ParquetFile(file).iter_batches(batch_size=batch_size, columns=SCAN_COLUMNS)
+
+    return scan_batches(batches(), known_assets)
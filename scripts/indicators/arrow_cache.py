@@ -0,0 +1,165 @@
+import os
+import json
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# 📂 Local File Storage
+ARROW_CACHE_FILE = os.path.join("feature_store", "technical_indicators.arrow")
+FINGERPRINT_KEY = b"magician.source_fingerprint"
+ASSETS_KEY = b"magician.asset_fingerprints"   # JSON {asset: source fingerprint} (see `load_cached_assets`)
+
+
+def _to_arrow_column(series):
+    """
+    Converts one pandas column to Arrow without turning NaN into nulls, so float columns
+    stay null-free and can be handed back to NumPy/pandas zero-copy. Strings are
+    dictionary-encoded so `asset` maps straight onto a Categorical.
+    """
+    if pd.api.types.is_float_dtype(series.dtype) or pd.api.types.is_integer_dtype(series.dtype):
+        return pa.array(series.to_numpy())
+    if pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype):
+        return pa.array(series.astype(str).to_numpy(), type=pa.string()).dictionary_encode()
+    return pa.Array.from_pandas(series)
+
+
+def write_arrow_cache(df, path=ARROW_CACHE_FILE, fingerprint=None, asset_fingerprints=None):
+    """
+    Writes `df` as an uncompressed Arrow IPC file (Feather v2) with a single record batch,
+    so each column is one contiguous buffer in the file.
+    """
+    table = pa.table({col: _to_arrow_column(df[col]) for col in df.columns})
+    metadata = {}
+    if fingerprint is not None:
+        metadata[FINGERPRINT_KEY] = str(fingerprint).encode()
+    if asset_fingerprints is not None:
+        metadata[ASSETS_KEY] = json.dumps(asset_fingerprints, sort_keys=True).encode()
+    if metadata:
+        table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=None)
+    os.replace(tmp_path, path)
+
+
+def open_arrow_cache(path=ARROW_CACHE_FILE):
+    """
+    Memory-maps the cache read-only. The returned table's buffers point into the page
+    cache, so every process on the host that opens the file shares one physical copy.
+    """
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+
+def _metadata(path):
+    if not os.path.exists(path):
+        return {}
+    return pa.ipc.open_file(pa.memory_map(path, "r")).schema.metadata or {}
+
+
+def cache_fingerprint(path=ARROW_CACHE_FILE):
+    """Fingerprint of the data the cache was built from (None if missing or unstamped)."""
+    value = _metadata(path).get(FINGERPRINT_KEY)
+    return value.decode() if value is not None else None
+
+
+def cache_asset_fingerprints(path=ARROW_CACHE_FILE, fingerprint=None):
+    """Per-asset source fingerprints of the cache ({} if missing, or stamped with another `fingerprint`)."""
+    metadata = _metadata(path)
+    if ASSETS_KEY not in metadata or cache_fingerprint(path) != str(fingerprint):
+        return {}
+    return json.loads(metadata[ASSETS_KEY])
+
+
+def numpy_views(table, columns):
+    """Read-only NumPy views of numeric columns (raises if a column can't be viewed zero-copy)."""
+    return {col: table.column(col).chunk(0).to_numpy(zero_copy_only=True) for col in columns}
+
+
+def slice_table(table, columns=None, assets=None, start=None, end=None):
+    """Projects columns (zero-copy) and filters rows by asset and [start, end)."""
+    if columns is not None:
+        keep = ["asset", "timestamp"] + [c for c in columns if c not in ("asset", "timestamp")]
+        table = table.select(keep)
+
+    mask = None
+    if assets is not None:
+        assets = [assets] if isinstance(assets, str) else list(assets)
+        asset_col = table.column("asset")
+        if pa.types.is_dictionary(asset_col.type):
+            asset_col = asset_col.cast(pa.string())
+        mask = pc.is_in(asset_col, value_set=pa.array(assets, type=pa.string()))
+    for op, bound in (("greater_equal", start), ("less", end)):
+        if bound is not None:
+            ts = pd.Timestamp(bound)
+            ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+            cond = getattr(pc, op)(table.column("timestamp"), pa.scalar(ts, type=table.schema.field("timestamp").type))
+            mask = cond if mask is None else pc.and_(mask, cond)
+
+    return table if mask is None else table.filter(mask)
+
+
+def to_frame(table):
+    """Arrow -> pandas with one block per column, so null-free numeric columns aren't copied."""
+    return table.to_pandas(split_blocks=True, self_destruct=False)
+
+
+def load_cached(build, fingerprint, path=ARROW_CACHE_FILE, columns=None, assets=None, start=None, end=None):
+    """
+    ⚡ Loads indicators through the memory-mapped cache.
+
+    Args:
+        build: Zero-argument callable returning the full DataFrame when the cache is stale.
+        fingerprint: Identifies the source data; the cache is rebuilt when it changes.
+
+    Returns:
+        pd.DataFrame: Requested slice, backed by the mapped file wherever possible.
+    """
+    if cache_fingerprint(path) != str(fingerprint):
+        write_arrow_cache(build(), path, fingerprint)
+    return to_frame(slice_table(open_arrow_cache(path), columns, assets, start, end))
+
+
+def _spliced(path, read, kept, changed):
+    """Unchanged assets' rows from the mapped cache (copied) plus freshly read rows of `changed`."""
+    frames = [to_frame(slice_table(open_arrow_cache(path), assets=kept))] if kept else []
+    if changed:
+        frames.append(read(changed))
+    df = pd.concat(frames, ignore_index=True).astype({"asset": str})
+    return df.sort_values(["asset", "timestamp"], kind="stable").reset_index(drop=True)
+
+
+def load_cached_assets(read, asset_fingerprints, fingerprint, path=ARROW_CACHE_FILE, columns=None, assets=None,
+                       start=None, end=None):
+    """
+    ⚡ `load_cached` with a source fingerprint per asset, so a change to one asset doesn't
+    rebuild the whole cache.
+
+    Only the requested assets (all of them when `assets` is None) whose fingerprint changed
+    are read from source, with `read(assets)`; every other asset keeps its cached rows. A
+    different `fingerprint` (e.g. a schema version) still rebuilds everything.
+
+    Args:
+        read: Callable `read(assets)` returning the full rows of those assets.
+        asset_fingerprints (dict): Current source fingerprint per asset.
+        fingerprint: Identifies everything else the cache depends on.
+
+    Returns:
+        pd.DataFrame: Requested slice, backed by the mapped file wherever possible.
+    """
+    requested = list(asset_fingerprints) if assets is None else \
+        [a for a in ([assets] if isinstance(assets, str) else map(str, assets)) if a in asset_fingerprints]
+    cached = cache_asset_fingerprints(path, fingerprint)
+    changed = [a for a in requested if cached.get(a) != asset_fingerprints[a]]
+    kept = [a for a in cached if a in asset_fingerprints and a not in changed]
+    if not changed and not kept:   # Nothing cached, and none of the requested assets exists
+        return read(requested)
+
+    if changed or len(kept) < len(cached):   # Something to re-read, or assets gone from the source
+        df = _spliced(path, read, kept, changed)
+        marks = {a: cached[a] for a in kept}
+        marks.update({a: asset_fingerprints[a] for a in changed})
+        write_arrow_cache(df, path, fingerprint, marks)
+    return to_frame(slice_table(open_arrow_cache(path), columns, assets, start, end))
@@ -1,15 +1,15 @@
 import os
-import pandas as pd
-import numpy as np
-from google.cloud import bigquery
-from pandas_gbq import to_gbq
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-import sklearn
-print(sklearn.__version__)
-
-
+import argparse
+from scripts.data_processing.fetch_prices import load_prices
+from scripts.data_processing.storage import get_backend
+from scripts.data_processing.upload import upload_delta
+from scripts.indicators.panel import compute_panel_indicators
+from scripts.indicators.streaming import StreamingIndicators
+from scripts.indicators.timeframes import SEARCH_MODELS, search_timeframes
+from scripts.indicators.parallel import optimal_timeframes_table
+from scripts.indicators.setup_indicators import load_indicators
+from scripts.indicators.schema import apply_schema
+from scripts.monitoring.instrumentation import instrument, stage
 
 # 🌐 BigQuery Configuration
 PROJECT_ID = "cloud4marketing-281206"
@@ -18,149 +18,156 @@ RAW_TABLE = f"{PROJECT_ID}.{DATASET_ID}.coinbase_hourly_prices"
 TECHNICALS_TABLE = f"{PROJECT_ID}.{DATASET_ID}.technical_indicators"
 OPTIMAL_TIMEFRAMES_TABLE = f"{PROJECT_ID}.{DATASET_ID}.optimal_timeframes"
 
-# 🔐 Set authentication
+# 🔐 Authentication (only applied by the CLI, and only if not already set)
 CREDENTIALS_PATH = r"C:\Users\eddie\OneDrive\code\magician\config\cloud_credentials.json"
-os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = CREDENTIALS_PATH
-client = bigquery.Client()
-
-# 🟢 Step 1: Load Data from BigQuery (Last 6 Months for Freshness)
-query = f"""
-    SELECT asset, timestamp, open_price, high_price, low_price, close_price, volume
-    FROM `{RAW_TABLE}`
-    WHERE DATETIME(timestamp) >= DATETIME_SUB(CURRENT_DATETIME(), INTERVAL 6 MONTH)
-    ORDER BY asset, timestamp
-"""
-df = client.query(query).to_dataframe()
-
-# 🔍 Debug: Check Unique Assets Before Processing
-print(f"🔍 Unique assets count before processing: {df['asset'].nunique()}")
-print(df['asset'].value_counts())  # See how many rows exist per asset
-print(df[['asset', 'timestamp']].head(50))  # Sample data check
-
-# 📈 Step 2: Compute Technical Indicators (Per Asset)
-def compute_indicators(group):
-    """Computes a set of technical indicators for each asset using Pandas & NumPy."""
-    
-    print(f"🛠️ Processing asset: {group['asset'].iloc[0]}, Rows: {len(group)}")  # Debug
-
-    # 🔹 Moving Averages
-    group["ema_20"] = group["close_price"].ewm(span=20, adjust=False).mean()
-    group["ema_50"] = group["close_price"].ewm(span=50, adjust=False).mean()
-
-    # 🔹 Relative Strength Index (RSI)
-    delta = group["close_price"].diff()
-    gain = np.where(delta > 0, delta, 0)
-    loss = np.where(delta < 0, -delta, 0)
-    avg_gain = pd.Series(gain).rolling(window=14, min_periods=1).mean()
-    avg_loss = pd.Series(loss).rolling(window=14, min_periods=1).mean()
-    rs = avg_gain / avg_loss
-    group["rsi_14"] = 100 - (100 / (1 + rs))
-
-    # 🔹 Bollinger Bands
-    group["bollinger_mid"] = group["close_price"].rolling(window=20).mean()
-    group["bollinger_std"] = group["close_price"].rolling(window=20).std()
-    group["bollinger_upper"] = group["bollinger_mid"] + (group["bollinger_std"] * 2)
-    group["bollinger_lower"] = group["bollinger_mid"] - (group["bollinger_std"] * 2)
-
-    # 🔹 MACD
-    short_ema = group["close_price"].ewm(span=12, adjust=False).mean()
-    long_ema = group["close_price"].ewm(span=26, adjust=False).mean()
-    group["macd"] = short_ema - long_ema
-    group["macd_signal"] = group["macd"].ewm(span=9, adjust=False).mean()
-
-    # 🔹 Money Flow Index (MFI)
-    typical_price = (group["high_price"] + group["low_price"] + group["close_price"]) / 3
-    money_flow = typical_price * group["volume"]
-    pos_flow = money_flow.where(typical_price > typical_price.shift(), 0)
-    neg_flow = money_flow.where(typical_price < typical_price.shift(), 0)
-    money_ratio = pos_flow.rolling(14).sum() / neg_flow.rolling(14).sum()
-    group["mfi_14"] = 100 - (100 / (1 + money_ratio))
-
-    # 🔹 Z-Score (Mean Reversion)
-    group["z_score"] = (group["close_price"] - group["close_price"].rolling(20).mean()) / group["close_price"].rolling(20).std()
-
-    # 🔹 Average True Range (ATR)
-    high_low = group["high_price"] - group["low_price"]
-    high_close = np.abs(group["high_price"] - group["close_price"].shift())
-    low_close = np.abs(group["low_price"] - group["close_price"].shift())
-
-    true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    group["atr_14"] = true_range.rolling(14).mean()
-
-    return group
-
-# 🛠 Apply Indicator Computation
-df = df.groupby("asset", group_keys=True).apply(compute_indicators).reset_index(drop=True)
-
-# 🔍 Debug: Check Unique Assets After Processing
-print(f"🔍 Unique assets count after processing: {df['asset'].nunique()}")
-print(df['asset'].unique())  # List all unique asset names
-print(df[['asset', 'timestamp']].head(50))  # Sample check
-
-df.dropna(inplace=True)
-
-# 🛠 Step 3: Upload Processed Data to BigQuery
-to_gbq(df, TECHNICALS_TABLE, project_id=PROJECT_ID, if_exists="replace")
-
-print("✅ Technical indicators computed & uploaded to BigQuery!")
-print([col for col in df.columns if 'atr' in col])
+
+# 🏃 Stages the CLI can run, in pipeline order
+STAGES = ["prices", "indicators", "timeframes"]
+
+
+# 🟢 Step 1: Load Data (Last 6 Months; only bars newer than the local watermark are pulled from the backend)
+@instrument("load_price_history")
+def load_price_history(backend=None):
+    """Syncs the local raw-price cache and returns the retained history."""
+    return load_prices(backend=backend or get_backend())
+
+
+# 📈 Step 2: Compute Technical Indicators (All Assets in One Vectorized Pass)
+@instrument("compute_indicators", rows_in="prices")
+def compute_indicators(prices, seed_state=True, columns=None):
+    """
+    Computes every indicator for every asset in one vectorized pass.
+
+    Args:
+        prices (pd.DataFrame): Raw hourly bars for any number of assets.
+        seed_state (bool): Also save the per-asset streaming state, so hourly refreshes
+            (`scripts.indicators.streaming`) can run incrementally from here.
+        columns (list): Only these registered indicators (default: all of `INDICATOR_COLUMNS`);
+            see `scripts.indicators.registry`.
+
+    Returns:
+        pd.DataFrame: Complete indicator rows (warm-up rows with NaNs dropped), cast to the
+        compact `INDICATOR_SCHEMA` once the float64 state has been seeded.
+    """
+    df = compute_panel_indicators(prices, columns)
+    if seed_state:
+        StreamingIndicators.from_history(df).save()
+    return apply_schema(df.dropna().reset_index(drop=True))
+
+
+# 🛠 Step 3: Upload Processed Data to the Backend
+@instrument("upload_indicators", rows_in="df")
+def upload_indicators(df, backend=None):
+    """
+    Stages only bars newer than the last uploaded watermark and MERGEs them on (asset, timestamp).
+
+    Returns:
+        int: Number of rows uploaded.
+    """
+    return upload_delta(df, TECHNICALS_TABLE, (backend or get_backend()).sink())
+
 
 # 🟢 Step 4: Define Function to Get Optimal Timeframe
 def get_optimal_timeframe(asset_data):
     """
     Analyzes past price movements to determine the best timeframe per asset.
     Computes predictive performance metrics (MAE, MSE, R², RMSE) for different timeframes.
+
+    The search itself lives in `scripts.indicators.timeframes.search_timeframes`, which also
+    returns the full per-horizon metric table; `asset_data` is left untouched.
+    """
+    _, best_timeframe = search_timeframes(asset_data)
+    return best_timeframe
+
+
+# 🟢 Step 5: Apply Function to Each Asset in Parallel and Store Results
+def compute_optimal_timeframes(df, n_workers=None, inner_jobs=None, model=None):
     """
-    timeframes = [1, 2, 4, 6, 12, 24]  # Different timeframes to test (in hours)
-    results = []
+    Runs the timeframe search for every asset across processes.
+
+    `n_workers` / `inner_jobs` split the CPUs between processes and each model's n_jobs
+    (default: the `TIMEFRAME_WORKERS` / `TIMEFRAME_INNER_JOBS` environment variables).
+    `model` names the learner from `SEARCH_MODELS` (default: `TIMEFRAME_MODEL`, else random_forest).
 
-    for timeframe in timeframes:
-        asset_data[f"target_{timeframe}h"] = asset_data["close_price"].shift(-timeframe)
-        asset_data.dropna(inplace=True)
+    Returns:
+        pd.DataFrame: One row per asset (sorted by asset) with its best timeframe and metrics.
+    """
+    n_workers = n_workers or int(os.getenv("TIMEFRAME_WORKERS", "0")) or None
+    inner_jobs = inner_jobs or int(os.getenv("TIMEFRAME_INNER_JOBS", "0")) or None
+    model = model or os.getenv("TIMEFRAME_MODEL", "random_forest")
+    if model not in SEARCH_MODELS:
+        raise ValueError(f"🤨 Unknown model '{model}'. Supported models: {list(SEARCH_MODELS.keys())}")
 
-        X = asset_data.drop(columns=[f"target_{timeframe}h", "asset", "timestamp"])
-        y = asset_data[f"target_{timeframe}h"]
+    with stage("compute_optimal_timeframes", rows_in=len(df), model=model) as record:
+        # Sorted by asset, whatever order the workers finished in; short assets are skipped
+        result = optimal_timeframes_table(df, n_workers=n_workers, inner_jobs=inner_jobs,
+                                          model_factory=SEARCH_MODELS[model])
+        record.rows_out = len(result)
+        record.add(best_timeframes={asset: int(tf) for asset, tf in zip(result["asset"], result["timeframe"])})
 
-        # Split data into training and testing sets
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    print(f"⏱️ Best timeframes: {dict(zip(result['asset'], result['timeframe']))}")
+    return result
 
-        # Train a simple model (e.g., RandomForestRegressor)
-        model = RandomForestRegressor(n_estimators=100, random_state=42)
-        model.fit(X_train, y_train)
-        y_pred = model.predict(X_test)
 
-        # Compute performance metrics
-        mae = mean_absolute_error(y_test, y_pred)
-        mse = mean_squared_error(y_test, y_pred)
-        r2 = r2_score(y_test, y_pred)
-        rmse = mean_squared_error(y_test, y_pred) ** 0.5
+# 🛠 Step 6: Upload Optimal Timeframes to the Backend
+@instrument("upload_optimal_timeframes", rows_in="df_optimal_timeframes")
+def upload_optimal_timeframes(df_optimal_timeframes, backend=None):
+    """MERGEs one row per asset into the optimal-timeframes table (keyed on asset)."""
+    sink = (backend or get_backend()).sink()
+    return upload_delta(df_optimal_timeframes, OPTIMAL_TIMEFRAMES_TABLE, sink, keys=["asset"], watermark_column=None)
 
 
-        results.append({
-            "timeframe": timeframe,
-            "mae": mae,
-            "mse": mse,
-            "r2": r2,
-            "rmse": rmse
-        })
+def run_stage(stage, backend=None):
+    """Runs one CLI stage end to end (load -> compute -> upload) against `backend`."""
+    backend = backend or get_backend()
 
-    # Find the best timeframe based on the lowest RMSE
-    best_timeframe = min(results, key=lambda x: x["rmse"])
+    if stage == "prices":
+        prices = load_price_history(backend)
+        print(f"✅ Price cache holds {len(prices)} bars for {prices['asset'].nunique()} assets")
 
-    return best_timeframe
+    elif stage == "indicators":
+        df = compute_indicators(load_price_history(backend))
+        uploaded = upload_indicators(df, backend)
+        print(f"⬆️ Uploaded {uploaded} new indicator rows")
+        print("✅ Technical indicators computed & uploaded!")
 
-# 🟢 Step 5: Apply Function to Each Asset and Store Results
-optimal_timeframes = []
+    elif stage == "timeframes":
+        df_optimal_timeframes = compute_optimal_timeframes(load_indicators(backend=backend))
+        upload_optimal_timeframes(df_optimal_timeframes, backend)
+        print("✅ Optimal timeframes computed & uploaded!")
 
-for asset, group in df.groupby("asset"):
-    best_timeframe = get_optimal_timeframe(group)
-    best_timeframe["asset"] = asset
-    optimal_timeframes.append(best_timeframe)
+    else:
+        raise ValueError(f"🤨 Unknown stage '{stage}'. Supported stages: {STAGES + ['all']}")
+
+
+def run_pipeline(backend=None):
+    """Runs every stage in one process, handing each stage's output straight to the next."""
+    backend = backend or get_backend()
+    df = compute_indicators(load_price_history(backend))
+    uploaded = upload_indicators(df, backend)
+    print(f"⬆️ Uploaded {uploaded} new indicator rows")
+
+    df_optimal_timeframes = compute_optimal_timeframes(df)
+    upload_optimal_timeframes(df_optimal_timeframes, backend)
+    print("✅ Technical indicators & optimal timeframes computed & uploaded!")
+    return df_optimal_timeframes
+
+
+def main(argv=None):
+    """
+    CLI: `python -m scripts.indicators.compute_indicators [prices|indicators|timeframes|all]`
+    (default: all).
+    """
+    parser = argparse.ArgumentParser(description="Compute technical indicators and optimal timeframes.")
+    parser.add_argument("stage", nargs="?", default="all", choices=STAGES + ["all"])
+    args = parser.parse_args(argv)
 
-# Convert results to DataFrame
-df_optimal_timeframes = pd.DataFrame(optimal_timeframes)
+    os.environ.setdefault("GOOGLE_APPLICATION_CREDENTIALS", CREDENTIALS_PATH)
+    if args.stage == "all":
+        run_pipeline()
+    else:
+        run_stage(args.stage)
 
-# 🛠 Step 6: Upload Optimal Timeframes to BigQuery
-to_gbq(df_optimal_timeframes, OPTIMAL_TIMEFRAMES_TABLE, project_id=PROJECT_ID, if_exists="replace")
 
-print("✅ Optimal timeframes computed & uploaded to BigQuery!")
+if __name__ == "__main__":
+    main()
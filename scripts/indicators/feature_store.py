@@ -0,0 +1,260 @@
+import os
+import json
+import hashlib
+from urllib.parse import quote
+import pandas as pd
+
+# 📂 Local File Storage
+STORE_ROOT = os.path.join("feature_store", "technical_indicators")  # One subdirectory per backend (`cache_root`)
+MANIFEST_FILE = "_manifest.json"
+DEFAULT_MAX_AGE = pd.Timedelta(hours=1)  # Open (current-month) partitions older than this are stale
+
+# 🔑 Identifier columns every read returns
+KEY_COLUMNS = ["asset", "timestamp"]
+
+
+def _utc(ts):
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def month_bounds(month):
+    """[start, end) of a `YYYY-MM` month as UTC timestamps."""
+    start = _utc(pd.Timestamp(f"{month}-01"))
+    return start, start + pd.offsets.MonthBegin(1)
+
+
+def partition_key(asset, month):
+    return f"asset={quote(str(asset), safe='')}/month={month}"
+
+
+class FeatureStore:
+    """
+    🗄️ **Local feature store partitioned by asset and month**
+
+    Layout: `<root>/asset=<asset>/month=<YYYY-MM>/part.parquet` plus a manifest that records,
+    per partition, its row count, timestamp range and freshness watermark (when it was
+    written). Reads prune partitions from the manifest, then push column projection and the
+    time predicate down into Parquet, so one asset's backtest never touches the rest.
+    """
+
+    def __init__(self, root=STORE_ROOT):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_FILE)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        return {"version": 1, "columns": [], "partitions": {}}
+
+    def _save_manifest(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def is_empty(self):
+        return not self.manifest["partitions"]
+
+    def fingerprint(self):
+        """Hash of the manifest's partitions; changes whenever any partition is rewritten."""
+        payload = json.dumps(self.manifest["partitions"], sort_keys=True).encode()
+        return hashlib.sha1(payload).hexdigest()
+
+    def asset_fingerprints(self):
+        """`fingerprint()` per asset: changes whenever one of that asset's partitions is rewritten."""
+        by_asset = {}
+        for key, part in self.manifest["partitions"].items():
+            by_asset.setdefault(part["asset"], {})[key] = part
+        return {
+            asset: hashlib.sha1(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+            for asset, parts in sorted(by_asset.items())
+        }
+
+    def assets(self):
+        return sorted({p["asset"] for p in self.manifest["partitions"].values()})
+
+    def partitions(self, assets=None, start=None, end=None):
+        """Manifest keys of the partitions that can hold rows for these assets in [start, end)."""
+        wanted = None if assets is None else {str(a) for a in ([assets] if isinstance(assets, str) else assets)}
+        start = None if start is None else _utc(start)
+        end = None if end is None else _utc(end)
+
+        keys = []
+        for key, part in sorted(self.manifest["partitions"].items()):
+            if wanted is not None and part["asset"] not in wanted:
+                continue
+            if start is not None and _utc(part["max_timestamp"]) < start:
+                continue
+            if end is not None and _utc(part["min_timestamp"]) >= end:
+                continue
+            keys.append(key)
+        return keys
+
+    def _partition_file(self, key):
+        return os.path.join(self.root, *key.split("/"), "part.parquet")
+
+    def _write_partition(self, key, asset, month, part, written_at):
+        os.makedirs(os.path.dirname(self._partition_file(key)), exist_ok=True)
+        part.to_parquet(self._partition_file(key), index=False)
+
+        part_times = pd.to_datetime(part["timestamp"], utc=True)
+        self.manifest["partitions"][key] = {
+            "asset": str(asset),
+            "month": month,
+            "rows": int(len(part)),
+            "min_timestamp": part_times.min().isoformat(),
+            "max_timestamp": part_times.max().isoformat(),
+            "written_at": written_at.isoformat(),
+        }
+
+    def write(self, df, now=None, merge=False):
+        """
+        Writes every asset/month partition present in `df` and updates the manifest.
+
+        Partitions are replaced, or with `merge=True` combined with the rows already stored
+        (incoming rows win on a duplicate (asset, timestamp)).
+
+        Returns:
+            list: The partition keys that were rewritten.
+        """
+        if df.empty:
+            return []
+        now = _utc(now or pd.Timestamp.now(tz="UTC"))
+        df = df.sort_values(KEY_COLUMNS, kind="stable")
+        months = pd.to_datetime(df["timestamp"], utc=True).dt.strftime("%Y-%m")
+
+        written = []
+        for (asset, month), part in df.groupby([df["asset"], months], sort=True, observed=True):
+            key = partition_key(asset, month)
+            if merge and key in self.manifest["partitions"]:
+                part = pd.concat([pd.read_parquet(self._partition_file(key)), part], ignore_index=True)
+                part = part.drop_duplicates(KEY_COLUMNS, keep="last").sort_values(KEY_COLUMNS, kind="stable")
+            self._write_partition(key, asset, month, part, now)
+            written.append(key)
+
+        self.manifest["columns"] = list(df.columns)
+        self._save_manifest()
+        return written
+
+    def evict(self, before):
+        """
+        Drops every row older than `before`: whole partitions are deleted, and the one
+        straddling the cutoff is trimmed (keeping its freshness watermark).
+
+        Returns:
+            int: Number of partitions deleted or trimmed.
+        """
+        before = _utc(before)
+        touched = 0
+        for key, part in sorted(self.manifest["partitions"].items()):
+            if _utc(part["min_timestamp"]) >= before:
+                continue
+            touched += 1
+            if _utc(part["max_timestamp"]) < before:
+                os.remove(self._partition_file(key))
+                del self.manifest["partitions"][key]
+                continue
+            rows = pd.read_parquet(self._partition_file(key))
+            rows = rows[pd.to_datetime(rows["timestamp"], utc=True) >= before]
+            self._write_partition(key, part["asset"], part["month"], rows, _utc(part["written_at"]))
+
+        if touched:
+            self._save_manifest()
+        return touched
+
+    def watermarks(self):
+        """High-water timestamp per asset: the newest row stored for it."""
+        marks = {}
+        for part in self.manifest["partitions"].values():
+            ts = _utc(part["max_timestamp"])
+            if part["asset"] not in marks or ts > marks[part["asset"]]:
+                marks[part["asset"]] = ts
+        return marks
+
+    def read(self, columns=None, assets=None, start=None, end=None):
+        """
+        Reads a slice of the store.
+
+        Args:
+            columns: Columns to load (asset and timestamp are always included).
+            assets: One asset or a list of assets (default: all).
+            start / end: Optional [start, end) timestamp bounds.
+
+        Returns:
+            pd.DataFrame: Matching rows ordered by (asset, timestamp).
+        """
+        if columns is not None:
+            columns = KEY_COLUMNS + [c for c in columns if c not in KEY_COLUMNS]
+
+        filters = []
+        if start is not None:
+            filters.append(("timestamp", ">=", _utc(start)))
+        if end is not None:
+            filters.append(("timestamp", "<", _utc(end)))
+
+        frames = [
+            pd.read_parquet(
+                self._partition_file(key),
+                columns=columns,
+                filters=filters or None,
+            )
+            for key in self.partitions(assets, start, end)
+        ]
+        if not frames:
+            return pd.DataFrame(columns=columns or self.manifest["columns"])
+        return pd.concat(frames, ignore_index=True)
+
+    def stale_partitions(self, max_age=DEFAULT_MAX_AGE, now=None):
+        """
+        Partitions that need a refresh: the month was still open when the partition was
+        written and that write is older than `max_age`. Closed months never go stale.
+        """
+        now = _utc(now or pd.Timestamp.now(tz="UTC"))
+        stale = []
+        for key, part in sorted(self.manifest["partitions"].items()):
+            written_at = _utc(part["written_at"])
+            _, month_end = month_bounds(part["month"])
+            if written_at < month_end and now - written_at > max_age:
+                stale.append(key)
+        return stale
+
+    def refresh(self, fetch, max_age=DEFAULT_MAX_AGE, now=None, fetch_new=None):
+        """
+        Rewrites only the stale partitions (and any newer months that appeared since).
+
+        Args:
+            fetch: Callable `fetch(assets, since)` returning indicator rows for those assets
+                   with `timestamp >= since`.
+            fetch_new: Optional callable `fetch_new(known_assets)` returning the rows of every
+                   asset the store doesn't hold yet (e.g. new listings). Asked whenever a
+                   refresh goes to the source anyway.
+
+        Returns:
+            list: The partition keys that were rewritten.
+        """
+        stale = self.stale_partitions(max_age, now)
+        if not stale:
+            return []
+
+        parts = [self.manifest["partitions"][key] for key in stale]
+        assets = sorted({p["asset"] for p in parts})
+        since = min(month_bounds(p["month"])[0] for p in parts)
+        df = fetch(assets, since)
+
+        written = []
+        if not df.empty:
+            # Only stale partitions, or partitions that don't exist yet, get rewritten
+            months = pd.to_datetime(df["timestamp"], utc=True).dt.strftime("%Y-%m")
+            keys = [partition_key(a, m) for a, m in zip(df["asset"], months)]
+            stale = set(stale)
+            keep = [key in stale or key not in self.manifest["partitions"] for key in keys]
+            written = self.write(df[keep], now)
+
+        if fetch_new is not None:
+            written += self.write(fetch_new(self.assets()), now)
+        return written
+
@@ -0,0 +1,220 @@
+import numpy as np
+import pandas as pd
+
+# 📊 Columns the engine reads and writes
+PRICE_COLUMNS = ["open_price", "high_price", "low_price", "close_price", "volume"]
+INDICATOR_COLUMNS = [
+    "ema_20", "ema_50", "rsi_14",
+    "bollinger_mid", "bollinger_std", "bollinger_upper", "bollinger_lower",
+    "macd", "macd_signal", "mfi_14", "z_score", "atr_14",
+]
+
+# 🔹 EMA spans driven off the close (ema_20, ema_50 and the two MACD legs)
+CLOSE_EMA_SPANS = [20, 50, 12, 26]
+MACD_SIGNAL_SPAN = 9
+
+
+def segment_offsets(assets):
+    """
+    Finds the contiguous per-asset segments of an array already sorted by asset.
+
+    Returns:
+        (starts, lengths, row_start): segment start offsets, segment lengths and,
+        for every row, the offset of the segment it belongs to.
+    """
+    n = len(assets)
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+
+    boundary = np.ones(n, dtype=bool)
+    boundary[1:] = assets[1:] != assets[:-1]
+    starts = np.flatnonzero(boundary)
+    lengths = np.diff(np.append(starts, n))
+    row_start = np.repeat(starts, lengths)
+    return starts, lengths, row_start
+
+
+def shift_within(values, row_start, periods=1):
+    """Shifts values forward by `periods` rows without crossing asset boundaries (like groupby().shift())."""
+    out = np.full(len(values), np.nan)
+    idx = np.arange(periods, len(values))
+    keep = idx - periods >= row_start[idx]
+    out[idx[keep]] = values[idx[keep] - periods]
+    return out
+
+
+def same_value_run(values, row_start):
+    """Length of the run of identical values ending at each row (NaN breaks a run)."""
+    n = len(values)
+    same = np.zeros(n, dtype=bool)
+    same[1:] = (values[1:] == values[:-1]) & (np.arange(1, n) > row_start[1:])
+    run_id = np.cumsum(~same)
+    run_first = np.flatnonzero(~same)
+    return np.arange(n) - run_first[run_id - 1] + 1
+
+
+def _window_sum(values, row_start, window):
+    """Per-row sum and non-NaN count over the trailing window, clipped at the asset boundary."""
+    n = len(values)
+    total = np.zeros(n)
+    position = np.arange(n) - row_start
+    valid = ~np.isnan(values)
+
+    if valid.all():
+        for lag in range(min(window, n)):
+            total[lag:] += np.where(position[lag:] >= lag, values[:n - lag], 0.0)
+        return total, np.minimum(position + 1, window)
+
+    count = np.zeros(n, dtype=np.int64)
+    filled = np.where(valid, values, 0.0)
+    for lag in range(min(window, n)):
+        inside = position[lag:] >= lag
+        total[lag:] += np.where(inside, filled[:n - lag], 0.0)
+        count[lag:] += inside & valid[:n - lag]
+    return total, count
+
+
+def rolling_sum(values, row_start, window, min_periods=None):
+    """Segment-aware equivalent of `Series.rolling(window, min_periods).sum()`."""
+    min_periods = window if min_periods is None else min_periods
+    total, count = _window_sum(values, row_start, window)
+    run = same_value_run(values, row_start)
+    flat = run >= count
+    total = np.where(flat, values * count, total)
+    return np.where(count >= max(min_periods, 1), total, np.nan)
+
+
+def rolling_mean(values, row_start, window, min_periods=None):
+    """Segment-aware equivalent of `Series.rolling(window, min_periods).mean()`."""
+    min_periods = window if min_periods is None else min_periods
+    total, count = _window_sum(values, row_start, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+    run = same_value_run(values, row_start)
+    mean = np.where(run >= count, values, mean)
+    return np.where(count >= max(min_periods, 1), mean, np.nan)
+
+
+def rolling_std(values, row_start, window, mean):
+    """
+    Segment-aware rolling sample std (ddof=1) with `min_periods=window`, given the matching
+    `rolling_mean(values, row_start, window)`. Uses a two-pass window sum so that large-priced
+    assets don't lose precision.
+    """
+    n = len(values)
+    squares = np.zeros(n)
+    position = np.arange(n) - row_start
+    for lag in range(min(window, n)):
+        dev = values[:n - lag] - mean[lag:]
+        inside = (position[lag:] >= lag) & ~np.isnan(dev)
+        squares[lag:] += np.where(inside, dev * dev, 0.0)
+
+    _, count = _window_sum(values, row_start, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = np.maximum(squares / (count - 1), 0.0)
+    var = np.where(same_value_run(values, row_start) >= count, 0.0, var)
+    var = np.where((count >= window) & (count > 1), var, np.nan)
+    return np.sqrt(var)
+
+
+def rolling_mean_std(values, row_start, window):
+    """Segment-aware rolling mean and sample std (ddof=1) with `min_periods=window`."""
+    mean = rolling_mean(values, row_start, window)
+    return mean, rolling_std(values, row_start, window, mean)
+
+
+def ewm_panel(values, starts, lengths, spans):
+    """
+    Runs `ewm(span=..., adjust=False).mean()` for several spans at once across all assets.
+
+    The recursion walks bar positions (0, 1, 2, ...) and updates every asset that is
+    still alive at that position in one vector operation, mirroring pandas' NaN rules.
+
+    Returns:
+        np.ndarray: shape (len(values), len(spans)).
+    """
+    spans = np.atleast_1d(np.asarray(spans, dtype=np.float64))
+    alpha = 2.0 / (spans + 1.0)
+    out = np.full((len(values), len(spans)), np.nan)
+    if len(starts) == 0:
+        return out
+
+    # Longest segments first, so the live assets at bar k are always a prefix
+    order = np.argsort(-lengths, kind="stable")
+    seg_starts = starts[order]
+    seg_lengths = lengths[order]
+
+    if not np.isnan(values).any():
+        # Fast path: no gaps, so pandas' weight bookkeeping collapses to a fixed blend
+        decay = 1.0 - alpha
+        norm = decay + alpha
+        weighted = np.repeat(values[seg_starts][:, None], len(spans), axis=1)
+        out[seg_starts] = weighted
+        for k in range(1, int(seg_lengths[0])):
+            live = int(np.searchsorted(-seg_lengths, -k, side="left"))
+            rows = seg_starts[:live] + k
+            cur = values[rows][:, None]
+            y = weighted[:live]
+            weighted[:live] = np.where(y != cur, (decay * y + alpha * cur) / norm, y)
+            out[rows] = weighted[:live]
+        return out
+
+    weighted = np.full((len(starts), len(spans)), np.nan)
+    old_wt = np.ones_like(weighted)
+
+    for k in range(int(seg_lengths[0])):
+        live = int(np.searchsorted(-seg_lengths, -k, side="left"))
+        rows = seg_starts[:live] + k
+        cur = values[rows][:, None]
+        y = weighted[:live]
+        w = old_wt[:live]
+
+        started = ~np.isnan(y)
+        is_obs = ~np.isnan(cur)
+        w = np.where(started, w * (1.0 - alpha), w)
+        update = started & is_obs & (y != cur)
+        with np.errstate(invalid="ignore"):
+            blended = (w * y + alpha * cur) / (w + alpha)
+        y = np.where(update, blended, y)
+        w = np.where(started & is_obs, 1.0, w)
+        y = np.where(~started & is_obs, cur, y)
+
+        weighted[:live] = y
+        old_wt[:live] = w
+        out[rows] = y
+    return out
+
+
+# The two functions below are built on the indicator registry, which is itself built on the
+# primitives above (hence the imports inside them).
+def bar_inputs(df, row_start):
+    """
+    Builds the per-bar series the indicators are computed from (previous close, RSI
+    gains/losses, MFI money flows, true range) for a frame sorted by (asset, timestamp).
+
+    Returns:
+        dict: Column name -> float64 NumPy array aligned with `df`.
+    """
+    from scripts.indicators.registry import BAR_INPUTS, evaluate
+    return evaluate(df, BAR_INPUTS, row_start)
+
+
+def compute_panel_indicators(df, columns=None):
+    """
+    Computes technical indicators for all assets in one vectorized pass.
+
+    The frame is sorted once by (asset, timestamp); each column is then processed as a
+    contiguous NumPy array with per-asset segment offsets instead of a groupby().apply().
+    Nothing is printed, queried or uploaded, so this is safe to call from anywhere.
+
+    Args:
+        df (pd.DataFrame): Hourly bars with `asset`, `timestamp` and the OHLCV columns.
+        columns (list): Registered indicators to compute (default: `INDICATOR_COLUMNS`);
+            see `scripts.indicators.registry`.
+
+    Returns:
+        pd.DataFrame: The sorted input plus the indicator columns, with a fresh RangeIndex.
+    """
+    from scripts.indicators.registry import compute
+    return compute(df, columns)
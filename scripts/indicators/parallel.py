@@ -0,0 +1,111 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+import numpy as np
+import pandas as pd
+from scripts.indicators.panel import segment_offsets
+from scripts.indicators.timeframes import (
+    FEATURE_DTYPE,
+    TIMEFRAMES,
+    best_timeframe,
+    build_horizon_targets,
+    evaluate_timeframes,
+    feature_columns,
+    make_default_model,
+)
+
+
+def split_cpu_budget(n_workers=None, inner_jobs=None, n_tasks=None, total_cpus=None):
+    """
+    Splits the CPU budget between outer worker processes and each model's inner `n_jobs`.
+
+    With neither given, every CPU gets its own process and models fit single-threaded
+    (best when there are many assets). Giving one derives the other from the CPU count.
+
+    Returns:
+        (n_workers, inner_jobs)
+    """
+    total_cpus = total_cpus or os.cpu_count() or 1
+    if inner_jobs is None:
+        inner_jobs = 1 if n_workers is None else max(1, total_cpus // n_workers)
+    if n_workers is None:
+        n_workers = max(1, total_cpus // inner_jobs)
+    if n_tasks is not None:
+        n_workers = max(1, min(n_workers, n_tasks))
+    return n_workers, inner_jobs
+
+
+def asset_payloads(df, columns=None):
+    """
+    Yields `(asset, X, close)` per asset as plain NumPy arrays, so workers receive
+    compact buffers instead of pickled DataFrames. X is built once for the whole panel.
+    """
+    panel = df.sort_values(["asset", "timestamp"], kind="stable")
+    columns = feature_columns(panel) if columns is None else list(columns)
+    X = panel[columns].to_numpy(dtype=FEATURE_DTYPE)
+    close = panel["close_price"].to_numpy(dtype=np.float64)
+    assets = panel["asset"].to_numpy()
+    starts, lengths, _ = segment_offsets(assets)
+
+    for start, length in zip(starts, lengths):
+        end = start + length
+        yield assets[start], X[start:end], close[start:end]
+
+
+def evaluate_asset(asset, X, close, timeframes=TIMEFRAMES, inner_jobs=1, model_factory=make_default_model):
+    """Worker entry point: runs the full horizon search for one asset's arrays."""
+    targets = build_horizon_targets(close, timeframes)
+    metrics = evaluate_timeframes(X, targets, timeframes, partial(model_factory, n_jobs=inner_jobs))
+    return asset, metrics
+
+
+def iter_optimal_timeframes(df, timeframes=TIMEFRAMES, n_workers=None, inner_jobs=None, model_factory=make_default_model):
+    """
+    ⚡ Runs the per-asset timeframe search across a process pool.
+
+    Results stream back as each asset finishes (completion order, not asset order).
+    Every model is seeded, so the metrics don't depend on the worker count. `model_factory`
+    (see `SEARCH_MODELS`) must be a module-level function taking `n_jobs`. An asset with too
+    little history to evaluate any timeframe is skipped with a warning instead of aborting the run.
+
+    Yields:
+        (asset, metrics, best): The asset, its per-horizon metric table and the best row.
+    """
+    payloads = list(asset_payloads(df))
+    n_workers, inner_jobs = split_cpu_budget(n_workers, inner_jobs, n_tasks=len(payloads))
+
+    if n_workers == 1:
+        for asset, X, close in payloads:
+            try:
+                _, metrics = evaluate_asset(asset, X, close, timeframes, inner_jobs, model_factory)
+                best = best_timeframe(metrics)
+            except ValueError as error:
+                print(f"⚠️ Skipping {asset}: {error}")
+                continue
+            yield asset, metrics, best
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = {
+            pool.submit(evaluate_asset, asset, X, close, timeframes, inner_jobs, model_factory): asset
+            for asset, X, close in payloads
+        }
+        for future in as_completed(futures):
+            try:
+                asset, metrics = future.result()
+                best = best_timeframe(metrics)
+            except ValueError as error:
+                print(f"⚠️ Skipping {futures[future]}: {error}")
+                continue
+            yield asset, metrics, best
+
+
+def optimal_timeframes_table(df, timeframes=TIMEFRAMES, n_workers=None, inner_jobs=None, model_factory=make_default_model):
+    """Collects `iter_optimal_timeframes` into one best-timeframe row per asset, sorted by asset."""
+    rows = [
+        {**best, "asset": asset}
+        for asset, _, best in iter_optimal_timeframes(df, timeframes, n_workers, inner_jobs, model_factory)
+    ]
+    if not rows:
+        raise ValueError("🚨 None of the assets has enough rows to evaluate any timeframe.")
+    return pd.DataFrame(rows).sort_values("asset").reset_index(drop=True)
@@ -0,0 +1,275 @@
+"""
+🧮 Declarative indicator registry.
+
+Every indicator, and every intermediate it is built from, is a node in one graph. A node has
+a kind, its inputs, a window and a formula. Intermediates are named after what they compute
+(`rolling_mean(close,20)`, `shift(close,1)`), so two indicators that ask for the same window
+of the same series share a single node instead of each re-scanning it.
+
+`plan(columns)` walks the graph behind the requested columns. `compute(df, columns)` then
+evaluates every node on that plan exactly once per run. All EMAs of the same series are
+swept together in one `ewm_panel` call, and intermediates are freed as soon as their last
+consumer has run.
+
+Adding an indicator is a declaration, not an edit to the engine:
+
+    register("sma_200", rolling_mean("close", 200))
+    register("bollinger_width", "bollinger_upper", "bollinger_lower", formula=lambda up, low: up - low)
+"""
+import numpy as np
+from scripts.indicators.panel import (
+    INDICATOR_COLUMNS,
+    ewm_panel,
+    rolling_mean as _rolling_mean,
+    rolling_std as _rolling_std,
+    rolling_sum as _rolling_sum,
+    segment_offsets,
+    shift_within,
+)
+
+# 🔹 Raw price series (node name -> frame column)
+PRICE_SOURCES = {
+    "open": "open_price",
+    "high": "high_price",
+    "low": "low_price",
+    "close": "close_price",
+    "volume": "volume",
+}
+
+NODE_KINDS = ["column", "shift", "ema", "rolling_mean", "rolling_sum", "rolling_std", "formula"]
+
+NODES = {}   # node name -> Node, in registration order
+
+
+class Node:
+    """
+    One vertex of the indicator graph.
+
+    Args:
+        name (str): Unique node name (the output column name for indicators).
+        kind (str): One of `NODE_KINDS`.
+        inputs (tuple): Names of the nodes this one is computed from.
+        window (int): Shift periods, EMA span or rolling window, depending on `kind`.
+        min_periods (int): Rolling `min_periods` (default: the full window).
+        formula (callable): For `formula` nodes: called with the input arrays, in order.
+        column (str): For `column` nodes: the frame column to read.
+    """
+
+    def __init__(self, name, kind, inputs=(), window=None, min_periods=None, formula=None, column=None):
+        if kind not in NODE_KINDS:
+            raise ValueError(f"🤨 Unknown node kind '{kind}'. Supported kinds: {NODE_KINDS}")
+        self.name = name
+        self.kind = kind
+        self.inputs = tuple(inputs)
+        self.window = window
+        self.min_periods = min_periods
+        self.formula = formula
+        self.column = column
+
+    def evaluate(self, frame, values, row_start):
+        """Computes this node from its already-computed inputs (`values`: node name -> array)."""
+        args = [values[name] for name in self.inputs]
+        if self.kind == "column":
+            return frame[self.column].to_numpy(dtype=np.float64)
+        if self.kind == "shift":
+            return shift_within(args[0], row_start, self.window)
+        if self.kind == "rolling_mean":
+            return _rolling_mean(args[0], row_start, self.window, self.min_periods)
+        if self.kind == "rolling_sum":
+            return _rolling_sum(args[0], row_start, self.window, self.min_periods)
+        if self.kind == "rolling_std":
+            return _rolling_std(args[0], row_start, self.window, args[1])
+        if self.formula is None:
+            return args[0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.formula(*args)
+
+    def __repr__(self):
+        return f"Node({self.name!r}, {self.kind}, inputs={list(self.inputs)})"
+
+
+def _add(node):
+    existing = NODES.get(node.name)
+    if existing is not None and existing.kind != node.kind:
+        raise ValueError(f"🚨 Node '{node.name}' is already registered as a {existing.kind} node")
+    return NODES.setdefault(node.name, node).name
+
+
+def _window_node(kind, source, window, min_periods=None, inputs=None):
+    name = f"{kind}({source},{window})" if min_periods is None else f"{kind}({source},{window},{min_periods})"
+    return _add(Node(name, kind, inputs or (source,), window, min_periods))
+
+
+# 🧱 Intermediates: each returns the node name, registering the node the first time it is asked for
+def shift(source, periods=1):
+    """`source` shifted forward by `periods` bars within each asset."""
+    return _window_node("shift", source, periods)
+
+
+def ema(source, span):
+    """`ewm(span=span, adjust=False).mean()` of `source`."""
+    return _window_node("ema", source, span)
+
+
+def rolling_mean(source, window, min_periods=None):
+    return _window_node("rolling_mean", source, window, min_periods)
+
+
+def rolling_sum(source, window, min_periods=None):
+    return _window_node("rolling_sum", source, window, min_periods)
+
+
+def rolling_std(source, window):
+    """Rolling sample std; shares its mean pass with `rolling_mean(source, window)`."""
+    return _window_node("rolling_std", source, window, inputs=(source, rolling_mean(source, window)))
+
+
+def register(name, *inputs, formula=None):
+    """
+    Declares a named series: an alias of a single input (`formula=None`) or `formula(*inputs)`.
+    Formulas get float64 arrays and run with NumPy's divide/invalid warnings silenced.
+
+    Returns:
+        str: `name`, so declarations can feed each other.
+    """
+    if name in NODES:
+        raise ValueError(f"🚨 '{name}' is already registered")
+    if formula is None and len(inputs) != 1:
+        raise ValueError(f"🚨 '{name}' needs a formula to combine {len(inputs)} inputs")
+    return _add(Node(name, "formula", inputs, formula=formula))
+
+
+def plan(columns):
+    """
+    Every node needed for `columns`, dependencies first.
+
+    Returns:
+        list: Node names in evaluation order.
+    """
+    order, done = [], set()
+
+    def visit(name, path):
+        if name in done:
+            return
+        if name not in NODES:
+            raise ValueError(f"🤨 Unknown indicator '{name}'. Registered: {indicators()}")
+        if name in path:
+            raise ValueError(f"🚨 Dependency cycle through '{name}'")
+        for dep in NODES[name].inputs:
+            visit(dep, path | {name})
+        done.add(name)
+        order.append(name)
+
+    for column in columns:
+        visit(column, frozenset())
+    return order
+
+
+def evaluate(frame, columns, row_start=None):
+    """
+    Evaluates `columns` (and whatever they depend on) on a frame sorted by (asset, timestamp).
+
+    Returns:
+        dict: Column name -> float64 NumPy array aligned with `frame`.
+    """
+    if row_start is None:
+        _, _, row_start = segment_offsets(frame["asset"].to_numpy())
+    order = plan(columns)
+    keep = set(columns)
+    last_use = {dep: i for i, name in enumerate(order) for dep in NODES[name].inputs}
+    starts = lengths = None
+    values = {}
+
+    for i, name in enumerate(order):
+        node = NODES[name]
+        if name in values:
+            pass   # Already filled in by an earlier EMA sweep
+        elif node.kind == "ema":
+            # 🔹 One recursive sweep for every span of this series on the plan
+            if starts is None:
+                starts = np.flatnonzero(np.r_[True, row_start[1:] != row_start[:-1]]) if len(row_start) else row_start
+                lengths = np.diff(np.append(starts, len(row_start)))
+            batch = [n for n in order[i:] if NODES[n].kind == "ema" and NODES[n].inputs == node.inputs]
+            swept = ewm_panel(values[node.inputs[0]], starts, lengths, [NODES[n].window for n in batch])
+            for j, n in enumerate(batch):
+                values[n] = swept[:, j]
+        else:
+            values[name] = node.evaluate(frame, values, row_start)
+
+        for dep in node.inputs:
+            if last_use[dep] == i and dep not in keep:
+                values.pop(dep, None)
+    return {column: values[column] for column in columns}
+
+
+def compute(df, columns=None):
+    """
+    Computes the requested indicators for all assets in one vectorized pass.
+
+    Args:
+        df (pd.DataFrame): Hourly bars with `asset`, `timestamp` and the OHLCV columns.
+        columns (list): Registered names to compute (default: `INDICATOR_COLUMNS`).
+
+    Returns:
+        pd.DataFrame: The input sorted by (asset, timestamp) plus the requested columns, with a
+        fresh RangeIndex.
+    """
+    columns = list(INDICATOR_COLUMNS if columns is None else columns)
+    out = df.sort_values(["asset", "timestamp"], kind="stable").reset_index(drop=True)
+    for column, values in evaluate(out, columns).items():
+        out[column] = values
+    return out
+
+
+def indicators():
+    """Names of every registered indicator and named series (the auto-named intermediates left out)."""
+    return [name for name, node in NODES.items() if node.kind == "formula"]
+
+
+# 📥 Raw prices
+for _name, _column in PRICE_SOURCES.items():
+    _add(Node(_name, "column", column=_column))
+
+# 🧱 Per-bar series (also the inputs of the streaming engine's windows)
+register("prev_close", shift("close"))
+register("delta", "close", "prev_close", formula=lambda close, prev: close - prev)
+register("gain", "delta", formula=lambda delta: np.where(delta > 0, delta, 0.0))
+register("loss", "delta", formula=lambda delta: np.where(delta < 0, -delta, 0.0))
+register("typical_price", "high", "low", "close", formula=lambda high, low, close: (high + low + close) / 3)
+register("money_flow", "typical_price", "volume", formula=lambda tp, volume: tp * volume)
+register("prev_typical_price", shift("typical_price"))
+register("pos_flow", "typical_price", "prev_typical_price", "money_flow",
+         formula=lambda tp, prev, flow: np.where(tp > prev, flow, 0.0))
+register("neg_flow", "typical_price", "prev_typical_price", "money_flow",
+         formula=lambda tp, prev, flow: np.where(tp < prev, flow, 0.0))
+register("true_range", "high", "low", "prev_close",
+         formula=lambda high, low, prev: np.fmax(high - low, np.fmax(np.abs(high - prev), np.abs(low - prev))))
+
+BAR_INPUTS = ["close", "prev_close", "gain", "loss", "typical_price", "pos_flow", "neg_flow", "true_range"]
+
+# 🔹 Moving Averages + MACD
+register("ema_20", ema("close", 20))
+register("ema_50", ema("close", 50))
+register("macd", ema("close", 12), ema("close", 26), formula=lambda fast, slow: fast - slow)
+register("macd_signal", ema("macd", 9))
+
+# 🔹 Relative Strength Index (RSI)
+register("rsi_14", rolling_mean("gain", 14, min_periods=1), rolling_mean("loss", 14, min_periods=1),
+         formula=lambda avg_gain, avg_loss: 100 - (100 / (1 + avg_gain / avg_loss)))
+
+# 🔹 Bollinger Bands
+register("bollinger_mid", rolling_mean("close", 20))
+register("bollinger_std", rolling_std("close", 20))
+register("bollinger_upper", "bollinger_mid", "bollinger_std", formula=lambda mid, std: mid + (std * 2))
+register("bollinger_lower", "bollinger_mid", "bollinger_std", formula=lambda mid, std: mid - (std * 2))
+
+# 🔹 Money Flow Index (MFI)
+register("mfi_14", rolling_sum("pos_flow", 14), rolling_sum("neg_flow", 14),
+         formula=lambda pos, neg: 100 - (100 / (1 + pos / neg)))
+
+# 🔹 Z-Score (Mean Reversion): the Bollinger window's mean and std, not a second pass
+register("z_score", "close", rolling_mean("close", 20), rolling_std("close", 20),
+         formula=lambda close, mid, std: (close - mid) / std)
+
+# 🔹 Average True Range (ATR)
+register("atr_14", rolling_mean("true_range", 14))
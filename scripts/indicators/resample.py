@@ -0,0 +1,199 @@
+"""
+🪜 Multi-timeframe OHLCV pyramid.
+
+Builds 2h/4h/6h/12h/24h bars for every asset in one vectorized pass per level (first open, max
+high, min low, last close, summed volume). Buckets are aligned to the Unix epoch, so every
+level nests inside the coarser ones and each level is aggregated from the largest finer level
+that divides it (2h from 1h, 4h and 6h from 2h, 12h from 6h, 24h from 12h).
+
+Gap-aware: a bucket only exists if at least one hourly bar fell into it (nothing is forward
+filled), and `bar_count` records how many hourly bars it holds. `bar_count < hours` means
+missing hours, or a bucket that is still filling up at the live edge.
+
+`ResamplePyramid` keeps one `FeatureStore` per level. `sync()` rebuilds only the buckets from
+each asset's last common bucket (the LCM of all levels) onwards, using the local hourly price
+cache.
+
+CLI: `python -m scripts.indicators.resample [--levels 2,4,6,12,24]`
+"""
+import os
+import math
+import argparse
+import numpy as np
+import pandas as pd
+from scripts.indicators.feature_store import FeatureStore
+from scripts.indicators.registry import compute
+from scripts.indicators.schema import PRICE_SCHEMA, apply_schema
+
+# 📂 Local File Storage: one feature store per level, e.g. feature_store/resampled_prices/4h
+PYRAMID_ROOT = os.path.join("feature_store", "resampled_prices")
+
+# ⏱️ Levels in hours (each must be a whole number of hours; any order)
+LEVELS = [2, 4, 6, 12, 24]
+
+HOUR_NS = 3600 * 10 ** 9
+RESAMPLED_SCHEMA = {**PRICE_SCHEMA, "bar_count": "int32"}
+
+
+def bucket_starts(timestamps, hours):
+    """Epoch-aligned start of the `hours`-wide bucket each timestamp falls into (UTC)."""
+    width = hours * HOUR_NS
+    ns = pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True)).as_unit("ns").asi8
+    return pd.to_datetime(ns - ns % width, utc=True)
+
+
+def resample_ohlcv(bars, hours):
+    """
+    Aggregates bars into `hours`-wide buckets for all assets at once.
+
+    Args:
+        bars (pd.DataFrame): Hourly bars, or bars of a finer level whose width divides `hours`
+            (their `bar_count` is summed; bars without one count as one hour each).
+        hours (int): Bucket width.
+
+    Returns:
+        pd.DataFrame: One row per (asset, bucket) that holds any bars, stamped with the bucket
+        start, sorted by (asset, timestamp), in `RESAMPLED_SCHEMA`.
+    """
+    df = bars.sort_values(["asset", "timestamp"], kind="stable")
+    n = len(df)
+    if n == 0:
+        return apply_schema(pd.DataFrame(columns=list(RESAMPLED_SCHEMA)), RESAMPLED_SCHEMA)
+
+    assets = df["asset"].to_numpy()
+    buckets = bucket_starts(df["timestamp"], hours)
+    keys = buckets.asi8
+    boundary = np.ones(n, dtype=bool)
+    boundary[1:] = (assets[1:] != assets[:-1]) | (keys[1:] != keys[:-1])
+    starts = np.flatnonzero(boundary)
+    ends = np.append(starts[1:], n) - 1
+
+    def column(name):
+        return df[name].to_numpy(dtype=np.float64)
+
+    counts = df["bar_count"].to_numpy(dtype=np.int64) if "bar_count" in df.columns else np.ones(n, dtype=np.int64)
+    out = pd.DataFrame({
+        "asset": assets[starts],
+        "timestamp": buckets[starts],
+        "open_price": column("open_price")[starts],
+        "high_price": np.fmax.reduceat(column("high_price"), starts),
+        "low_price": np.fmin.reduceat(column("low_price"), starts),
+        "close_price": column("close_price")[ends],
+        "volume": np.add.reduceat(np.nan_to_num(column("volume")), starts),
+        "bar_count": np.add.reduceat(counts, starts),
+    })
+    return apply_schema(out, RESAMPLED_SCHEMA)
+
+
+def _source_level(hours, built):
+    """The coarsest already-built level (1h at least) whose bars tile `hours` exactly."""
+    return max((h for h in built if hours % h == 0), default=1)
+
+
+def build_pyramid(prices, levels=LEVELS):
+    """
+    Resamples hourly `prices` into every level, each from the largest finer level it can use.
+
+    Returns:
+        dict: Hours -> resampled frame (see `resample_ohlcv`).
+    """
+    pyramid = {1: prices}
+    for hours in sorted(set(levels)):
+        pyramid[hours] = resample_ohlcv(pyramid[_source_level(hours, [h for h in pyramid if h < hours])], hours)
+    del pyramid[1]
+    return {hours: pyramid[hours] for hours in levels}
+
+
+class ResamplePyramid:
+    """
+    🪜 **Cached resampling pyramid**
+
+    Layout: `<root>/<hours>h/` holds one asset/month partitioned `FeatureStore` per level.
+    """
+
+    def __init__(self, root=PYRAMID_ROOT, levels=LEVELS):
+        self.root = root
+        self.levels = sorted(set(levels))
+        self.span = math.lcm(*self.levels)   # Every level's buckets nest inside these
+        self.stores = {hours: FeatureStore(os.path.join(root, f"{hours}h")) for hours in self.levels}
+
+    def _resume_points(self, assets):
+        """Per asset: start of the `span`-wide bucket holding its last coarsest bar (None = never resampled)."""
+        marks = self.stores[self.levels[-1]].watermarks()
+        return {asset: None if marks.get(str(asset)) is None else bucket_starts([marks[str(asset)]], self.span)[0]
+                for asset in assets}
+
+    def sync(self, price_store=None, now=None):
+        """
+        Brings every level up to date with the hourly price cache.
+
+        Each asset is rebuilt from the start of the LCM-of-all-levels bucket holding its last
+        coarsest bar, which may still have been filling up. Every level's buckets nest inside
+        it (even for sets like 4h + 6h, where 4h buckets straddle 6h ones), so one hourly read
+        covers every level without truncating a bucket. Buckets older than the oldest cached hourly bar are evicted.
+
+        Returns:
+            dict: Hours -> number of buckets (re)written.
+        """
+        if price_store is None:
+            from scripts.data_processing.fetch_prices import PRICE_STORE_ROOT
+            from scripts.data_processing.storage import cache_root
+            price_store = FeatureStore(cache_root(PRICE_STORE_ROOT))
+
+        by_start = {}
+        for asset, start in self._resume_points(price_store.assets()).items():
+            by_start.setdefault(start, []).append(asset)
+
+        written = {hours: 0 for hours in self.levels}
+        for start, assets in by_start.items():
+            hourly = apply_schema(price_store.read(columns=list(PRICE_SCHEMA), assets=assets, start=start),
+                                  PRICE_SCHEMA)
+            for hours, level in build_pyramid(hourly, self.levels).items():
+                self.stores[hours].write(level, now=now, merge=True)
+                written[hours] += len(level)
+
+        partitions = price_store.manifest["partitions"].values()
+        if partitions:
+            oldest = min(pd.Timestamp(p["min_timestamp"]) for p in partitions)
+            for hours, store in self.stores.items():
+                store.evict(bucket_starts([oldest], hours)[0])
+        return written
+
+    def read(self, hours, assets=None, start=None, end=None, complete_only=False):
+        """
+        Bars of one level, ordered by (asset, timestamp).
+
+        Args:
+            complete_only (bool): Drop buckets that are missing hourly bars.
+        """
+        if hours not in self.stores:
+            raise ValueError(f"🤨 Unknown level {hours}h. Levels: {self.levels}")
+        df = apply_schema(self.stores[hours].read(assets=assets, start=start, end=end), RESAMPLED_SCHEMA)
+        if complete_only:
+            df = df[df["bar_count"] == hours].reset_index(drop=True)
+        return df
+
+    def indicators(self, hours, columns=None, **read_kwargs):
+        """
+        Runs the indicator engine on one level. Windows count bars of that level, so `rsi_14`
+        on the 4h level is a 14 x 4h RSI.
+        """
+        return compute(self.read(hours, **read_kwargs), columns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sync the multi-timeframe OHLCV pyramid.")
+    parser.add_argument("--levels", default=",".join(map(str, LEVELS)), help="Comma-separated bucket widths in hours")
+    args = parser.parse_args(argv)
+
+    from scripts.data_processing.fetch_prices import sync_prices
+    from scripts.data_processing.storage import cache_root
+    sync_prices()   # Pull new hourly bars into the local cache first
+    pyramid = ResamplePyramid(cache_root(PYRAMID_ROOT), levels=[int(h) for h in args.levels.split(",")])
+    written = pyramid.sync()
+    print(f"✅ Pyramid synced: {', '.join(f'{h}h: {n} bars' for h, n in written.items())}")
+    return written
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+from scripts.indicators.panel import INDICATOR_COLUMNS, PRICE_COLUMNS
+
+# 📐 Declared in-memory dtypes
+#  - asset: categorical (one small integer code per row instead of a Python string object)
+#  - timestamp: datetime64[ns, UTC], i.e. int64 epoch nanoseconds (`.asi8` is a zero-copy int64 view)
+#  - raw OHLCV: float64 (inputs to every indicator and to the horizon targets)
+#  - indicators: float32 (derived values; float32 keeps ~7 significant digits)
+PRICE_SCHEMA = {
+    "asset": "category",
+    "timestamp": "datetime64[ns, UTC]",
+    **{col: "float64" for col in PRICE_COLUMNS},
+}
+INDICATOR_SCHEMA = {
+    **PRICE_SCHEMA,
+    **{col: "float32" for col in INDICATOR_COLUMNS},
+}
+
+# ➗ Columns that are exact functions of other stored columns; `drop_derived=True` leaves them
+# out and `add_derived_columns` rebuilds them
+DERIVED_COLUMNS = {
+    "bollinger_upper": lambda df: df["bollinger_mid"] + (df["bollinger_std"] * 2),
+    "bollinger_lower": lambda df: df["bollinger_mid"] - (df["bollinger_std"] * 2),
+}
+
+# Bump whenever the dtypes above change (invalidates caches written with the old ones)
+SCHEMA_VERSION = 1
+
+# Max relative error allowed between a float32 column and its float64 original
+FLOAT32_RTOL = 1e-6
+
+
+def apply_schema(df, schema=INDICATOR_SCHEMA, drop_derived=False):
+    """
+    Casts `df` to the declared dtypes (columns not in the schema are left alone).
+
+    Columns that already have the right dtype are not copied, so frames served from the
+    memory-mapped Arrow cache stay zero-copy.
+
+    Returns:
+        pd.DataFrame: A new frame; `df` itself is not modified.
+    """
+    out = df.copy(deep=False)
+    if drop_derived:
+        out = out.drop(columns=[col for col in DERIVED_COLUMNS if col in out.columns])
+
+    for col, dtype in schema.items():
+        if col not in out.columns:
+            continue
+        if dtype == "category":
+            if not isinstance(out[col].dtype, pd.CategoricalDtype):
+                out[col] = out[col].astype(str).astype("category")
+        elif dtype.startswith("datetime64"):
+            if str(out[col].dtype) != dtype:
+                out[col] = pd.to_datetime(out[col], utc=True).astype(dtype)
+        elif out[col].dtype != dtype:
+            out[col] = out[col].astype(dtype)
+    return out
+
+
+def add_derived_columns(df):
+    """Rebuilds any `DERIVED_COLUMNS` missing from `df` (in the dtype of their inputs)."""
+    out = df.copy(deep=False)
+    for col, derive in DERIVED_COLUMNS.items():
+        if col not in out.columns:
+            out[col] = derive(out)
+    return out
+
+
+def compare_to_float64(reference, compact, rtol=FLOAT32_RTOL):
+    """
+    Tolerance check of a compact frame against its float64 original (same rows, same order).
+
+    Returns:
+        pd.DataFrame: One row per float32 column with its max absolute and relative error and
+        whether it is within `rtol`. NaNs must line up exactly.
+    """
+    rows = []
+    for col in compact.columns:
+        if compact[col].dtype != np.float32:
+            continue
+        ref = reference[col].to_numpy(dtype=np.float64)
+        got = compact[col].to_numpy(dtype=np.float64)
+        nan_match = bool(np.array_equal(np.isnan(ref), np.isnan(got)))
+        both = ~np.isnan(ref) & ~np.isnan(got)
+        abs_err = np.abs(got[both] - ref[both])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rel_err = np.where(ref[both] != 0, abs_err / np.abs(ref[both]), abs_err)
+        max_rel = float(rel_err.max()) if len(rel_err) else 0.0
+        rows.append({
+            "column": col,
+            "max_abs_error": float(abs_err.max()) if len(abs_err) else 0.0,
+            "max_rel_error": max_rel,
+            "ok": nan_match and max_rel <= rtol,
+        })
+    return pd.DataFrame(rows, columns=["column", "max_abs_error", "max_rel_error", "ok"])
@@ -1,6 +1,12 @@
 import os
+from functools import partial
 import pandas as pd
-from google.cloud import bigquery
+from scripts.data_processing.arrow_reader import read_frame
+from scripts.data_processing.fetch_prices import RETENTION
+from scripts.data_processing.storage import cache_root, get_backend
+from scripts.indicators.feature_store import DEFAULT_MAX_AGE, STORE_ROOT, FeatureStore
+from scripts.indicators.arrow_cache import load_cached_assets
+from scripts.indicators.schema import INDICATOR_SCHEMA, SCHEMA_VERSION, apply_schema
 
 # 🌐 BigQuery Configuration
 PROJECT_ID = "cloud4marketing-281206"  # Your Google Cloud project ID
@@ -8,41 +14,86 @@ DATASET_ID = "crypto_price"  # Dataset where the technical indicators are stored
 TECHNICALS_TABLE = f"{PROJECT_ID}.{DATASET_ID}.technical_indicators"  # Full path to the BigQuery table
 
 # 📂 Local File Storage
-LOCAL_FILE = "technical_indicators.parquet"  # Cached file to avoid repeated BigQuery queries
+LOCAL_FILE = "technical_indicators.parquet"  # Legacy single-file cache, imported into the feature store once
 
-def load_indicators():
+
+def fetch_indicators(assets=None, since=None, backend=None, exclude=None):
     """
-    Loads technical indicators data either from:
-    1️⃣ A **local Parquet file** (for faster loading if available)
-    2️⃣ **BigQuery** (if the local file doesn't exist or needs refreshing)
+    Streams technical indicators from the storage backend (last 6 months by default) as Arrow
+    batches: only the `INDICATOR_SCHEMA` columns of matching rows are read, and each batch is
+    cast to the compact dtypes as it arrives.
 
-    Returns:
-        pd.DataFrame: A DataFrame containing technical indicators for various assets.
+    :param assets: Only fetch these assets (default: all)
+    :param since: Only fetch rows with `timestamp >= since`
+    :param backend: Storage backend to read from (default: `get_backend()`)
+    :param exclude: Skip these assets (e.g. the ones already stored locally)
     """
-    
-    # ✅ Check if the local Parquet file exists (faster load)
-    if os.path.exists(LOCAL_FILE):
-        print("✅ Loaded indicators from local storage!")
-        return pd.read_parquet(LOCAL_FILE)
-    
-    # ⚠️ If local file is missing, fetch data from BigQuery
-    print("⚠️ Local file not found, querying BigQuery instead.")
-
-    # 🔐 Initialize BigQuery Client
-    client = bigquery.Client()
-
-    # 🏦 Fetch Data from BigQuery (Last 6 Months Only)
-    query = f"""
-        SELECT * FROM `{TECHNICALS_TABLE}`
-        WHERE DATETIME(timestamp) >= DATETIME_SUB(CURRENT_DATETIME(), INTERVAL 6 MONTH)
+    # Bare `timestamp` filters are pushed to the server (partition pruning still works)
+    filters = [("timestamp", ">=", pd.Timestamp.now(tz="UTC") - RETENTION)]
+    if since is not None:
+        filters.append(("timestamp", ">=", pd.Timestamp(since)))
+    if assets:
+        filters.append(("asset", "in", [str(a) for a in assets]))
+    if exclude:
+        filters.append(("asset", "not in", [str(a) for a in exclude]))
+
+    df = read_frame(TECHNICALS_TABLE, columns=list(INDICATOR_SCHEMA), filters=filters, schema=INDICATOR_SCHEMA,
+                    backend=backend)
+    return df.sort_values(["asset", "timestamp"], kind="stable").reset_index(drop=True)
+
+
+def load_indicators(columns=None, assets=None, start=None, end=None, max_age=DEFAULT_MAX_AGE, use_arrow_cache=True,
+                    backend=None):
+    """
+    Loads technical indicators from the local feature store (partitioned by asset and month):
+    1️⃣ **Local partitions** are read with column projection and asset/time pruning
+    2️⃣ **Stale partitions** (the current month, older than `max_age`) are refreshed from BigQuery,
+       along with any assets BigQuery has that the store doesn't yet
+    3️⃣ **BigQuery** fills the store on first use (or the legacy Parquet file is imported)
+
+    Args:
+        columns (list): Columns to load (asset and timestamp are always included).
+        assets (str | list): Asset(s) to load (default: all).
+        start / end: Optional [start, end) timestamp bounds.
+        max_age (pd.Timedelta): How old an open partition may get before it's refreshed.
+        use_arrow_cache (bool): Serve reads from the memory-mapped Arrow cache of the store, so
+            several processes share one page-cached copy and numeric columns aren't copied.
+            Only requested assets whose partitions changed are re-read into it.
+        backend: Storage backend the store mirrors (default: `get_backend()`). Each backend has
+            its own store (`cache_root`), so local-warehouse rows are never served as BigQuery's.
+
+    Returns:
+        pd.DataFrame: A DataFrame containing technical indicators for the requested assets, in the
+        compact `INDICATOR_SCHEMA` dtypes (float32 indicators, categorical asset).
     """
-    df = client.query(query).to_dataframe()
+    backend = backend or get_backend()
+    store = FeatureStore(cache_root(STORE_ROOT, backend))
+    fetch = partial(fetch_indicators, backend=backend)
 
-    # 💾 Save the results locally to reduce future queries
-    df.to_parquet(LOCAL_FILE)
-    print("✅ Technical indicators saved locally!")
+    if store.is_empty():
+        if os.path.exists(LOCAL_FILE):
+            # 📦 One-time migration from the old single-file cache
+            print("📦 Importing the legacy Parquet cache into the feature store...")
+            store.write(apply_schema(pd.read_parquet(LOCAL_FILE)))
+        else:
+            # ⚠️ If the store is empty, fetch data from BigQuery
+            print("⚠️ Feature store is empty, querying BigQuery instead.")
+            store.write(fetch())
+            print("✅ Technical indicators saved locally!")
+    else:
+        # 🔄 Rewrite only what has gone stale
+        refreshed = store.refresh(fetch, max_age=max_age, fetch_new=lambda known: fetch(exclude=known))
+        if refreshed:
+            print(f"🔄 Refreshed {len(refreshed)} stale partition(s) from BigQuery.")
 
-    return df
+    print("✅ Loaded indicators from local storage!")
+    if use_arrow_cache:
+        # The schema version is part of the fingerprint, so a cache written with other dtypes is rebuilt
+        df = load_cached_assets(lambda names: apply_schema(store.read(assets=names)), store.asset_fingerprints(),
+                                f"{backend.cache_key}-{SCHEMA_VERSION}", columns=columns, assets=assets,
+                                start=start, end=end)
+        return apply_schema(df)
+    return apply_schema(store.read(columns=columns, assets=assets, start=start, end=end))
 
 if __name__ == "__main__":
     # 🏃 Run as a script: Load the indicators and preview data
@@ -0,0 +1,315 @@
+import os
+import json
+from collections import deque
+import numpy as np
+import pandas as pd
+from scripts.indicators.panel import (
+    CLOSE_EMA_SPANS,
+    MACD_SIGNAL_SPAN,
+    INDICATOR_COLUMNS,
+    bar_inputs,
+    ewm_panel,
+    same_value_run,
+    segment_offsets,
+)
+
+# 📂 Local File Storage
+STATE_FILE = "indicator_state.json"  # Per-asset streaming state between hourly refreshes
+STATE_VERSION = 1
+
+# 🔹 Recursive state (name -> span) and windowed state (name -> bars kept)
+EWM_SPANS = {"ema_20": 20, "ema_50": 50, "ema_12": 12, "ema_26": 26, "macd_signal": MACD_SIGNAL_SPAN}
+WINDOW_SIZES = {"close": 20, "gain": 14, "loss": 14, "pos_flow": 14, "neg_flow": 14, "true_range": 14}
+
+
+class EwmState:
+    """One `ewm(span, adjust=False).mean()` accumulator, following the same NaN rules as the panel engine."""
+
+    def __init__(self, span, weighted=np.nan, old_wt=1.0):
+        self.alpha = 2.0 / (float(span) + 1.0)
+        self.weighted = weighted
+        self.old_wt = old_wt
+
+    def push(self, x):
+        if self.weighted == self.weighted:
+            self.old_wt = self.old_wt * (1.0 - self.alpha)
+            if x == x:
+                if self.weighted != x:
+                    self.weighted = (self.old_wt * self.weighted + self.alpha * x) / (self.old_wt + self.alpha)
+                self.old_wt = 1.0
+        elif x == x:
+            self.weighted = x
+        return self.weighted
+
+
+class RollingWindow:
+    """Fixed-size ring buffer whose sum/mean/std reproduce the panel engine's rolling rules."""
+
+    def __init__(self, size, values=(), run=0):
+        self.size = size
+        self.values = deque((float(v) for v in values), maxlen=size)
+        self.run = run
+
+    def push(self, x):
+        last = self.values[-1] if self.values else np.nan
+        self.run = self.run + 1 if x == last else 1
+        self.values.append(x)
+
+    def _total(self):
+        # Newest-first, like the lag loop in panel._window_sum
+        total, count = 0.0, 0
+        for v in reversed(self.values):
+            if v == v:
+                total += v
+                count += 1
+        return total, count
+
+    def sum(self, min_periods=None):
+        total, count = self._total()
+        if count < max(self.size if min_periods is None else min_periods, 1):
+            return np.nan
+        return self.values[-1] * count if self.run >= count else total
+
+    def mean(self, min_periods=None):
+        total, count = self._total()
+        if count < max(self.size if min_periods is None else min_periods, 1):
+            return np.nan
+        return self.values[-1] if self.run >= count else total / count
+
+    def mean_std(self):
+        mean = self.mean()
+        _, count = self._total()
+        if count < self.size or count <= 1:
+            return mean, np.nan
+
+        squares = 0.0
+        for v in reversed(self.values):
+            dev = v - mean
+            if dev == dev:
+                squares += dev * dev
+        var = 0.0 if self.run >= count else max(squares / (count - 1), 0.0)
+        return mean, np.sqrt(var)
+
+
+class AssetIndicatorState:
+    """
+    Everything needed to extend one asset's indicators by a single bar in O(1):
+    the EMA/MACD accumulators, the 14/20-bar windows and the last close / typical price.
+    """
+
+    def __init__(self, asset):
+        self.asset = asset
+        self.last_timestamp = None
+        self.last_close = np.nan
+        self.last_typical_price = np.nan
+        self.ewm = {name: EwmState(span) for name, span in EWM_SPANS.items()}
+        self.windows = {name: RollingWindow(size) for name, size in WINDOW_SIZES.items()}
+
+    def update(self, timestamp, high, low, close, volume):
+        """Feeds one new bar and returns its indicator values as a dict."""
+        high, low, close, volume = (np.float64(np.nan if v is None else v) for v in (high, low, close, volume))
+        prev_close = self.last_close
+        prev_typical = self.last_typical_price
+        w = self.windows
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            delta = close - prev_close
+            typical_price = (high + low + close) / 3
+            money_flow = typical_price * volume
+
+            w["close"].push(close)
+            w["gain"].push(delta if delta > 0 else 0.0)
+            w["loss"].push(-delta if delta < 0 else 0.0)
+            w["pos_flow"].push(money_flow if typical_price > prev_typical else 0.0)
+            w["neg_flow"].push(money_flow if typical_price < prev_typical else 0.0)
+            w["true_range"].push(np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close))))
+
+            ema = {name: self.ewm[name].push(close) for name in ("ema_20", "ema_50", "ema_12", "ema_26")}
+            macd = np.float64(ema["ema_12"]) - ema["ema_26"]
+            macd_signal = self.ewm["macd_signal"].push(macd)
+
+            rs = np.float64(w["gain"].mean(min_periods=1)) / w["loss"].mean(min_periods=1)
+            mid, std = w["close"].mean_std()
+            money_ratio = np.float64(w["pos_flow"].sum()) / w["neg_flow"].sum()
+
+            row = {
+                "ema_20": ema["ema_20"],
+                "ema_50": ema["ema_50"],
+                "rsi_14": 100 - (100 / (1 + rs)),
+                "bollinger_mid": mid,
+                "bollinger_std": std,
+                "bollinger_upper": mid + (std * 2),
+                "bollinger_lower": mid - (std * 2),
+                "macd": macd,
+                "macd_signal": macd_signal,
+                "mfi_14": 100 - (100 / (1 + money_ratio)),
+                "z_score": (close - np.float64(mid)) / std,
+                "atr_14": w["true_range"].mean(),
+            }
+
+        self.last_timestamp = pd.Timestamp(timestamp)
+        self.last_close = close
+        self.last_typical_price = typical_price
+        return {name: float(value) for name, value in row.items()}
+
+    def to_dict(self):
+        return {
+            "last_timestamp": None if self.last_timestamp is None else self.last_timestamp.isoformat(),
+            "last_close": float(self.last_close),
+            "last_typical_price": float(self.last_typical_price),
+            "ewm": {name: [float(s.weighted), float(s.old_wt)] for name, s in self.ewm.items()},
+            "windows": {name: {"values": list(win.values), "run": int(win.run)} for name, win in self.windows.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, asset, data):
+        state = cls(asset)
+        if data["last_timestamp"] is not None:
+            state.last_timestamp = pd.Timestamp(data["last_timestamp"])
+        state.last_close = np.float64(data["last_close"])
+        state.last_typical_price = np.float64(data["last_typical_price"])
+        for name, (weighted, old_wt) in data["ewm"].items():
+            state.ewm[name] = EwmState(EWM_SPANS[name], weighted, old_wt)
+        for name, win in data["windows"].items():
+            state.windows[name] = RollingWindow(WINDOW_SIZES[name], win["values"], win["run"])
+        return state
+
+
+def _trailing_old_wt(values, span):
+    """Rebuilds the EWM's `old_wt` after the last bar: it decays once per trailing NaN."""
+    observed = np.flatnonzero(~np.isnan(values))
+    old_wt = 1.0
+    if len(observed):
+        for _ in range(len(values) - 1 - observed[-1]):
+            old_wt = old_wt * (1.0 - 2.0 / (float(span) + 1.0))
+    return old_wt
+
+
+class StreamingIndicators:
+    """
+    🔁 **Incremental indicator engine**
+
+    Keeps an `AssetIndicatorState` per asset, persists it to disk and extends the
+    indicators one bar at a time, matching what a full `compute_panel_indicators` run
+    would have produced for the same bars.
+    """
+
+    def __init__(self, path=STATE_FILE):
+        self.path = path
+        self.assets = {}
+
+    @classmethod
+    def from_history(cls, df, path=STATE_FILE):
+        """Seeds the state from full bar history (vectorized; only each asset's tail is kept)."""
+        engine = cls(path)
+        hist = df.sort_values(["asset", "timestamp"], kind="stable").reset_index(drop=True)
+        starts, lengths, row_start = segment_offsets(hist["asset"].to_numpy())
+        bars = bar_inputs(hist, row_start)
+
+        emas = ewm_panel(bars["close"], starts, lengths, CLOSE_EMA_SPANS)
+        macd = emas[:, 2] - emas[:, 3]
+        signal = ewm_panel(macd, starts, lengths, MACD_SIGNAL_SPAN)[:, 0]
+        ewm_inputs = {
+            "ema_20": (emas[:, 0], bars["close"]),
+            "ema_50": (emas[:, 1], bars["close"]),
+            "ema_12": (emas[:, 2], bars["close"]),
+            "ema_26": (emas[:, 3], bars["close"]),
+            "macd_signal": (signal, macd),
+        }
+        runs = {name: same_value_run(bars[name], row_start) for name in WINDOW_SIZES}
+
+        assets = hist["asset"].to_numpy()
+        timestamps = hist["timestamp"]
+        for start, length in zip(starts, lengths):
+            last = start + length - 1
+            state = AssetIndicatorState(assets[start])
+            state.last_timestamp = pd.Timestamp(timestamps.iloc[last])
+            state.last_close = bars["close"][last]
+            state.last_typical_price = bars["typical_price"][last]
+            for name, (output, inputs) in ewm_inputs.items():
+                old_wt = _trailing_old_wt(inputs[start:last + 1], EWM_SPANS[name])
+                state.ewm[name] = EwmState(EWM_SPANS[name], output[last], old_wt)
+            for name, size in WINDOW_SIZES.items():
+                tail = bars[name][max(start, last + 1 - size):last + 1]
+                state.windows[name] = RollingWindow(size, tail, int(runs[name][last]))
+            engine.assets[state.asset] = state
+        return engine
+
+    @classmethod
+    def load(cls, path=STATE_FILE):
+        """Loads persisted state (an empty engine if the file doesn't exist yet)."""
+        engine = cls(path)
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("version") != STATE_VERSION:
+                raise ValueError(f"🚨 Unsupported indicator state version {data.get('version')} in {path}")
+            engine.assets = {
+                asset: AssetIndicatorState.from_dict(asset, state) for asset, state in data["assets"].items()
+            }
+        return engine
+
+    def save(self):
+        """Atomically writes the state to disk."""
+        data = {"version": STATE_VERSION, "assets": {a: s.to_dict() for a, s in self.assets.items()}}
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def watermark(self):
+        """Oldest last-seen timestamp across assets (None if there is no state yet)."""
+        seen = [s.last_timestamp for s in self.assets.values() if s.last_timestamp is not None]
+        return min(seen) if seen else None
+
+    def update(self, new_bars):
+        """
+        Extends every asset's indicators with the bars it hasn't seen yet.
+
+        Bars at or before an asset's last timestamp are skipped, so re-feeding an
+        overlapping window is harmless.
+
+        Returns:
+            pd.DataFrame: One row per new bar (input columns + indicator columns).
+        """
+        bars = new_bars.sort_values(["asset", "timestamp"], kind="stable")
+        rows = []
+        for bar in bars.to_dict("records"):
+            state = self.assets.get(bar["asset"])
+            if state is None:
+                state = self.assets[bar["asset"]] = AssetIndicatorState(bar["asset"])
+            if state.last_timestamp is not None and pd.Timestamp(bar["timestamp"]) <= state.last_timestamp:
+                continue
+            bar.update(state.update(bar["timestamp"], bar["high_price"], bar["low_price"],
+                                    bar["close_price"], bar["volume"]))
+            rows.append(bar)
+        return pd.DataFrame(rows, columns=list(new_bars.columns) + INDICATOR_COLUMNS)
+
+
+if __name__ == "__main__":
+    # 🏃 Hourly refresh: only pull, compute and append bars newer than the saved state
+    from scripts.data_processing.fetch_prices import PRICE_STORE_ROOT, sync_prices
+    from scripts.data_processing.storage import cache_root, get_backend
+    from scripts.data_processing.upload import upload_delta
+    from scripts.indicators.feature_store import FeatureStore
+    from scripts.indicators.schema import apply_schema
+
+    PROJECT_ID = "cloud4marketing-281206"
+    DATASET_ID = "crypto_price"
+    TECHNICALS_TABLE = f"{PROJECT_ID}.{DATASET_ID}.technical_indicators"
+
+    engine = StreamingIndicators.load()
+    watermark = engine.watermark()
+    if watermark is None:
+        raise SystemExit("⚠️ No indicator state found. Run compute_indicators.py once to seed it.")
+
+    # Sync the raw-price cache (watermark pull), then feed every bar the state hasn't seen
+    backend = get_backend()
+    prices = FeatureStore(cache_root(PRICE_STORE_ROOT, backend))
+    sync_prices(backend=backend, store=prices)
+    new_rows = engine.update(prices.read(start=watermark + pd.Timedelta(microseconds=1)))
+    new_rows = apply_schema(new_rows.dropna().reset_index(drop=True))   # Same dtypes as a full compute
+
+    uploaded = upload_delta(new_rows, TECHNICALS_TABLE, backend.sink())
+    engine.save()
+    print(f"✅ Merged {uploaded} new indicator rows (state saved to {engine.path})")
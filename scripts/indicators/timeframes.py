@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+from scripts.models.walk_forward import fold_indices, walk_forward_folds
+
+# ⏱️ Prediction horizons to test (in hours)
+TIMEFRAMES = [1, 2, 4, 6, 12, 24]
+
+# 🚫 Columns that are never model features
+NON_FEATURE_COLUMNS = ["asset", "timestamp"]
+
+# Tree learners split on float32 internally, so float32 features give the same models at half the memory
+FEATURE_DTYPE = np.float32
+
+
+def feature_columns(asset_data):
+    """Numeric columns used as features (identifiers and any target_* columns excluded)."""
+    return [
+        col for col in asset_data.columns
+        if col not in NON_FEATURE_COLUMNS
+        and not str(col).startswith("target")
+        and pd.api.types.is_numeric_dtype(asset_data[col])
+    ]
+
+
+def build_feature_matrix(asset_data, columns=None):
+    """
+    Builds the float32 feature matrix once per asset.
+
+    Returns:
+        (X, columns): The (n_rows, n_features) matrix and the feature names in order.
+    """
+    columns = feature_columns(asset_data) if columns is None else list(columns)
+    X = asset_data[columns].to_numpy(dtype=FEATURE_DTYPE)
+    return X, columns
+
+
+def build_horizon_targets(close, timeframes=TIMEFRAMES):
+    """
+    Builds every horizon target in one vectorized shift.
+
+    Returns:
+        np.ndarray: shape (n_rows, len(timeframes)); column j is `close.shift(-timeframes[j])`.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    ahead = np.arange(n)[:, None] + np.asarray(timeframes)[None, :]
+    return np.where(ahead < n, close[np.minimum(ahead, n - 1)], np.nan)
+
+
+def score_predictions(y_true, y_pred):
+    """MAE / MSE / R² / RMSE for one set of predictions."""
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score  # Imported on use (slow import)
+    mse = mean_squared_error(y_true, y_pred)
+    return {
+        "mae": mean_absolute_error(y_true, y_pred),
+        "mse": mse,
+        "r2": r2_score(y_true, y_pred),
+        "rmse": mse ** 0.5,
+    }
+
+
+def make_default_model(n_jobs=None):
+    """The reference learner for the search: a 100-tree random forest."""
+    from sklearn.ensemble import RandomForestRegressor
+    return RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs)
+
+
+def make_boosted_model(n_jobs=None):
+    """Histogram gradient boosting, early-stopped on the newest training rows (much faster to fit)."""
+    from scripts.models.xgboost_model import TimeOrderedBoostedRegressor
+    return TimeOrderedBoostedRegressor(n_jobs=n_jobs)
+
+
+# 🧩 Learners the search can use (factories take `n_jobs` and must be picklable)
+SEARCH_MODELS = {
+    "random_forest": make_default_model,
+    "hist_gradient_boosting": make_boosted_model,
+}
+
+
+def evaluate_timeframes(X, targets, timeframes=TIMEFRAMES, model_factory=make_default_model, folds=None):
+    """
+    Evaluates every horizon against a shared feature matrix with walk-forward validation.
+
+    Each horizon uses its own row mask (complete features and a known target), so rows
+    dropped for one horizon are never lost for another and no target leaks into X.
+    The fold plan is computed once and reused for every horizon; training rows are
+    purged by the horizon so no target peeks into its test block.
+
+    Returns:
+        pd.DataFrame: One row per timeframe with n_rows, n_folds, mae, mse, r2 and rmse,
+        scored on the pooled out-of-fold predictions.
+    """
+    complete = ~np.isnan(X).any(axis=1)
+    if folds is None:
+        try:
+            folds = walk_forward_folds(len(X))
+        except ValueError:
+            folds = ()
+    results = []
+
+    for j, timeframe in enumerate(timeframes):
+        usable = complete & ~np.isnan(targets[:, j])
+        y_true, y_pred = [], []
+
+        for train_rows, test_rows in fold_indices(folds, purge=timeframe, mask=usable):
+            model = model_factory()
+            model.fit(X[train_rows], targets[train_rows, j])
+            y_pred.append(model.predict(X[test_rows]))
+            y_true.append(targets[test_rows, j])
+
+        row = {"timeframe": timeframe, "n_rows": int(usable.sum()), "n_folds": len(y_true)}
+        if y_true:
+            row.update(score_predictions(np.concatenate(y_true), np.concatenate(y_pred)))
+        else:
+            row.update({"mae": np.nan, "mse": np.nan, "r2": np.nan, "rmse": np.nan})
+        results.append(row)
+
+    return pd.DataFrame(results)
+
+
+def best_timeframe(metrics):
+    """Picks the horizon with the lowest RMSE from a metric table."""
+    scored = metrics.dropna(subset=["rmse"])
+    if scored.empty:
+        raise ValueError("🚨 Not enough rows to evaluate any timeframe.")
+    best = scored.loc[scored["rmse"].idxmin()]
+    return {
+        "timeframe": int(best["timeframe"]),
+        "mae": float(best["mae"]),
+        "mse": float(best["mse"]),
+        "r2": float(best["r2"]),
+        "rmse": float(best["rmse"]),
+    }
+
+
+def search_timeframes(asset_data, timeframes=TIMEFRAMES, model_factory=make_default_model):
+    """
+    🔎 Finds the best prediction horizon for one asset.
+
+    The feature matrix is built once, all targets come from a single vectorized shift,
+    and `asset_data` is never modified.
+
+    Returns:
+        (metrics, best): The full per-horizon metric table and the best row (lowest RMSE) as a dict.
+    """
+    X, _ = build_feature_matrix(asset_data)
+    targets = build_horizon_targets(asset_data["close_price"].to_numpy(), timeframes)
+    metrics = evaluate_timeframes(X, targets, timeframes, model_factory)
+    return metrics, best_timeframe(metrics)
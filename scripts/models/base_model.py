@@ -2,8 +2,11 @@ import os
 import pickle
 import pandas as pd
 import numpy as np
-from google.cloud import bigquery
 from sklearn.metrics import accuracy_score, classification_report
+from scripts.data_processing.storage import get_backend
+from scripts.models.registry import ModelRegistry, data_fingerprint, model_key, model_params
+from scripts.models.serialization import FOREST_SUFFIX, is_forest, load_forest, save_forest
+from scripts.monitoring.instrumentation import stage
 
 class BaseModel:
     """
@@ -14,14 +17,57 @@ class BaseModel:
     - Evaluates performance (because guessing is not a strategy)
     - Logs everything to BigQuery (so future you doesn’t hate past you)
     - Saves models (because recreating models from scratch is for amateurs)
+    - Skips retraining when the exact same data + params were already fitted (model registry)
     
     Future extensions? Sure. But for now, this is the **organized chaos** we need.
     """
 
-    def __init__(self, model, model_name="BaseModel"):
+    def __init__(self, model, model_name="BaseModel", backend=None, registry=None):
         self.model = model
         self.model_name = model_name
-        self.client = bigquery.Client()
+        self.backend = backend  # Resolved on first log, so constructing a model needs no connection
+        self.registry = registry  # Opened on first use (default: models/registry)
+        self.artifact_key = None
+
+    def fit_cached(self, X_train, y_train, horizon=None, timestamps=None):
+        """
+        ♻️ Fits `self.model`, unless an identical fit is already in the model registry.
+
+        The registry key hashes the training data, feature list, target horizon, model name
+        and params; on a hit the stored artifact is loaded instead of fitting. `timestamps`
+        (row times) are passed on to models whose `fit` takes them, and hashed with the data.
+
+        Returns:
+            bool: True on a cache hit (nothing was fitted).
+        """
+        if self.registry is None:
+            self.registry = ModelRegistry()
+
+        features = list(X_train.columns) if hasattr(X_train, "columns") else []
+        fingerprint = data_fingerprint(X_train, y_train, timestamps)
+        params = model_params(self.model)
+        self.artifact_key = model_key(fingerprint, features, horizon, self.model_name, params)
+
+        cached = self.registry.get(self.artifact_key)
+        if cached is not None:
+            self.model = cached
+            print(f"♻️ Loaded {self.model_name} from the model registry ({self.artifact_key[:12]}), no retraining needed.")
+            return True
+
+        with stage("fit", rows_in=len(X_train), model=self.model_name):
+            if timestamps is None:
+                self.model.fit(X_train, y_train)
+            else:
+                self.model.fit(X_train, y_train, timestamps=timestamps)
+        self.registry.put(self.artifact_key, self.model, {
+            "model_name": self.model_name,
+            "data_fingerprint": fingerprint,
+            "features": features,
+            "horizon": horizon,
+            "n_rows": int(len(X_train)),
+            "params": params,
+        })
+        return False
 
     def fit(self, X_train, y_train):
         """🚀 Train the model, because models don’t train themselves (yet)."""
@@ -42,18 +88,45 @@ class BaseModel:
         return report
 
     def log_results(self, accuracy, report):
-        """📝 Logs model performance to BigQuery (so we can remember what worked)."""
+        """📝 Logs model performance to the storage backend (so we can remember what worked)."""
         table_id = "cloud4marketing-281206.crypto_models.performance_logs"
         data = {"model_name": self.model_name, "accuracy": accuracy}
         df = pd.DataFrame([data])
         
-        df.to_gbq(table_id, project_id="cloud4marketing-281206", if_exists="append")
-        print("✅ Results logged to BigQuery!")
+        (self.backend or get_backend()).append(df, table_id)
+        print("✅ Results logged!")
 
     def save_model(self):
-        """💾 Saves the trained model like a digital horcrux."""
+        """
+        💾 Saves the trained model like a digital horcrux.
+        Forests are also written in the memory-mappable format (`models/<name>.forest/`) for fast loading.
+        """
         filename = f"models/{self.model_name}.pkl"
+        os.makedirs("models", exist_ok=True)
         with open(filename, "wb") as f:
             pickle.dump(self.model, f)
         print(f"📁 Model saved as {filename}")
 
+        if is_forest(self.model):
+            save_forest(self.model, f"models/{self.model_name}{FOREST_SUFFIX}")
+
+    def load_model(self, mmap=True):
+        """
+        📂 Loads the model saved by `save_model` into `self.model`.
+
+        With `mmap=True` a forest is opened from its memory-mappable artifact: tree arrays are
+        mapped read-only (shared between processes, nothing deserialized) and `self.model`
+        becomes a predict-only `MappedForest`. Otherwise, or when there is no such artifact,
+        the full pickle is loaded.
+
+        Returns:
+            BaseModel: self
+        """
+        forest_path = f"models/{self.model_name}{FOREST_SUFFIX}"
+        if mmap and os.path.isdir(forest_path):
+            self.model = load_forest(forest_path)
+        else:
+            with open(f"models/{self.model_name}.pkl", "rb") as f:
+                self.model = pickle.load(f)
+        return self
+
@@ -1,6 +1,16 @@
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import GridSearchCV
-from base_model import BaseModel
+from scripts.models.base_model import BaseModel
+from scripts.models.tuning import successive_halving
+from scripts.models.walk_forward import WalkForwardSplit
+
+# 🎛️ Hyperparameter search space (27 combinations)
+PARAM_GRID = {
+    "n_estimators": [50, 100, 200],
+    "max_depth": [None, 10, 20],
+    "min_samples_split": [2, 5, 10],
+}
+HALVING_MIN_ESTIMATORS = 25   # Trees per forest in the first successive-halving rung
 
 
 class RandomForestModel(BaseModel):
@@ -25,21 +35,26 @@ class RandomForestModel(BaseModel):
         :param max_depth: How deep the trees go.  
                           Set it too high, and your model overfits faster than a trader maxing out leverage on a meme coin.  
         """
-        super().__init__("random_forest")
-        self.model = RandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth, random_state=42)
+        super().__init__(
+            RandomForestRegressor(n_estimators=n_estimators, max_depth=max_depth, random_state=42),
+            "random_forest",
+        )
 
-    def train(self, X_train, y_train):
+    def train(self, X_train, y_train, horizon=None):
         """
         Train the Random Forest model on your carefully chosen, definitely-not-biased data.
+        If this exact data + settings combo was trained before, the forest is loaded from the registry instead.
 
         :param X_train: Features for training  
         :param y_train: Target values  
+        :param horizon: Target horizon (hours), part of the registry key  
         """
         if X_train is None or y_train is None:
             raise ValueError("🚨 Missing data! Even the best strategies need actual numbers to work with.")
 
         print("🚀 Training Random Forest Model... This might take longer than your morning coffee, but it’s worth it.")
-        self.model.fit(X_train, y_train)
+        if self.fit_cached(X_train, y_train, horizon):
+            return
         self.save_model()
         print("✅ Model trained and saved! Let’s hope it doesn’t predict like a Magic 8-ball.")
 
@@ -55,36 +70,57 @@ class RandomForestModel(BaseModel):
         else:
             raise RuntimeError("⚠️ Model not trained. Even ‘diamond hands’ need a backtest.")
 
-    def tune_hyperparameters(self, X_train, y_train):
+    def tune_hyperparameters(self, X_train, y_train, cv=None, method="grid", time_budget=None, timestamps=None):
         """
-        Tune hyperparameters using GridSearchCV. Because one-size-fits-all doesn’t apply to trading.
+        Tune hyperparameters over PARAM_GRID. Because one-size-fits-all doesn’t apply to trading.
 
-        :param X_train: Features for training  
+        :param X_train: Features for training (in time order)  
         :param y_train: Target values  
+        :param cv: Fold splitter; defaults to a purged `WalkForwardSplit` so no fold trains on the future  
+        :param method: "grid" (GridSearchCV, every combination fit to completion) or
+                       "halving" (successive halving: losers are dropped at 25 trees, survivors grow via warm_start)  
+        :param time_budget: Wall-clock limit in seconds for "halving" (None = no limit)  
+        :param timestamps: Each row's timestamp. Required when the rows pool several assets: the folds
+                           and the purge then count hours, not rows (see `WalkForwardSplit.split`)  
+        :return: Best parameters  
         """
         if X_train is None or y_train is None:
             raise ValueError("🚨 You can’t optimize what doesn’t exist. Feed the model some data.")
 
         print("🔍 Tuning Hyperparameters... because ‘set it and forget it’ is not a strategy.")
 
-        param_grid = {
-            "n_estimators": [50, 100, 200],
-            "max_depth": [None, 10, 20],
-            "min_samples_split": [2, 5, 10],
-        }
-
-        grid_search = GridSearchCV(
-            RandomForestRegressor(random_state=42), 
-            param_grid, 
-            cv=3, 
-            scoring="r2", 
-            verbose=1, 
-            n_jobs=-1
-        )
+        if method == "grid":
+            grid_search = GridSearchCV(
+                RandomForestRegressor(random_state=42), 
+                PARAM_GRID, 
+                cv=cv or WalkForwardSplit(), 
+                scoring="r2", 
+                verbose=1, 
+                n_jobs=-1
+            )
+
+            grid_search.fit(X_train, y_train, groups=timestamps)
+            self.model = grid_search.best_estimator_
+            best_params = grid_search.best_params_
+        elif method == "halving":
+            search = successive_halving(
+                RandomForestRegressor(random_state=42, n_jobs=-1),
+                PARAM_GRID,
+                X_train,
+                y_train,
+                cv=cv,
+                min_resource=HALVING_MIN_ESTIMATORS,
+                time_budget=time_budget,
+                groups=timestamps,
+            )
+            best_params = search["best_params"]
+            print(f"✂️ Successive halving scored {len(search['history'])} candidate/rung combinations")
+            self.model = RandomForestRegressor(random_state=42, n_jobs=-1, **best_params).fit(X_train, y_train)
+        else:
+            raise ValueError(f"🤨 Unknown tuning method '{method}'. Supported methods: ['grid', 'halving']")
 
-        grid_search.fit(X_train, y_train)
-        self.model = grid_search.best_estimator_
         self.save_model()
 
-        print(f"✅ Best Parameters: {grid_search.best_params_} (Finally, something optimized better than your morning routine.)")
+        print(f"✅ Best Parameters: {best_params} (Finally, something optimized better than your morning routine.)")
         print("✅ Model is locked and loaded! Now go make some trades.")
+        return best_params
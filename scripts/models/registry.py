@@ -0,0 +1,178 @@
+import os
+import json
+import pickle
+import hashlib
+import numpy as np
+import pandas as pd
+
+# 📂 Local File Storage
+REGISTRY_ROOT = os.path.join("models", "registry")
+INDEX_FILE = "_index.json"
+
+# 🧹 Eviction limits (least recently used artifacts go first)
+MAX_BYTES = 2 * 1024 ** 3
+MAX_ENTRIES = 50
+
+# Params that change how fast a model fits, not what it learns
+IGNORED_PARAMS = {"n_jobs", "verbose"}
+
+
+def _column_arrays(column):
+    """
+    NumPy buffers that identify a column's values. Timezone-aware timestamps become int64
+    epochs and categoricals their codes plus categories, so neither goes through objects.
+    """
+    if isinstance(column.dtype, pd.DatetimeTZDtype):
+        return [np.asarray(str(column.dtype)), column.astype("int64").to_numpy()]
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return [column.cat.categories.to_numpy(), column.cat.codes.to_numpy()]
+    return [column.to_numpy()]
+
+
+def data_fingerprint(X, y=None, timestamps=None):
+    """
+    Content hash of the training data: column names, dtypes, shapes and raw bytes of every
+    column (hashed straight from the NumPy buffers, no row-wise conversion). Row
+    `timestamps`, when given, are hashed as int64 epochs.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    frames = [X] if y is None else [X, y]
+    if timestamps is not None:
+        frames.append(pd.to_datetime(pd.Series(timestamps), utc=True).astype("int64").rename("timestamp"))
+    for frame in frames:
+        if isinstance(frame, pd.Series):
+            frame = frame.to_frame()
+        if isinstance(frame, pd.DataFrame):
+            h.update(json.dumps([str(c) for c in frame.columns]).encode())
+            arrays = [values for c in frame.columns for values in _column_arrays(frame[c])]
+        else:
+            arrays = [np.asarray(frame)]
+        for values in arrays:
+            if values.dtype == object:
+                values = values.astype(str)
+            values = np.ascontiguousarray(values)
+            h.update(f"{values.dtype.str}{values.shape}".encode())
+            h.update(values.reshape(-1).view(np.uint8))
+    return h.hexdigest()
+
+
+def model_params(model):
+    """Estimator params that affect the fitted model (JSON-safe, sorted)."""
+    params = model.get_params() if hasattr(model, "get_params") else {}
+    return {k: repr(v) for k, v in sorted(params.items()) if k not in IGNORED_PARAMS}
+
+
+def model_key(fingerprint, features, horizon, model_name, params):
+    """Content address of a trained model: same inputs -> same key -> same artifact."""
+    payload = {
+        "data": fingerprint,
+        "features": [str(f) for f in features],
+        "horizon": horizon,
+        "model": model_name,
+        "params": params,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+class ModelRegistry:
+    """
+    🗃️ **Content-addressed store of trained models**
+
+    Artifacts live at `<root>/<key[:2]>/<key>.pkl`, where the key hashes the training data
+    fingerprint, feature list, target horizon, model name and params. `_index.json` records
+    each artifact's metadata, size and last use; the store is trimmed to `max_bytes` /
+    `max_entries` by evicting the least recently used artifacts.
+    """
+
+    def __init__(self, root=REGISTRY_ROOT, max_bytes=MAX_BYTES, max_entries=MAX_ENTRIES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self.index = self._load_index()
+
+    def _load_index(self):
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                return json.load(f)
+        return {"version": 1, "artifacts": {}}
+
+    def _save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.pkl")
+
+    def __contains__(self, key):
+        return key in self.index["artifacts"] and os.path.exists(self.path(key))
+
+    def get(self, key, now=None):
+        """Loads the artifact for `key` (None on a miss) and marks it as recently used."""
+        if key not in self:
+            return None
+        with open(self.path(key), "rb") as f:
+            model = pickle.load(f)
+        self.index["artifacts"][key]["last_used"] = (now or pd.Timestamp.now(tz="UTC")).isoformat()
+        self._save_index()
+        return model
+
+    def put(self, key, model, metadata=None, now=None):
+        """Stores `model` under `key` with its lookup metadata, then enforces the size limits."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        now = (now or pd.Timestamp.now(tz="UTC")).isoformat()
+        self.index["artifacts"][key] = {
+            **(metadata or {}),
+            "size_bytes": os.path.getsize(path),
+            "created_at": now,
+            "last_used": now,
+        }
+        self.evict()
+        self._save_index()
+        return path
+
+    def evict(self):
+        """
+        Deletes least recently used artifacts until the registry fits `max_bytes` and
+        `max_entries` (the newest artifact always survives).
+
+        Returns:
+            list: Keys that were evicted.
+        """
+        artifacts = self.index["artifacts"]
+        by_age = sorted(artifacts, key=lambda k: artifacts[k]["last_used"])
+        total = sum(a["size_bytes"] for a in artifacts.values())
+
+        evicted = []
+        while len(by_age) > 1 and (total > self.max_bytes or len(by_age) > self.max_entries):
+            key = by_age.pop(0)
+            total -= artifacts[key]["size_bytes"]
+            if os.path.exists(self.path(key)):
+                os.remove(self.path(key))
+            del artifacts[key]
+            evicted.append(key)
+        if evicted:
+            self._save_index()
+        return evicted
+
+    def entries(self, **filters):
+        """
+        Metadata of the stored artifacts as a DataFrame, newest use first.
+        Keyword filters match metadata fields exactly, e.g. `entries(model_name="random_forest")`.
+        """
+        rows = [{"key": key, **meta} for key, meta in self.index["artifacts"].items()]
+        df = pd.DataFrame(rows)
+        for field, value in filters.items():
+            if df.empty:
+                break
+            df = df[df[field] == value] if field in df.columns else df.iloc[0:0]
+        return df.sort_values("last_used", ascending=False).reset_index(drop=True) if not df.empty else df
@@ -0,0 +1,171 @@
+import os
+import json
+import shutil
+import numpy as np
+
+# 🗂️ Memory-mappable forest format: one directory per model
+#  - meta.json: everything small (class, shape, feature names, versions)
+#  - one uncompressed .npy file per tree array, all trees concatenated back to back,
+#    so np.load(mmap_mode="r") can map them read-only and processes share the page cache
+FORMAT_VERSION = 2
+FOREST_SUFFIX = ".forest"
+META_FILE = "meta.json"
+ARRAY_DTYPES = {
+    "children_left": np.int32,   # Global node index (leaves point at themselves)
+    "children_right": np.int32,
+    "feature": np.int32,         # 0 at leaves (never used for a decision there)
+    "threshold": np.float64,
+    "missing_go_to_left": np.uint8,
+    "value": np.float64,         # Leaf prediction (single-output regression)
+    "roots": np.int32,           # Global index of each tree's root node
+}
+
+# Rows routed through the trees per step (bounds the n_rows * n_trees index arrays)
+PREDICT_CHUNK_ROWS = 4096
+
+
+def is_forest(model):
+    """True for fitted single-output tree ensembles (RandomForest/ExtraTrees regressors)."""
+    estimators = getattr(model, "estimators_", None)
+    return (
+        isinstance(estimators, list)
+        and len(estimators) > 0
+        and all(hasattr(est, "tree_") for est in estimators)
+        and getattr(model, "n_outputs_", 1) == 1
+        and not hasattr(model, "classes_")
+    )
+
+
+def save_forest(model, path):
+    """
+    Writes a fitted forest in the memory-mappable format (replacing anything at `path`).
+
+    Only what prediction needs is kept: the split/leaf arrays of every tree. The full
+    estimator (for refitting, impurities, etc.) is still what `BaseModel.save_model` pickles.
+
+    Returns:
+        str: `path`
+    """
+    if not is_forest(model):
+        raise ValueError(f"🚨 {type(model).__name__} is not a fitted single-output tree ensemble.")
+
+    trees = [est.tree_ for est in model.estimators_]
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+
+    def concat(name, transform=None):
+        parts = []
+        for tree, offset in zip(trees, offsets):
+            values = getattr(tree, name)
+            parts.append(transform(values, offset) if transform else values)
+        return np.concatenate(parts).astype(ARRAY_DTYPES[name], copy=False)
+
+    # Children become global node indices and leaves loop back to themselves, so every row can
+    # take exactly `max_depth` steps with no per-step check for which rows are done
+    def to_global(children, offset):
+        return np.where(children == -1, np.arange(len(children)), children) + offset
+
+    arrays = {
+        "children_left": concat("children_left", to_global),
+        "children_right": concat("children_right", to_global),
+        "feature": concat("feature", lambda feature, _: np.maximum(feature, 0)),
+        "threshold": concat("threshold"),
+        "missing_go_to_left": concat("missing_go_to_left"),
+        "value": np.concatenate([tree.value[:, 0, 0] for tree in trees]).astype(np.float64),
+        "roots": offsets[:-1].astype(ARRAY_DTYPES["roots"]),
+    }
+
+    import sklearn
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "model_class": type(model).__name__,
+        "sklearn_version": sklearn.__version__,
+        "n_estimators": len(trees),
+        "n_features": int(model.n_features_in_),
+        "feature_names": [str(f) for f in getattr(model, "feature_names_in_", [])],
+        "node_count": int(offsets[-1]),
+        "max_depth": max(int(tree.max_depth) for tree in trees),
+        "arrays": {name: np.dtype(dtype).str for name, dtype in ARRAY_DTYPES.items()},
+    }
+
+    # Written next to the target, then swapped in, so readers never see half an artifact
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for name, values in arrays.items():
+        np.save(os.path.join(tmp_path, f"{name}.npy"), np.ascontiguousarray(values))
+    with open(os.path.join(tmp_path, META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_forest(path, mmap=True):
+    """
+    Opens a forest written by `save_forest`. With `mmap=True` (default) the tree arrays are
+    memory-mapped read-only, so loading costs a few page-table entries instead of a copy.
+    """
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+    if meta["format_version"] != FORMAT_VERSION:
+        raise ValueError(f"🚨 {path} uses forest format v{meta['format_version']}, expected v{FORMAT_VERSION}.")
+
+    arrays = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None)
+        for name in ARRAY_DTYPES
+    }
+    return MappedForest(meta, arrays)
+
+
+class MappedForest:
+    """
+    🌲🗺️ Read-only forest predictor over (memory-mapped) tree arrays.
+
+    Matches the wrapped `RandomForestRegressor.predict`: rows are cast to float32, go left
+    when `x <= threshold` (NaNs follow `missing_go_to_left`), and the leaf values of all
+    trees are averaged. All trees are walked together, one depth level per step; rows that
+    reach a leaf early just stay there.
+    """
+
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        self.n_estimators = meta["n_estimators"]
+        self.n_features_in_ = meta["n_features"]
+        self.max_depth = meta["max_depth"]
+        if meta["feature_names"]:
+            self.feature_names_in_ = np.asarray(meta["feature_names"], dtype=object)
+        for name, values in arrays.items():
+            setattr(self, name, values)
+
+    def _as_matrix(self, X):
+        if hasattr(X, "columns") and hasattr(self, "feature_names_in_"):
+            X = X[list(self.feature_names_in_)]
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"🚨 Expected {self.n_features_in_} features, got shape {X.shape}.")
+        return X
+
+    def _predict_chunk(self, X):
+        n_rows, n_trees = len(X), self.n_estimators
+        node = np.tile(np.asarray(self.roots), n_rows)        # row-major: (row, tree)
+        row_start = np.repeat(np.arange(n_rows) * self.n_features_in_, n_trees)
+        flat = X.ravel()
+        has_missing = bool(np.isnan(flat).any())
+
+        for _ in range(self.max_depth):
+            x = flat.take(row_start + self.feature.take(node))
+            go_left = x <= self.threshold.take(node)
+            if has_missing:
+                go_left |= np.isnan(x) & self.missing_go_to_left.take(node).astype(bool)
+            node = np.where(go_left, self.children_left.take(node), self.children_right.take(node))
+
+        return self.value.take(node).reshape(n_rows, n_trees).mean(axis=1)
+
+    def predict(self, X):
+        X = self._as_matrix(X)
+        if not len(X):
+            return np.empty(0, dtype=np.float64)
+        return np.concatenate([
+            self._predict_chunk(X[start:start + PREDICT_CHUNK_ROWS])
+            for start in range(0, len(X), PREDICT_CHUNK_ROWS)
+        ])
@@ -0,0 +1,364 @@
+import os
+import json
+import time
+import pickle
+import argparse
+import threading
+import socketserver
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+from scripts.models.base_model import BaseModel
+from scripts.models.serialization import ARRAY_DTYPES, MappedForest
+
+# 🧠 Model cache: per-(asset, horizon) models, least recently used evicted past the cap
+MAX_CACHE_MB = 512
+
+# 📦 Micro-batching: single-row requests queued while a batch is predicting are served together
+MAX_BATCH = 256
+MAX_WAIT_MS = 0.0   # Extra time to wait for more rows once one arrived (0 = only take what is queued)
+
+# ⏱️ Latency window for the p50/p99 report
+LATENCY_WINDOW = 10_000
+
+# 🌐 Front ends
+HTTP_ADDRESS = "127.0.0.1:8765"
+
+
+def asset_model_name(asset, horizon, model_name="random_forest"):
+    """File name (under models/) of the model for one (asset, horizon): e.g. `random_forest_BTC_6h`."""
+    return f"{model_name}_{asset}_{horizon}h"
+
+
+def load_asset_model(asset, horizon, model_name="random_forest"):
+    """Default loader: the artifact `BaseModel.save_model` wrote for (asset, horizon), memory-mapped if possible."""
+    return BaseModel(None, asset_model_name(asset, horizon, model_name)).load_model(mmap=True).model
+
+
+def model_nbytes(model):
+    """Approximate memory held by a model: its array bytes (mapped forests) or its pickled size."""
+    if isinstance(model, MappedForest):
+        return sum(getattr(model, name).nbytes for name in ARRAY_DTYPES)
+    return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class ModelCache:
+    """
+    🗄️ Thread-safe LRU of loaded models keyed by (asset, horizon), capped at `max_bytes`.
+
+    A model is loaded once and then served from memory; when the cap is exceeded the least
+    recently used models are dropped (the one just loaded always stays).
+    """
+
+    def __init__(self, loader=load_asset_model, max_bytes=MAX_CACHE_MB * 1024 ** 2):
+        self.loader = loader
+        self.max_bytes = max_bytes
+        self.models = OrderedDict()   # key -> (model, nbytes)
+        self.total_bytes = 0
+        self.hits = self.misses = self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, asset, horizon):
+        key = (asset, horizon)
+        with self._lock:
+            if key in self.models:
+                self.models.move_to_end(key)
+                self.hits += 1
+                return self.models[key][0]
+
+        # Loaded outside the lock so a slow load doesn't stall hot assets
+        model = self.loader(asset, horizon)
+        nbytes = model_nbytes(model)
+        with self._lock:
+            self.misses += 1
+            if key not in self.models:
+                self.models[key] = (model, nbytes)
+                self.total_bytes += nbytes
+                while self.total_bytes > self.max_bytes and len(self.models) > 1:
+                    _, (_, dropped) = self.models.popitem(last=False)
+                    self.total_bytes -= dropped
+                    self.evictions += 1
+            return self.models[key][0] if key in self.models else model
+
+    def stats(self):
+        with self._lock:
+            return {
+                "models": len(self.models),
+                "cache_mb": round(self.total_bytes / 1024 ** 2, 3),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class LatencyTracker:
+    """Rolling window of request latencies (seconds) with percentile summaries."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.samples.append(seconds)
+            self.count += 1
+
+    def summary(self):
+        with self._lock:
+            samples = np.array(self.samples)
+        if not len(samples):
+            return {"requests": self.count}
+        p50, p99 = np.percentile(samples, [50, 99]) * 1e3
+        return {"requests": self.count, "p50_ms": round(p50, 4), "p99_ms": round(p99, 4),
+                "max_ms": round(samples.max() * 1e3, 4)}
+
+
+class PredictionService:
+    """
+    🔮 **In-process prediction API**
+
+    `predict(asset, horizon, features)` answers one row; concurrent callers are coalesced by a
+    background thread into one vectorized `predict` per (asset, horizon). `predict_batch`
+    scores many rows at once without going through the queue.
+
+        with PredictionService() as service:
+            service.predict("BTC", 6, {"rsi": 55.2, ...})
+    """
+
+    def __init__(self, loader=load_asset_model, max_cache_mb=MAX_CACHE_MB, max_batch=MAX_BATCH,
+                 max_wait_ms=MAX_WAIT_MS):
+        self.cache = ModelCache(loader, int(max_cache_mb * 1024 ** 2))
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1e3
+        self.latency = LatencyTracker()
+        self.batch_sizes = deque(maxlen=LATENCY_WINDOW)
+        self._queue = deque()
+        self._ready = threading.Condition()
+        self._worker = None
+        self._stopped = False
+
+    # 🚦 Lifecycle
+    def start(self):
+        if self._worker is None:
+            self._stopped = False
+            self._worker = threading.Thread(target=self._run, name="prediction-batcher", daemon=True)
+            self._worker.start()
+        return self
+
+    def close(self):
+        with self._ready:
+            self._stopped = True
+            self._ready.notify()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # 🔮 API
+    def predict(self, asset, horizon, features, timeout=None):
+        """One row (`features`: a sequence in model order, or a {feature: value} dict) -> float."""
+        return self.submit(asset, horizon, features).result(timeout)
+
+    def submit(self, asset, horizon, features):
+        """Queues one row and returns a Future for its prediction."""
+        future = Future()
+        future.started = time.perf_counter()
+        with self._ready:
+            if self._stopped or self._worker is None:
+                raise RuntimeError("🚨 PredictionService is not running; call start() first.")
+            self._queue.append((asset, horizon, features, future))
+            self._ready.notify()
+        return future
+
+    def predict_batch(self, asset, horizon, X):
+        """Many rows for one (asset, horizon) in a single vectorized call."""
+        started = time.perf_counter()
+        model = self.cache.get(asset, horizon)
+        predictions = model.predict(self._rows(model, X))
+        self.latency.record(time.perf_counter() - started)
+        return predictions
+
+    def stats(self):
+        sizes = np.array(self.batch_sizes)
+        return {
+            **self.latency.summary(),
+            **self.cache.stats(),
+            "mean_batch_rows": round(float(sizes.mean()), 2) if len(sizes) else 0.0,
+            "max_batch_rows": int(sizes.max()) if len(sizes) else 0,
+        }
+
+    # 📦 Micro-batching
+    @staticmethod
+    def _row(model, features):
+        """One request's features (a sequence in model order, or a dict) -> a float32 row, validated."""
+        names = getattr(model, "feature_names_in_", None)
+        if isinstance(features, dict):
+            if names is None:
+                raise ValueError("🚨 This model has no feature names; send features as a list in model order.")
+            missing = [name for name in names if name not in features]
+            if missing:
+                raise ValueError(f"🚨 Missing features: {missing}")
+            return np.array([features[name] for name in names], dtype=np.float32)
+        row = np.asarray(features, dtype=np.float32)
+        expected = getattr(model, "n_features_in_", None)
+        if row.ndim != 1 or (expected is not None and len(row) != expected):
+            raise ValueError(f"🚨 Expected one row of {expected} features, got shape {row.shape}.")
+        return row
+
+    @classmethod
+    def _rows(cls, model, X):
+        if hasattr(X, "columns"):
+            return X   # DataFrames are aligned to the model's feature names by the model itself
+        if isinstance(X, dict):
+            X = [X]
+        if len(X) and any(isinstance(row, dict) for row in X):
+            return np.stack([cls._row(model, row) for row in X])
+        return np.atleast_2d(np.asarray(X, dtype=np.float32))
+
+    def _take_batch(self):
+        with self._ready:
+            while not self._queue and not self._stopped:
+                self._ready.wait()
+            if self.max_wait and len(self._queue) < self.max_batch:
+                self._ready.wait_for(lambda: len(self._queue) >= self.max_batch or self._stopped, self.max_wait)
+            count = min(len(self._queue), self.max_batch)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return   # Stopped and drained
+            self.batch_sizes.append(len(batch))
+
+            groups = {}
+            for request in batch:
+                groups.setdefault((request[0], request[1]), []).append(request)
+            for (asset, horizon), requests in groups.items():
+                try:
+                    model = self.cache.get(asset, horizon)
+                except Exception as exc:
+                    for *_, future in requests:
+                        future.set_exception(exc)
+                    continue
+
+                # A malformed row fails only its own request; the valid ones are stacked and scored
+                valid, rows = [], []
+                for *_, features, future in requests:
+                    try:
+                        rows.append(self._row(model, features))
+                        valid.append(future)
+                    except Exception as exc:
+                        future.set_exception(exc)
+                if not valid:
+                    continue
+                try:
+                    predictions = model.predict(np.stack(rows))
+                except Exception as exc:
+                    for future in valid:
+                        future.set_exception(exc)
+                    continue
+                finished = time.perf_counter()
+                for future, prediction in zip(valid, predictions):
+                    self.latency.record(finished - future.started)
+                    future.set_result(float(prediction))
+
+
+# 🌐 Front ends: JSON over HTTP (POST /predict, GET /stats) or newline-delimited JSON over a Unix socket
+def handle_request(service, request):
+    """One JSON request -> JSON-able response. `features` may be one row or a list of rows."""
+    if request.get("op") == "stats":
+        return service.stats()
+    asset, horizon, features = request["asset"], int(request["horizon"]), request["features"]
+    if isinstance(features, list) and features and isinstance(features[0], (list, dict)):
+        return {"predictions": service.predict_batch(asset, horizon, features).tolist()}
+    return {"prediction": service.predict(asset, horizon, features)}
+
+
+def make_http_server(service, address=HTTP_ADDRESS):
+    host, port = address.rsplit(":", 1)
+
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._reply(200, service.stats())
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                return self._reply(404, {"error": "not found"})
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                self._reply(200, handle_request(service, request))
+            except Exception as exc:
+                self._reply(400, {"error": str(exc)})
+
+        def log_message(self, *args):
+            pass   # One line per request would cost more than the prediction
+
+    return ThreadingHTTPServer((host, int(port)), Handler)
+
+
+def make_unix_server(service, path):
+    if os.path.exists(path):
+        os.remove(path)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for line in self.rfile:
+                try:
+                    response = handle_request(service, json.loads(line))
+                except Exception as exc:
+                    response = {"error": str(exc)}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+
+    server = socketserver.ThreadingUnixStreamServer(path, Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    """
+    CLI: `python -m scripts.models.serving [--http HOST:PORT | --unix PATH] [--model random_forest]`
+    Serves `models/<model>_<asset>_<horizon>h` artifacts.
+    """
+    parser = argparse.ArgumentParser(description="Serve per-(asset, horizon) model predictions.")
+    parser.add_argument("--http", default=None, help=f"HOST:PORT to listen on (default {HTTP_ADDRESS})")
+    parser.add_argument("--unix", default=None, help="Unix socket path (newline-delimited JSON)")
+    parser.add_argument("--model", default="random_forest")
+    parser.add_argument("--max-cache-mb", type=float, default=MAX_CACHE_MB)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args(argv)
+
+    loader = lambda asset, horizon: load_asset_model(asset, horizon, args.model)
+    with PredictionService(loader, args.max_cache_mb, args.max_batch, args.max_wait_ms) as service:
+        server = make_unix_server(service, args.unix) if args.unix else make_http_server(service, args.http or HTTP_ADDRESS)
+        print(f"🔮 Serving `{args.model}` predictions on {args.unix or args.http or HTTP_ADDRESS}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            print(f"📊 {json.dumps(service.stats())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,63 +1,141 @@
 import os
 import json
 import pandas as pd
-from google.cloud import bigquery
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from load_data import load_data  # Load the freshest crypto data
-from models.base_model import BaseModel  # Our base class for all models
-from models.random_forest import RandomForestModel  # Import models dynamically later?
+from scripts.data_processing.load_data import CREDENTIALS_PATH, load_data  # Load the freshest crypto data
+from scripts.models.base_model import BaseModel  # Our base class for all models
+from scripts.models.random_forest import RandomForestModel  # Import models dynamically later?
+from scripts.models.xgboost_model import HistGradientBoostingModel
+from scripts.data_processing.storage import get_backend
+from scripts.indicators.setup_indicators import load_indicators
+from scripts.models.serving import asset_model_name
+from scripts.monitoring.instrumentation import stage
 
 # BigQuery Configuration
 PROJECT_ID = "cloud4marketing-281206"
 DATASET_ID = "crypto_price"
 MODEL_RESULTS_TABLE = f"{PROJECT_ID}.{DATASET_ID}.model_results"
 
-# 🚀 Step 1: Load Data
-print("📡 Fetching and splitting data... because we like informed decisions.")
-X_train, X_test, y_train, y_test = load_data()
-
-# 🚀 Step 2: Select Model
+# 🧩 Available Models
 MODEL_MAPPING = {
     "random_forest": RandomForestModel,
-    # Future expansion: "lstm": LSTMModel, "xgboost": XGBoostModel
+    "hist_gradient_boosting": HistGradientBoostingModel,
+    # Future expansion: "lstm": LSTMModel
 }
 
-model_name = os.getenv("MODEL_NAME", "random_forest")  # Default: Random Forest
-if model_name not in MODEL_MAPPING:
-    raise ValueError(f"🤨 Unknown model '{model_name}'. Supported models: {list(MODEL_MAPPING.keys())}")
-
-ModelClass = MODEL_MAPPING[model_name]
-model = ModelClass()
-
-# 🚀 Step 3: Train Model
-print(f"🎯 Training `{model_name}` model... hope it doesn't disappoint.")
-model.train(X_train, y_train)
-
-# 🚀 Step 4: Make Predictions
-y_pred = model.predict(X_test)
-
-# 🚀 Step 5: Evaluate Performance
-print("📊 Evaluating model performance... because data-driven gloating is the best kind.")
-metrics = {
-    "model": model_name,
-    "r2_score": r2_score(y_test, y_pred),
-    "mae": mean_absolute_error(y_test, y_pred),
-    "mse": mean_squared_error(y_test, y_pred),
-    "rmse": mean_squared_error(y_test, y_pred, squared=False),
-    "feature_importances": model.get_feature_importance().to_dict() if hasattr(model, "get_feature_importance") else "N/A",
-}
 
-print(json.dumps(metrics, indent=4))
+def train_and_evaluate(model_name, X_train, X_test, y_train, y_test):
+    """
+    Trains one model from MODEL_MAPPING on an existing chronological split and scores it on the test rows.
+
+    Returns:
+        dict: The metrics row (model, r2_score, mae, mse, rmse, feature_importances, artifact_key).
+    """
+    # 🚀 Step 2: Select Model
+    if model_name not in MODEL_MAPPING:
+        raise ValueError(f"🤨 Unknown model '{model_name}'. Supported models: {list(MODEL_MAPPING.keys())}")
+
+    ModelClass = MODEL_MAPPING[model_name]
+    model = ModelClass()
+
+    # 🚀 Step 3: Train Model
+    print(f"🎯 Training `{model_name}` model... hope it doesn't disappoint.")
+    with stage("train", rows_in=len(X_train), model=model_name):
+        model.train(X_train, y_train)
+
+    # 🚀 Step 4: Make Predictions
+    with stage("predict", rows_in=len(X_test), model=model_name) as record:
+        y_pred = model.predict(X_test)
+        record.rows_out = len(y_pred)
+
+    # 🚀 Step 5: Evaluate Performance
+    print("📊 Evaluating model performance... because data-driven gloating is the best kind.")
+    metrics = {
+        "model": model_name,
+        "r2_score": r2_score(y_test, y_pred),
+        "mae": mean_absolute_error(y_test, y_pred),
+        "mse": mean_squared_error(y_test, y_pred),
+        "rmse": mean_squared_error(y_test, y_pred) ** 0.5,
+        "feature_importances": model.get_feature_importance().to_dict() if hasattr(model, "get_feature_importance") else "N/A",
+    }
+
+    print(json.dumps(metrics, indent=4))
+
+    # 🚀 Step 6: Save Model (Because We Ain’t Training This Twice!)
+    # `train` already stored the fit in the model registry; unchanged data next time = no retraining
+    metrics["artifact_key"] = model.artifact_key
+    return metrics
+
+
+def export_serving_models(df, horizons, model_name="random_forest", **params):
+    """
+    📦 Trains one model per (asset, horizon) on each asset's full history and saves it where the
+    prediction server loads it from (`models/<model>_<asset>_<horizon>h`, forests also memory-mappable).
+
+    Args:
+        df (pd.DataFrame): Indicator rows (asset, timestamp, close_price and the feature columns).
+        horizons (list): Hours ahead to predict; the target is the close price that far ahead.
+        model_name (str): Key of MODEL_MAPPING.
+        **params: Passed to the model class (e.g. n_estimators).
+
+    Returns:
+        list: The saved model names.
+    """
+    if model_name not in MODEL_MAPPING:
+        raise ValueError(f"🤨 Unknown model '{model_name}'. Supported models: {list(MODEL_MAPPING.keys())}")
+
+    features = [c for c in df.columns if c not in ("asset", "timestamp", "target")]
+    saved = []
+    for asset, rows in df.sort_values(["asset", "timestamp"]).groupby("asset", observed=True, sort=False):
+        for horizon in horizons:
+            target = rows["close_price"].shift(-horizon)
+            keep = target.notna() & rows[features].notna().all(axis=1)
+            if not keep.any():
+                print(f"⚠️ Skipping {asset} {horizon}h: no complete rows to train on.")
+                continue
+            model = MODEL_MAPPING[model_name](**params)
+            model.model_name = asset_model_name(asset, horizon, model_name)
+            with stage("train", rows_in=int(keep.sum()), model=model.model_name):
+                model.fit_cached(rows.loc[keep, features], target[keep], horizon)
+            model.save_model()   # Also on a registry hit, so the server always finds the artifact
+            saved.append(model.model_name)
+    print(f"✅ Exported {len(saved)} per-(asset, horizon) `{model_name}` models for serving.")
+    return saved
+
+
+def log_metrics(metrics, backend=None):
+    """🚀 Step 7: Store Results in the Storage Backend (one row per training run)."""
+    df_metrics = pd.DataFrame([metrics])
+    df_metrics["timestamp"] = pd.Timestamp.now(tz="UTC")
+
+    print("📡 Uploading model results... because logs are life.")
+    (backend or get_backend()).append(df_metrics, MODEL_RESULTS_TABLE)
+
+
+def main(model_name=None):
+    """
+    🏋️ Trains one model from MODEL_MAPPING on the chronological split and logs its metrics.
+
+    CLI: `python -m scripts.models.train` (model picked by the MODEL_NAME environment variable).
+    With SERVING_HORIZONS set (e.g. "1,6,24"), per-(asset, horizon) models for the prediction
+    server are exported as well.
+    """
+    os.environ.setdefault("GOOGLE_APPLICATION_CREDENTIALS", CREDENTIALS_PATH)
+
+    # 🚀 Step 1: Load Data
+    print("📡 Fetching and splitting data... because we like informed decisions.")
+    X_train, X_test, y_train, y_test = load_data()
+
+    model_name = model_name or os.getenv("MODEL_NAME", "random_forest")  # Default: Random Forest
+    metrics = train_and_evaluate(model_name, X_train, X_test, y_train, y_test)
+    log_metrics(metrics)
 
-# 🚀 Step 6: Save Model (Because We Ain’t Training This Twice!)
-model.save(f"{model_name}_model.pkl")
+    horizons = os.getenv("SERVING_HORIZONS")
+    if horizons:
+        export_serving_models(load_indicators(), [int(h) for h in horizons.split(",")], model_name)
 
-# 🚀 Step 7: Store Results in BigQuery
-client = bigquery.Client()
-df_metrics = pd.DataFrame([metrics])
-df_metrics["timestamp"] = pd.Timestamp.utcnow()
+    print(f"✅ Training complete! `{model_name}` results saved locally & in the results table! 🚀")
 
-print("📡 Uploading model results to BigQuery... because logs are life.")
-df_metrics.to_gbq(MODEL_RESULTS_TABLE, project_id=PROJECT_ID, if_exists="append")
 
-print(f"✅ Training complete! `{model_name}` results saved locally & in BigQuery! 🚀")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import time
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import r2_score
+from sklearn.model_selection import ParameterGrid
+from scripts.models.walk_forward import WalkForwardSplit
+
+# ✂️ Successive halving: keep the best 1/ETA of the candidates at each rung
+ETA = 3
+
+
+def successive_halving(estimator, param_grid, X, y, cv=None, resource="n_estimators", min_resource=None,
+                       eta=ETA, time_budget=None, groups=None):
+    """
+    🏁 Successive-halving search where the budget is the number of trees.
+
+    Every combination of the *other* params starts at `min_resource` trees; after each rung
+    only the best `1/eta` (by mean R² over the time-ordered folds) move on to the next
+    `param_grid[resource]` value. Survivors are not refit: each (candidate, fold) forest is
+    kept with `warm_start=True` and only the missing trees are grown. Once a single candidate
+    is left there is nothing to compare, so it is not scored again and gets the largest
+    `resource` value.
+
+    Args:
+        estimator: Unfitted forest supporting `warm_start` (e.g. `RandomForestRegressor`).
+        param_grid (dict): Grid in `GridSearchCV` form; `param_grid[resource]` lists the rungs.
+        min_resource (int): Trees for the first (screening) rung (default: smallest grid value).
+        X, y: Training rows in time order.
+        cv: Fold splitter (default: purged `WalkForwardSplit`).
+        eta (int): Elimination factor.
+        time_budget (float): Optional wall-clock limit in seconds. Once spent, no further fits
+            start and the best candidate from the highest rung scored so far wins.
+        groups: Each row's timestamp, passed to `cv.split`. Needed when the rows pool several
+            assets, so folds and purge count hours rather than rows.
+
+    Returns:
+        dict: `best_params` (including `resource`), `best_score`, and `history` (one row per
+        candidate and rung: params, `resource`, mean_score, fit_seconds).
+    """
+    started = time.perf_counter()
+    rungs = sorted(param_grid[resource])
+    if min_resource is not None:
+        rungs = sorted({min_resource, *[n for n in rungs if n > min_resource]})
+    others = {name: values for name, values in param_grid.items() if name != resource}
+    candidates = list(ParameterGrid(others))
+    folds = list((cv or WalkForwardSplit()).split(X, y, groups))
+
+    X = X.to_numpy() if hasattr(X, "to_numpy") else np.asarray(X)
+    y = y.to_numpy() if hasattr(y, "to_numpy") else np.asarray(y)
+
+    forests = {}   # (candidate index, fold index) -> warm-started forest
+    history = []
+    alive = list(range(len(candidates)))
+    out_of_time = False
+
+    for rung, n_resource in enumerate(rungs):
+        if len(alive) == 1 and rung > 0:
+            break
+        scores = {}
+        for idx in alive:
+            fold_scores = []
+            fit_started = time.perf_counter()
+            for fold, (train_idx, test_idx) in enumerate(folds):
+                if time_budget is not None and time.perf_counter() - started > time_budget:
+                    out_of_time = True
+                    break
+                model = forests.get((idx, fold))
+                if model is None:
+                    model = clone(estimator).set_params(warm_start=True, **candidates[idx])
+                    forests[(idx, fold)] = model
+                model.set_params(**{resource: n_resource})
+                model.fit(X[train_idx], y[train_idx])
+                fold_scores.append(r2_score(y[test_idx], model.predict(X[test_idx])))
+            if out_of_time:
+                break
+            scores[idx] = float(np.mean(fold_scores))
+            history.append({
+                "candidate": idx, **candidates[idx], resource: n_resource, "rung": rung,
+                "mean_score": scores[idx], "fit_seconds": time.perf_counter() - fit_started,
+            })
+
+        if not scores:
+            break   # Budget ran out before this rung scored anyone; the previous rung decides
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        alive = ranked[:max(1, int(np.ceil(len(ranked) / eta)))]
+
+        # Forests that were dropped free their trees right away
+        for key in [key for key in forests if key[0] not in alive]:
+            del forests[key]
+        if out_of_time:
+            break
+
+    history = pd.DataFrame(history)
+    if history.empty:
+        raise RuntimeError("⏱️ The time budget ran out before a single candidate was scored.")
+
+    # Best = top score on the highest rung reached (scores on fewer trees aren't comparable)
+    top = history[history["rung"] == history["rung"].max()]
+    best = top.loc[top["mean_score"].idxmax()]
+    n_resource = rungs[-1] if len(alive) == 1 and not out_of_time else int(best[resource])
+    best_params = {**candidates[int(best["candidate"])], resource: n_resource}
+    return {"best_params": best_params, "best_score": float(best["mean_score"]), "history": history}
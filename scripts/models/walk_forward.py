@@ -0,0 +1,129 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+
+# 🧮 Defaults for time-ordered validation
+N_SPLITS = 3
+MAX_HORIZON_HOURS = 24  # Purge at least this many bars when the target horizon isn't known
+
+
+@lru_cache(maxsize=256)
+def walk_forward_folds(n_rows, n_splits=N_SPLITS, test_size=None, min_train_size=None, max_train_size=None):
+    """
+    Plans walk-forward folds over `n_rows` time-ordered rows.
+
+    Test blocks are contiguous and move forward through time; each fold trains only on
+    rows before its test block (expanding window, or rolling when `max_train_size` is set).
+    Plans are cached, so every horizon, model and hyperparameter combination for an
+    asset reuses the same boundaries.
+
+    Returns:
+        tuple: One `(train_start, train_stop, test_start, test_stop)` per fold.
+    """
+    test_size = test_size or n_rows // (n_splits + 1)
+    min_train_size = min_train_size or test_size
+    if test_size < 1 or n_rows - n_splits * test_size < min_train_size:
+        raise ValueError(f"🚨 {n_rows} rows is too few for {n_splits} walk-forward folds of {test_size} rows.")
+
+    folds = []
+    for k in range(n_splits):
+        test_start = n_rows - (n_splits - k) * test_size
+        train_start = 0 if max_train_size is None else max(0, test_start - max_train_size)
+        folds.append((train_start, test_start, test_start, test_start + test_size))
+    return tuple(folds)
+
+
+def fold_indices(folds, purge=0, embargo=0, mask=None):
+    """
+    Turns planned folds into `(train_idx, test_idx)` arrays for one horizon.
+
+    Args:
+        folds: Output of `walk_forward_folds`.
+        purge: Target horizon in bars. Training rows whose target would look into the
+               test block (`row + purge >= test_start`) are dropped.
+        embargo: Extra bars dropped before each test block (for autocorrelated features).
+        mask: Optional boolean array of usable rows (e.g. complete features + known target).
+
+    Yields:
+        (train_idx, test_idx) positional index arrays.
+    """
+    for train_start, train_stop, test_start, test_stop in folds:
+        train_idx = np.arange(train_start, max(train_start, train_stop - purge - embargo))
+        test_idx = np.arange(test_start, test_stop)
+        if mask is not None:
+            train_idx = train_idx[mask[train_idx]]
+            test_idx = test_idx[mask[test_idx]]
+        if len(train_idx) and len(test_idx):
+            yield train_idx, test_idx
+
+
+class WalkForwardSplit:
+    """
+    ⏩ Walk-forward cross-validator with purge/embargo gaps.
+
+    Drop-in replacement for `cv=3` in `GridSearchCV` and friends (implements `split` and
+    `get_n_splits`). Rows must already be in time order, unless their timestamps are passed
+    as `groups` (required for multi-asset panels, see `split`).
+    """
+
+    def __init__(self, n_splits=N_SPLITS, purge=MAX_HORIZON_HOURS, embargo=0, test_size=None,
+                 min_train_size=None, max_train_size=None):
+        self.n_splits = n_splits
+        self.purge = purge
+        self.embargo = embargo
+        self.test_size = test_size
+        self.min_train_size = min_train_size
+        self.max_train_size = max_train_size
+
+    def folds(self, n_rows):
+        return walk_forward_folds(n_rows, self.n_splits, self.test_size, self.min_train_size, self.max_train_size)
+
+    def split(self, X, y=None, groups=None):
+        """
+        Yields `(train_idx, test_idx)` row positions.
+
+        `groups` takes each row's timestamp, e.g. for a panel of several assets (as
+        `GridSearchCV.fit(X, y, groups=timestamps)` passes it on). Folds, purge and embargo
+        then count distinct timestamps instead of rows, so the purge spans `purge` bars of
+        every asset and no timestamp is split between train and test. Without `groups`,
+        each row is one time step of a single series.
+        """
+        if groups is None:
+            steps, n_steps = None, len(X)
+        else:
+            steps, times = pd.factorize(pd.Series(groups), sort=True)
+            n_steps = len(times)
+
+        # Every planned fold must survive the purge, or `get_n_splits` would disagree with `split`
+        folds = self.folds(n_steps)
+        splits = list(fold_indices(folds, self.purge, self.embargo))
+        if len(splits) < len(folds):
+            raise ValueError(f"🚨 {n_steps} time steps is too few for {len(folds)} walk-forward folds with a "
+                             f"{self.purge}-bar purge and {self.embargo}-bar embargo.")
+        for train_steps, test_steps in splits:
+            if steps is None:
+                yield train_steps, test_steps
+            else:
+                yield np.flatnonzero(np.isin(steps, train_steps)), np.flatnonzero(np.isin(steps, test_steps))
+
+    def get_n_splits(self, X=None, y=None, groups=None):
+        return self.n_splits
+
+
+def holdout_split(timestamps, test_size=0.2, purge=pd.Timedelta(hours=MAX_HORIZON_HOURS)):
+    """
+    Chronological train/test split shared by every asset: the last `test_size` share of
+    timestamps is the test set, and training stops `purge` before it.
+
+    Returns:
+        (train_mask, test_mask) boolean arrays aligned with `timestamps`.
+    """
+    timestamps = pd.to_datetime(pd.Series(timestamps)).reset_index(drop=True)
+    unique_times = np.sort(timestamps.unique())
+    if len(unique_times) < 2:
+        raise ValueError("🚨 Need at least two distinct timestamps for a chronological split.")
+
+    cutoff = unique_times[min(len(unique_times) - 1, int(len(unique_times) * (1 - test_size)))]
+    test_mask = (timestamps >= cutoff).to_numpy()
+    train_mask = (timestamps < cutoff - purge).to_numpy()
+    return train_mask, test_mask
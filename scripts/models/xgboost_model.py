@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingRegressor
+from threadpoolctl import threadpool_limits
+from scripts.models.base_model import BaseModel
+from scripts.models.walk_forward import MAX_HORIZON_HOURS, holdout_split
+
+# 🚀 Boosting defaults: many shallow, binned trees; early stopping picks the actual count
+MAX_ITER = 500
+LEARNING_RATE = 0.1
+MAX_LEAF_NODES = 15
+VALIDATION_FRACTION = 0.1   # Newest share of the training rows held out for early stopping
+N_ITER_NO_CHANGE = 20
+MIN_VALIDATION_ROWS = 50    # Below this, fit on everything for MAX_ITER // 5 iterations instead
+
+
+class TimeOrderedBoostedRegressor:
+    """
+    ⏩ `HistGradientBoostingRegressor` that early-stops on the **newest** rows.
+
+    sklearn's built-in early stopping validates on a random split, which leaks the future
+    into the stopping decision on time series. Here rows are assumed to be in time order;
+    the last `validation_fraction` of them is passed as `X_val` (scikit-learn >= 1.7) and
+    the rest, minus a `purge`-hour gap so no training target reaches into the validation
+    slice, is trained on. Pass `timestamps` to `fit` for panels of several assets (the
+    split and gap are then in time, shared by every asset); without them each row is one
+    hourly bar. With `refit=True` the model is then refit on every row for the
+    chosen number of rounds, so the newest bars (the ones that matter most for a trending
+    price) are not left out of the final model.
+
+    Inputs are cast to float32 (the learner bins them anyway), and `n_jobs` caps the
+    OpenMP threads used while fitting and predicting.
+    """
+
+    def __init__(self, n_jobs=None, validation_fraction=VALIDATION_FRACTION, refit=True, max_iter=MAX_ITER,
+                 learning_rate=LEARNING_RATE, max_leaf_nodes=MAX_LEAF_NODES, random_state=42,
+                 purge=MAX_HORIZON_HOURS):
+        self.n_jobs = n_jobs
+        self.validation_fraction = validation_fraction
+        self.purge = purge
+        self.refit = refit
+        self.max_iter = max_iter
+        self.estimator = HistGradientBoostingRegressor(
+            max_iter=max_iter,
+            learning_rate=learning_rate,
+            max_leaf_nodes=max_leaf_nodes,
+            n_iter_no_change=N_ITER_NO_CHANGE,
+            random_state=random_state,
+        )
+
+    def _threads(self):
+        return threadpool_limits(limits=self.n_jobs, user_api="openmp")
+
+    def fit(self, X, y, timestamps=None):
+        X = np.asarray(X, dtype=np.float32)
+        y = np.asarray(y, dtype=np.float64)
+        if timestamps is None:
+            timestamps = pd.to_datetime(np.arange(len(X)), unit="h")
+        train = val = np.zeros(len(X), dtype=bool)
+        if int(len(X) * self.validation_fraction) >= MIN_VALIDATION_ROWS:
+            train, val = holdout_split(timestamps, self.validation_fraction, pd.Timedelta(hours=self.purge))
+
+        with self._threads():
+            if val.sum() >= MIN_VALIDATION_ROWS and train.any():
+                self.estimator.set_params(early_stopping=True, max_iter=self.max_iter)
+                self.estimator.fit(X[train], y[train], X_val=X[val], y_val=y[val])
+                if self.refit:
+                    self.estimator.set_params(early_stopping=False, max_iter=self.estimator.n_iter_)
+                    self.estimator.fit(X, y)
+            else:
+                self.estimator.set_params(early_stopping=False, max_iter=max(self.max_iter // 5, 1))
+                self.estimator.fit(X, y)
+        return self
+
+    def get_params(self, deep=True):
+        """Settings that determine the fitted model (`n_jobs` only changes speed)."""
+        params = self.estimator.get_params(deep=deep)
+        return {**params, "validation_fraction": self.validation_fraction, "refit": self.refit,
+                "max_iter": self.max_iter, "purge": self.purge}
+
+    def predict(self, X):
+        with self._threads():
+            return self.estimator.predict(np.asarray(X, dtype=np.float32))
+
+    @property
+    def n_iter_(self):
+        return self.estimator.n_iter_
+
+
+class HistGradientBoostingModel(BaseModel):
+    """
+    🌳⚡ Histogram gradient boosting extending BaseModel.
+    The random forest's faster sibling: shallow binned trees, built one after another,
+    stopping as soon as the most recent data stops improving.
+
+    ✅ Supports:
+        - Multi-threaded training (OpenMP, capped by `n_jobs`)
+        - Early stopping on a time-ordered validation slice (the newest rows)
+        - float32 inputs (straight from the compact indicator schema)
+        - Model persistence (via BaseModel)
+    """
+
+    def __init__(self, max_iter=MAX_ITER, learning_rate=LEARNING_RATE, max_leaf_nodes=MAX_LEAF_NODES,
+                 validation_fraction=VALIDATION_FRACTION, refit=True, n_jobs=None, purge=MAX_HORIZON_HOURS):
+        """
+        :param max_iter: Upper bound on boosting rounds; early stopping usually ends well before it.
+        :param learning_rate: Shrinkage per round. Lower = more rounds, smoother fit.
+        :param max_leaf_nodes: Leaves per tree. Keeps each tree small and cheap to predict.
+        :param validation_fraction: Newest share of the training rows used for early stopping.
+        :param refit: Refit on all rows (validation slice included) for the early-stopped round count.
+        :param n_jobs: Thread cap while fitting/predicting (default: all cores).
+        :param purge: Hours left out between the training rows and the validation slice (>= target horizon).
+        """
+        super().__init__(
+            TimeOrderedBoostedRegressor(
+                n_jobs=n_jobs,
+                validation_fraction=validation_fraction,
+                refit=refit,
+                max_iter=max_iter,
+                learning_rate=learning_rate,
+                max_leaf_nodes=max_leaf_nodes,
+                purge=purge,
+            ),
+            "hist_gradient_boosting",
+        )
+
+    def train(self, X_train, y_train, horizon=None):
+        """
+        Train on time-ordered rows (oldest first); the newest slice decides when to stop.
+        An identical earlier fit is loaded from the model registry instead.
+
+        A `DatetimeIndex` on `X_train` (as `split_data` returns it) is used as the row
+        timestamps, so the validation slice and its purge gap are in time on a panel.
+
+        :param X_train: Features for training, in time order
+        :param y_train: Target values
+        :param horizon: Target horizon (hours), part of the registry key
+        """
+        if X_train is None or y_train is None:
+            raise ValueError("🚨 Missing data! Even the best strategies need actual numbers to work with.")
+
+        print("🚀 Training Histogram Gradient Boosting... shallow trees, fast bins, no coffee break needed.")
+        timestamps = X_train.index if isinstance(X_train.index, pd.DatetimeIndex) else None
+        if self.fit_cached(X_train, y_train, horizon, timestamps=timestamps):
+            return
+        self.save_model()
+        print(f"✅ Model trained and saved! Early stopping kept {self.model.n_iter_} boosting rounds.")
+
+    def predict(self, X):
+        """
+        Generate predictions.
+
+        :param X: Input features
+        :return: Predictions
+        """
+        return self.model.predict(X)
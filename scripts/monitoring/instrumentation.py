@@ -0,0 +1,370 @@
+"""
+📈 Lightweight per-stage instrumentation.
+
+Wrap a pipeline stage in `stage(...)` (or decorate it with `@instrument(...)`) to record:
+wall time, CPU time, memory (the stage's RSS change, how far it pushed the process's peak
+RSS up, and that peak), rows in/out, rows/sec and bytes scanned by the storage backend.
+Every finished stage is appended to a JSON-lines log, and running totals are kept in a
+Prometheus text-format file (for the node_exporter textfile collector), one series per
+stage and label set (`stage("fit", model="random_forest")`). The file is read back and
+updated under a file lock on every write, so counters keep growing across runs and
+concurrent processes add to them instead of overwriting each other.
+
+Off unless `MAGICIAN_METRICS=1` (or `configure(enabled=True)`); when off, `stage()` hands
+back a shared no-op record and `@instrument` calls straight through.
+
+Set `MAGICIAN_PROFILE=stage_a,stage_b` (or `all`) to run those stages under cProfile; each
+run dumps a `.prof` file next to the logs (open with `snakeviz` / `python -m pstats`).
+Every log line carries the pid and start/end wall-clock times, so `py-spy record` output of
+the same process can be lined up with the stages.
+"""
+import os
+import re
+import sys
+import json
+import time
+import inspect
+import cProfile
+import functools
+import threading
+from contextlib import contextmanager
+import pandas as pd
+
+try:
+    import resource   # POSIX only; peak RSS is left out elsewhere
+except ImportError:
+    resource = None
+
+try:
+    import fcntl      # POSIX only; elsewhere only threads of one process are serialized
+except ImportError:
+    fcntl = None
+
+# ⚙️ Configuration (environment variables, overridable with `configure`)
+ENABLED_ENV = "MAGICIAN_METRICS"
+LOG_ENV = "MAGICIAN_METRICS_LOG"
+PROM_ENV = "MAGICIAN_METRICS_PROM"
+PROFILE_ENV = "MAGICIAN_PROFILE"
+
+METRICS_DIR = "metrics"
+LOG_PATH = os.path.join(METRICS_DIR, "stages.jsonl")
+PROM_PATH = os.path.join(METRICS_DIR, "magician.prom")
+PROFILE_DIR = os.path.join(METRICS_DIR, "profiles")
+
+# Prometheus metrics kept per stage: (name, type, help, record field)
+PROM_METRICS = [
+    ("magician_stage_runs_total", "counter", "Completed runs of the stage", None),
+    ("magician_stage_errors_total", "counter", "Runs of the stage that raised", None),
+    ("magician_stage_wall_seconds_total", "counter", "Wall-clock seconds spent in the stage", "wall_seconds"),
+    ("magician_stage_cpu_seconds_total", "counter", "CPU seconds spent in the stage", "cpu_seconds"),
+    ("magician_stage_rows_in_total", "counter", "Rows handed to the stage", "rows_in"),
+    ("magician_stage_rows_out_total", "counter", "Rows produced by the stage", "rows_out"),
+    ("magician_stage_bytes_scanned_total", "counter", "Bytes scanned by backend queries in the stage", "bytes_scanned"),
+    ("magician_stage_last_wall_seconds", "gauge", "Wall-clock seconds of the latest run", "wall_seconds"),
+    ("magician_stage_last_rows_per_second", "gauge", "Throughput of the latest run", "rows_per_second"),
+    ("magician_stage_last_rss_delta_bytes", "gauge", "Change in resident memory over the latest run",
+     "rss_delta_bytes"),
+    ("magician_stage_last_peak_rss_growth_bytes", "gauge",
+     "How far the latest run raised the process's peak RSS (0 if it stayed under an earlier peak)",
+     "peak_rss_growth_bytes"),
+    ("magician_process_peak_rss_bytes", "gauge",
+     "Peak RSS of the whole process (since it started) at the end of the stage's latest run",
+     "process_peak_rss_bytes"),
+]
+_PROM_SAMPLE = re.compile(r'^(\w+)\{(.*)\} (\S+)$')
+_PROM_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+_config = {}
+_lock = threading.Lock()
+_active = threading.local()
+
+
+def configure(enabled=None, log_path=None, prom_path=None, profile=None):
+    """Overrides the environment configuration (e.g. from a CLI flag or a test)."""
+    settings = _settings()
+    if enabled is not None:
+        settings["enabled"] = bool(enabled)
+    if log_path is not None:
+        settings["log_path"] = log_path
+    if prom_path is not None:
+        settings["prom_path"] = prom_path
+    if profile is not None:
+        settings["profile"] = _profile_set(profile)
+    return settings
+
+
+def _profile_set(value):
+    if isinstance(value, str):
+        value = [name.strip() for name in value.split(",")]
+    return {name for name in value if name}
+
+
+def _settings():
+    if not _config:
+        _config.update({
+            "enabled": os.getenv(ENABLED_ENV, "0").lower() in ("1", "true", "yes"),
+            "log_path": os.getenv(LOG_ENV, LOG_PATH),
+            "prom_path": os.getenv(PROM_ENV, PROM_PATH),
+            "profile": _profile_set(os.getenv(PROFILE_ENV, "")),
+        })
+    return _config
+
+
+def enabled():
+    return _settings()["enabled"]
+
+
+class StageRecord:
+    """Measurements of one stage run; set `rows_in` / `rows_out` or `add(...)` extra fields inside the block."""
+
+    def __init__(self, name, rows_in=None, labels=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.bytes_scanned = 0
+        self.labels = labels or {}
+        self.extra = {}
+
+    def add(self, **fields):
+        self.extra.update(fields)
+
+    def scanned(self, n_bytes):
+        self.bytes_scanned += int(n_bytes or 0)
+
+
+class _NullRecord(StageRecord):
+    """What `stage()` yields while instrumentation is off: accepts everything, keeps nothing."""
+
+    name = rows_in = rows_out = None
+    bytes_scanned = 0
+    labels = extra = {}
+
+    def __setattr__(self, name, value):
+        pass
+
+    def add(self, **fields):
+        pass
+
+    def scanned(self, n_bytes):
+        pass
+
+
+_NULL = _NullRecord.__new__(_NullRecord)
+
+
+def record_bytes_scanned(n_bytes):
+    """Called by storage backends: credits scanned bytes to every stage running in this thread."""
+    for record in getattr(_active, "stack", ()):
+        record.scanned(n_bytes)
+
+
+def _peak_rss_bytes():
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux (bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _rss_bytes():
+    """Current resident set size (Linux `/proc`; None elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _difference(end, start):
+    return None if end is None or start is None else end - start
+
+
+@contextmanager
+def stage(name, rows_in=None, **labels):
+    """
+    ⏱️ Measures the enclosed block as stage `name`.
+
+        with stage("compute_indicators", rows_in=len(prices)) as record:
+            df = ...
+            record.rows_out = len(df)
+    """
+    settings = _settings()
+    if not settings["enabled"]:
+        yield _NULL
+        return
+
+    record = StageRecord(name, rows_in, labels)
+    stack = _active.__dict__.setdefault("stack", [])
+    stack.append(record)
+    profiler = cProfile.Profile() if name in settings["profile"] or "all" in settings["profile"] else None
+
+    started_at = pd.Timestamp.now(tz="UTC")
+    memory = (_rss_bytes(), _peak_rss_bytes())
+    wall, cpu = time.perf_counter(), time.process_time()
+    error = None
+    if profiler:
+        profiler.enable()
+    try:
+        yield record
+    except BaseException as exc:
+        error = exc
+        raise
+    finally:
+        if profiler:
+            profiler.disable()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        stack.remove(record)
+        _finish(record, settings, started_at, wall, cpu, memory, error, profiler)
+
+
+def instrument(name=None, rows_in=None):
+    """
+    Decorator form of `stage`. `rows_in` names the argument whose `len()` is the input row
+    count; the result's `len()` (or the result itself, if it is an int) is the output count.
+    """
+    def decorate(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _settings()["enabled"]:
+                return func(*args, **kwargs)
+
+            n_in = None
+            if rows_in is not None:
+                bound = inspect.signature(func).bind_partial(*args, **kwargs)
+                value = bound.arguments.get(rows_in)
+                n_in = len(value) if hasattr(value, "__len__") else None
+
+            with stage(stage_name, rows_in=n_in) as record:
+                result = func(*args, **kwargs)
+                if isinstance(result, int) and not isinstance(result, bool):
+                    record.rows_out = result
+                elif hasattr(result, "__len__") and not isinstance(result, (str, bytes, dict, tuple)):
+                    record.rows_out = len(result)
+                return result
+        return wrapper
+    return decorate
+
+
+def _finish(record, settings, started_at, wall, cpu, memory, error, profiler):
+    rows = record.rows_out if record.rows_out is not None else record.rows_in
+    rss_start, peak_start = memory
+    peak = _peak_rss_bytes()
+    entry = {
+        "stage": record.name,
+        "status": "error" if error else "ok",
+        "pid": os.getpid(),
+        "started_at": started_at.isoformat(),
+        "ended_at": (started_at + pd.Timedelta(seconds=wall)).isoformat(),
+        "wall_seconds": round(wall, 6),
+        "cpu_seconds": round(cpu, 6),
+        "rss_delta_bytes": _difference(_rss_bytes(), rss_start),
+        "peak_rss_growth_bytes": _difference(peak, peak_start),   # 0: the stage stayed under an earlier peak
+        "process_peak_rss_bytes": peak,   # ru_maxrss: process lifetime, not this stage
+        "rows_in": record.rows_in,
+        "rows_out": record.rows_out,
+        "rows_per_second": round(rows / wall, 3) if rows is not None and wall > 0 else None,
+        "bytes_scanned": record.bytes_scanned,
+        **({"labels": record.labels} if record.labels else {}),
+        **record.extra,
+    }
+    if error is not None:
+        entry["error"] = f"{type(error).__name__}: {error}"
+
+    if profiler:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        entry["profile"] = os.path.join(
+            PROFILE_DIR, f"{record.name}-{started_at.strftime('%Y%m%dT%H%M%S%f')}-{os.getpid()}.prof"
+        )
+        profiler.dump_stats(entry["profile"])
+
+    with _lock:
+        _append_log(settings["log_path"], entry)
+        with _file_lock(settings["prom_path"]):
+            totals = _read_prometheus(settings["prom_path"])
+            _update_totals(totals, entry)
+            _write_prometheus(settings["prom_path"], totals)
+
+
+def _append_log(path, entry):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(entry, default=str) + "\n")
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive lock on `<path>.lock`, held while the totals file is read and rewritten."""
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _series(entry):
+    """Prometheus series of a log entry: its sorted (label, value) pairs, `stage` first."""
+    labels = {str(k): str(v) for k, v in entry.get("labels", {}).items() if k != "stage"}
+    return (("stage", entry["stage"]),) + tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _unescape(value):
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), value)
+
+
+def _read_prometheus(path):
+    """The totals already in the Prometheus file: series -> {metric name: value} (unknown metrics dropped)."""
+    known = {name for name, *_ in PROM_METRICS}
+    totals = {}
+    try:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return totals
+    for line in lines:
+        match = _PROM_SAMPLE.match(line)
+        if match and match.group(1) in known:
+            name, labels, value = match.groups()
+            labels = {key: _unescape(val) for key, val in _PROM_LABEL.findall(labels)}
+            if "stage" not in labels:
+                continue
+            series = _series({"stage": labels.pop("stage"), "labels": labels})
+            totals.setdefault(series, {metric: 0 for metric in known})[name] = float(value)
+    return totals
+
+
+def _update_totals(all_totals, entry):
+    totals = all_totals.setdefault(_series(entry), {name: 0 for name, *_ in PROM_METRICS})
+    totals["magician_stage_runs_total"] += 1
+    totals["magician_stage_errors_total"] += entry["status"] == "error"
+    for name, kind, _, field in PROM_METRICS:
+        value = entry.get(field) if field else None
+        if value is None:
+            continue
+        totals[name] = totals[name] + value if kind == "counter" else value
+
+
+def _write_prometheus(path, all_totals):
+    lines = []
+    for name, kind, help_text, _ in PROM_METRICS:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for series, totals in sorted(all_totals.items()):
+            labels = ",".join(f'{key}="{_escape(value)}"' for key, value in series)
+            lines.append(f"{name}{{{labels}}} {totals[name]:.15g}")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, path)
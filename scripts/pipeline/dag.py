@@ -0,0 +1,242 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+import inspect
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import pandas as pd
+from scripts.models.registry import data_fingerprint
+from scripts.monitoring.instrumentation import stage as instrumented_stage
+
+# 📂 Stage outputs: <CACHE_ROOT>/<stage>/<key>.{parquet,pkl} + <key>.json (metadata)
+CACHE_ROOT = "pipeline_cache"
+KEEP_PER_STAGE = 5   # Cached outputs kept per stage (older keys are pruned)
+
+
+def output_fingerprint(value):
+    """Content hash of a stage output: DataFrames by column bytes, everything else by pickle."""
+    if isinstance(value, pd.DataFrame):
+        return data_fingerprint(value)
+    return hashlib.blake2b(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), digest_size=20).hexdigest()
+
+
+class Stage:
+    """
+    One node of the pipeline.
+
+    Args:
+        name (str): Unique stage name (also the cache directory).
+        func (callable): Called as `func(**inputs, **params)`.
+        inputs (dict): Argument name -> upstream stage name.
+        params (dict): Settings passed to `func`; part of the cache key (must be JSON-able).
+        code (tuple): Extra modules/functions whose source is part of the cache key, so editing
+            the code a stage calls invalidates its cached output.
+        version (str): Manual bump for changes the source hash can't see.
+        always_run (bool): Re-run every time (e.g. pulls from an external source). Dependents
+            still hit their caches when the fresh output has the same content as before.
+    """
+
+    def __init__(self, name, func, inputs=None, params=None, code=(), version="1", always_run=False):
+        self.name = name
+        self.func = func
+        self.inputs = dict(inputs or {})
+        self.params = dict(params or {})
+        self.code = tuple(code)
+        self.version = version
+        self.always_run = always_run
+        self._code_version = None
+
+    def code_version(self):
+        if self._code_version is None:
+            h = hashlib.sha256(self.version.encode())
+            for obj in (self.func, *self.code):
+                h.update(inspect.getsource(obj).encode())
+            self._code_version = h.hexdigest()
+        return self._code_version
+
+    def key(self, input_fingerprints):
+        payload = {
+            "stage": self.name,
+            "code": self.code_version(),
+            "params": self.params,
+            "inputs": {arg: input_fingerprints[arg] for arg in sorted(self.inputs)},
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=repr).encode()).hexdigest()
+
+
+class StageRun:
+    """Outcome of one stage: its cache key, output fingerprint and (lazily loaded) output."""
+
+    def __init__(self, name, key, fingerprint, status, seconds, path, value=None, loaded=False):
+        self.name = name
+        self.key = key
+        self.fingerprint = fingerprint
+        self.status = status          # "ran" or "cached"
+        self.seconds = seconds
+        self.path = path
+        self._value = value
+        self._loaded = loaded
+        self._lock = threading.Lock()
+
+    @property
+    def value(self):
+        """The stage output; cached outputs are only read from disk when someone asks for them."""
+        with self._lock:
+            if not self._loaded:
+                self._value = StageCache.load(self.path)
+                self._loaded = True
+            return self._value
+
+    def __repr__(self):
+        return f"StageRun({self.name!r}, {self.status}, key={self.key[:12]}, {self.seconds:.2f}s)"
+
+
+class StageCache:
+    """Stage outputs on disk, one directory per stage, addressed by cache key."""
+
+    def __init__(self, root=CACHE_ROOT, keep=KEEP_PER_STAGE):
+        self.root = root
+        self.keep = keep
+
+    def _meta_path(self, stage_name, key):
+        return os.path.join(self.root, stage_name, f"{key}.json")
+
+    def lookup(self, stage_name, key):
+        """Metadata of a cached output, or None."""
+        meta_path = self._meta_path(stage_name, key)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        return meta if os.path.exists(meta["path"]) else None
+
+    def save(self, stage_name, key, value, fingerprint, seconds):
+        stage_dir = os.path.join(self.root, stage_name)
+        os.makedirs(stage_dir, exist_ok=True)
+        if isinstance(value, pd.DataFrame):
+            path = os.path.join(stage_dir, f"{key}.parquet")
+            value.to_parquet(f"{path}.tmp", index=False)
+        else:
+            path = os.path.join(stage_dir, f"{key}.pkl")
+            with open(f"{path}.tmp", "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{path}.tmp", path)
+
+        meta = {
+            "stage": stage_name,
+            "key": key,
+            "path": path,
+            "fingerprint": fingerprint,
+            "seconds": seconds,
+            "created_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        }
+        meta_path = self._meta_path(stage_name, key)
+        with open(f"{meta_path}.tmp", "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(f"{meta_path}.tmp", meta_path)
+        self.prune(stage_name)
+        return meta
+
+    def prune(self, stage_name):
+        """Keeps the `keep` most recently written outputs of a stage."""
+        stage_dir = os.path.join(self.root, stage_name)
+        metas = sorted(
+            (os.path.join(stage_dir, name) for name in os.listdir(stage_dir) if name.endswith(".json")),
+            key=os.path.getmtime,
+            reverse=True,
+        )
+        for meta_path in metas[self.keep:]:
+            with open(meta_path) as f:
+                path = json.load(f)["path"]
+            for stale in (path, meta_path):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+    @staticmethod
+    def load(path):
+        if path.endswith(".parquet"):
+            return pd.read_parquet(path)
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+
+class Pipeline:
+    """
+    🕸️ **Cached DAG runner**
+
+    Stages declare their inputs (upstream stages) and parameters. A stage's cache key hashes
+    its name, code version, parameters and the *content* fingerprints of its inputs; when the
+    key is already cached the stage is skipped (and its output isn't even loaded unless a
+    stage that does run needs it). Stages whose inputs are ready run concurrently on a thread
+    pool.
+    """
+
+    def __init__(self, stages, cache=None, max_workers=None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache = cache or StageCache()
+        self.max_workers = max_workers
+        for stage in stages:
+            missing = [up for up in stage.inputs.values() if up not in self.stages]
+            if missing:
+                raise ValueError(f"🚨 Stage '{stage.name}' depends on unknown stage(s) {missing}")
+
+    def upstream(self, targets):
+        """`targets` plus everything they depend on."""
+        needed, todo = set(), list(targets)
+        while todo:
+            name = todo.pop()
+            if name not in self.stages:
+                raise ValueError(f"🤨 Unknown stage '{name}'. Stages: {list(self.stages)}")
+            if name not in needed:
+                needed.add(name)
+                todo.extend(self.stages[name].inputs.values())
+        return needed
+
+    def run(self, targets=None, force=()):
+        """
+        Runs `targets` (default: every stage) and whatever they need.
+
+        Args:
+            force (iterable): Stage names to re-run even on a cache hit.
+
+        Returns:
+            dict: Stage name -> StageRun.
+        """
+        needed = self.upstream(targets or list(self.stages))
+        force = set(force)
+        waiting = {name: set(self.stages[name].inputs.values()) for name in needed}
+        runs, futures = {}, {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while waiting or futures:
+                for name in [name for name, deps in waiting.items() if deps <= runs.keys()]:
+                    del waiting[name]
+                    futures[pool.submit(self._run_stage, self.stages[name], runs, name in force)] = name
+                if not futures:
+                    raise RuntimeError(f"🚨 Dependency cycle between stages {sorted(waiting)}")
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures.pop(future)
+                    runs[name] = future.result()   # A failing stage stops the run (re-raised here)
+                    print(f"{'♻️' if runs[name].status == 'cached' else '✅'} {name}: {runs[name].status} "
+                          f"({runs[name].seconds:.2f}s)")
+        return runs
+
+    def _run_stage(self, stage, runs, force):
+        inputs = {arg: runs[upstream] for arg, upstream in stage.inputs.items()}
+        key = stage.key({arg: run.fingerprint for arg, run in inputs.items()})
+
+        meta = None if (force or stage.always_run) else self.cache.lookup(stage.name, key)
+        if meta is not None:
+            return StageRun(stage.name, key, meta["fingerprint"], "cached", 0.0, meta["path"])
+
+        started = time.perf_counter()
+        with instrumented_stage(f"pipeline.{stage.name}"):
+            value = stage.func(**{arg: run.value for arg, run in inputs.items()}, **stage.params)
+        seconds = time.perf_counter() - started
+        fingerprint = output_fingerprint(value)
+        meta = self.cache.save(stage.name, key, value, fingerprint, seconds)
+        return StageRun(stage.name, key, fingerprint, "ran", seconds, meta["path"], value, loaded=True)
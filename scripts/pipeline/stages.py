@@ -0,0 +1,111 @@
+"""
+🏭 The magician pipeline as a cached DAG:
+
+    ingest ─▶ indicators ─┬─▶ upload_indicators
+                          ├─▶ timeframes ─┬─▶ upload_timeframes
+                          │               └─▶ train
+                          └───────────────────▶ train
+
+CLI: `python -m scripts.pipeline.stages [train] [--model hist_gradient_boosting] [--force indicators]`
+"""
+import os
+import argparse
+from scripts.data_processing import load_data as load_data_module
+from scripts.data_processing.fetch_prices import PRICE_STORE_ROOT, sync_prices
+from scripts.data_processing.storage import BACKEND_ENV, cache_root, get_backend
+from scripts.indicators import compute_indicators as compute_module
+from scripts.indicators import panel, registry, schema, timeframes as timeframes_module
+from scripts.indicators.feature_store import FeatureStore
+from scripts.models import base_model, random_forest, walk_forward, xgboost_model
+from scripts.models import train as train_module
+from scripts.pipeline.dag import Pipeline, Stage
+
+# 🧩 Stage targets the CLI accepts
+TARGETS = ["ingest", "indicators", "upload_indicators", "timeframes", "upload_timeframes", "train"]
+
+
+def ingest(backend):
+    """
+    Incremental price sync (always runs). Returns the local price cache's root and manifest
+    fingerprint instead of the bars: nothing is copied into the stage cache, and a sync that
+    stored no new bars keeps every downstream cache valid.
+    """
+    backend = get_backend(backend)
+    store = FeatureStore(cache_root(PRICE_STORE_ROOT, backend))
+    new_rows = sync_prices(backend=backend, store=store)
+    print(f"📡 Pulled {len(new_rows)} new hourly bars.")
+    return {"root": store.root, "fingerprint": store.fingerprint()}
+
+
+def indicators(prices):
+    """Indicators over the price cache that `ingest` synced."""
+    history = schema.apply_schema(FeatureStore(prices["root"]).read(), schema.PRICE_SCHEMA)
+    return compute_module.compute_indicators(history)
+
+
+def upload_indicators(indicators, backend):
+    return compute_module.upload_indicators(indicators, get_backend(backend))
+
+
+def timeframes(indicators, model):
+    return compute_module.compute_optimal_timeframes(indicators, model=model)
+
+
+def upload_timeframes(timeframes, backend):
+    return compute_module.upload_optimal_timeframes(timeframes, get_backend(backend))
+
+
+def train(indicators, timeframes, model_name, backend):
+    """Targets from each asset's best timeframe, chronological split, fit, score and log."""
+    dataset = load_data_module.add_targets(indicators, timeframes)
+    metrics = train_module.train_and_evaluate(model_name, *load_data_module.split_data(dataset))
+    train_module.log_metrics(metrics, get_backend(backend))
+    return metrics
+
+
+def build_pipeline(model_name=None, timeframe_model=None, backend=None, max_workers=None):
+    """
+    The pipeline with its parameters resolved (defaults: `MODEL_NAME`, `TIMEFRAME_MODEL` and
+    `MAGICIAN_BACKEND`), so a config change shows up in exactly the stage keys it affects.
+    """
+    backend = (backend or os.getenv(BACKEND_ENV) or "bigquery").lower()
+    model_name = model_name or os.getenv("MODEL_NAME", "random_forest")
+    timeframe_model = timeframe_model or os.getenv("TIMEFRAME_MODEL", "random_forest")
+
+    return Pipeline([
+        Stage("ingest", ingest, params={"backend": backend}, always_run=True),
+        Stage("indicators", indicators, inputs={"prices": "ingest"},
+              code=(compute_module.compute_indicators, panel, registry, schema), version=str(schema.SCHEMA_VERSION)),
+        Stage("upload_indicators", upload_indicators, inputs={"indicators": "indicators"},
+              params={"backend": backend}),
+        Stage("timeframes", timeframes, inputs={"indicators": "indicators"},
+              params={"model": timeframe_model}, code=(compute_module.compute_optimal_timeframes, timeframes_module)),
+        Stage("upload_timeframes", upload_timeframes, inputs={"timeframes": "timeframes"},
+              params={"backend": backend}),
+        Stage("train", train, inputs={"indicators": "indicators", "timeframes": "timeframes"},
+              params={"model_name": model_name, "backend": backend},
+              code=(load_data_module.add_targets, load_data_module.split_data, train_module.train_and_evaluate,
+                    base_model, random_forest, xgboost_model, walk_forward)),
+    ], max_workers=max_workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the cached magician pipeline.")
+    parser.add_argument("targets", nargs="*", help=f"Stages to bring up to date, from {TARGETS} (default: all)")
+    parser.add_argument("--model", default=None, help="Model to train (default: MODEL_NAME or random_forest)")
+    parser.add_argument("--timeframe-model", default=None, help="Learner for the timeframe search")
+    parser.add_argument("--backend", default=None, help="bigquery or local (default: MAGICIAN_BACKEND)")
+    parser.add_argument("--force", default="", help="Comma-separated stages to re-run regardless of the cache")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("GOOGLE_APPLICATION_CREDENTIALS", compute_module.CREDENTIALS_PATH)
+    pipeline = build_pipeline(args.model, args.timeframe_model, args.backend, args.workers)
+    runs = pipeline.run(args.targets or None, force=[s for s in args.force.split(",") if s])
+    ran = [name for name, run in runs.items() if run.status == "ran"]
+    print(f"🏁 Pipeline done: {len(ran)} stage(s) ran {ran}, {len(runs) - len(ran)} came from the cache.")
+    return runs
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+⏱️ Cold-load benchmark: pickled forests vs the memory-mappable format.
+
+Trains one forest per horizon on synthetic data, saves each with `BaseModel.save_model`, then
+loads all of them in a fresh process per format and reports load time and memory:
+  - RssAnon: private memory (what every worker pays for its own copy)
+  - RssFile: file-backed pages (mapped artifacts; shared through the page cache)
+both right after loading and after a first 256-row prediction (which pages in the visited nodes).
+
+Run: `python -m scripts.test.forest_load_benchmark [n_rows] [n_trees]`
+"""
+import os
+import sys
+import time
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+
+HORIZONS = [1, 3, 6, 12, 24, 48]
+
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        fields = dict(line.split(":", 1) for line in f)
+    return {name: int(fields[name].split()[0]) for name in ("RssAnon", "RssFile")}
+
+
+def synthetic_data(n_rows, n_features=20, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n_rows, n_features)).astype(np.float32),
+                     columns=[f"f{i}" for i in range(n_features)])
+    return X, rng
+
+
+def train_all(n_rows, n_trees):
+    from scripts.models.random_forest import RandomForestModel
+    X, rng = synthetic_data(n_rows)
+    for horizon in HORIZONS:
+        y = X["f0"] * horizon + X["f1"] ** 2 + rng.normal(size=n_rows)
+        model = RandomForestModel(n_estimators=n_trees)
+        model.model_name = f"random_forest_{horizon}h"
+        model.model.fit(X, y)
+        model.save_model()
+
+
+def load_all(fmt):
+    """Child process: load every horizon's model and print one CSV line of measurements."""
+    from scripts.models.random_forest import RandomForestModel
+    before = rss_kb()
+    start = time.perf_counter()
+    models = []
+    for horizon in HORIZONS:
+        model = RandomForestModel()
+        model.model_name = f"random_forest_{horizon}h"
+        models.append(model.load_model(mmap=(fmt == "mmap")))
+    load_s = time.perf_counter() - start
+    after_load = rss_kb()
+
+    X, _ = synthetic_data(256, seed=1)
+    start = time.perf_counter()
+    predictions = np.column_stack([m.predict(X) for m in models])
+    predict_s = time.perf_counter() - start
+    after_predict = rss_kb()
+    np.save(f"predictions_{fmt}.npy", predictions)
+
+    print(",".join(str(v) for v in [
+        fmt, load_s, predict_s,
+        (after_load["RssAnon"] - before["RssAnon"]) / 1024,
+        (after_load["RssFile"] - before["RssFile"]) / 1024,
+        (after_predict["RssAnon"] - before["RssAnon"]) / 1024,
+        (after_predict["RssFile"] - before["RssFile"]) / 1024,
+    ]))
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 4400
+    n_trees = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        print(f"🌲 Training {len(HORIZONS)} forests x {n_trees} trees on {n_rows} rows...")
+        train_all(n_rows, n_trees)
+
+        pickle_mb = sum(os.path.getsize(f"models/random_forest_{h}h.pkl") for h in HORIZONS) / 1e6
+        forest_mb = sum(
+            os.path.getsize(os.path.join(root, name))
+            for h in HORIZONS for root, _, files in os.walk(f"models/random_forest_{h}h.forest") for name in files
+        ) / 1e6
+        print(f"💾 On disk: pickle {pickle_mb:.1f} MB, mmap format {forest_mb:.1f} MB")
+
+        rows = []
+        env = {**os.environ, "PYTHONPATH": repo_root}
+        for fmt in ("pickle", "mmap"):
+            out = subprocess.run(
+                [sys.executable, "-c", f"from scripts.test.forest_load_benchmark import load_all; load_all({fmt!r})"],
+                capture_output=True, text=True, check=True, env=env,
+            ).stdout.strip().splitlines()[-1]
+            rows.append(out.split(","))
+
+        results = pd.DataFrame(rows, columns=[
+            "format", "load_s", "predict_256_s", "load_anon_mb", "load_file_mb", "predict_anon_mb", "predict_file_mb",
+        ])
+        results[results.columns[1:]] = results[results.columns[1:]].astype(float).round(3)
+        print(results.to_string(index=False))
+
+        same = np.allclose(np.load("predictions_pickle.npy"), np.load("predictions_mmap.npy"), rtol=1e-12, atol=1e-12)
+        if not same:
+            raise SystemExit("❌ Memory-mapped predictions differ from the pickled forests!")
+        print("✅ Memory-mapped forests predict the same values as the pickled ones.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+🗂️ Indicator cache check (offline, local warehouse, temporary working directory).
+
+1. A change to one asset's partitions only re-reads that asset into the memory-mapped Arrow
+   cache, and only once a read asks for it; every other asset is served from the cache.
+2. A refresh picks up assets the warehouse has but the feature store has never seen.
+
+Run: `python -m scripts.test.indicator_cache`
+"""
+import os
+import tempfile
+import pandas as pd
+from scripts.benchmarks.synthetic import synthetic_prices
+from scripts.data_processing.storage import LocalBackend, cache_root
+from scripts.indicators.feature_store import STORE_ROOT, FeatureStore
+from scripts.indicators.panel import compute_panel_indicators
+from scripts.indicators.setup_indicators import TECHNICALS_TABLE, load_indicators
+
+NEVER_STALE = pd.Timedelta(days=365 * 100)
+ALWAYS_STALE = pd.Timedelta(0)
+
+now = pd.Timestamp.now(tz="UTC").floor("h")
+technicals = compute_panel_indicators(synthetic_prices(5, 24 * 40, end=now, seed=4)).dropna()
+technicals["asset"] = technicals["asset"].astype(str)
+listed, new_listing = technicals[technicals["asset"] != "SYN004"], technicals[technicals["asset"] == "SYN004"]
+
+reads = []
+store_read = FeatureStore.read
+
+
+def counting_read(self, columns=None, assets=None, start=None, end=None):
+    reads.append(assets)
+    return store_read(self, columns=columns, assets=assets, start=start, end=end)
+
+
+FeatureStore.read = counting_read
+
+home = os.getcwd()
+with tempfile.TemporaryDirectory() as workdir:
+    os.chdir(workdir)   # The store and the Arrow cache live under relative paths
+    backend = LocalBackend(os.path.join(workdir, "warehouse"))
+    backend.write(listed, TECHNICALS_TABLE)
+
+    print("🔍 Arrow cache rebuilds only the assets that changed...")
+    first = load_indicators(max_age=NEVER_STALE, backend=backend)
+    assert sorted(first["asset"].unique()) == ["SYN000", "SYN001", "SYN002", "SYN003"]
+
+    store = FeatureStore(cache_root(STORE_ROOT, backend))
+    changed = store_read(store, assets="SYN001")
+    changed["rsi_14"] = 50.0
+    store.write(changed)
+
+    reads.clear()
+    other = load_indicators(assets="SYN002", max_age=NEVER_STALE, backend=backend)
+    assert reads == [], f"an unchanged asset was re-read: {reads}"
+    one = load_indicators(assets="SYN001", max_age=NEVER_STALE, backend=backend)
+    assert reads == [["SYN001"]], reads
+    assert (one["rsi_14"] == 50.0).all() and len(other) == (listed["asset"] == "SYN002").sum()
+    full = load_indicators(max_age=NEVER_STALE, backend=backend)
+    assert reads == [["SYN001"]] and len(full) == len(listed), reads
+    print(f"✅ Only SYN001 was re-read ({len(one)} rows); the other {len(full) - len(one)} rows came from the cache.")
+
+    print("🔍 A refresh finds assets the store has never seen...")
+    backend.append(new_listing, TECHNICALS_TABLE)
+    refreshed = load_indicators(max_age=ALWAYS_STALE, backend=backend)
+    assert "SYN004" in FeatureStore(store.root).assets()
+    assert (refreshed["asset"] == "SYN004").sum() == len(new_listing) and len(refreshed) == len(technicals)
+    print(f"✅ SYN004 joined the store with {len(new_listing)} rows.")
+    os.chdir(home)
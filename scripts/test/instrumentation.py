@@ -0,0 +1,87 @@
+"""
+📈 Stage-instrumentation check (offline, temporary metrics files).
+
+1. Record labels (e.g. `model=`) become Prometheus labels: one series per stage and label
+   set, with quotes and backslashes escaped, read back intact on the next write.
+2. Memory is measured per stage: a stage that allocates ~64 MB reports it in
+   `rss_delta_bytes` and `peak_rss_growth_bytes`; a stage that allocates nothing doesn't.
+3. Errors are counted, and several processes writing at once add up their counters.
+
+Run: `python -m scripts.test.instrumentation`
+"""
+import os
+import sys
+import json
+import tempfile
+import subprocess
+import numpy as np
+from scripts.monitoring.instrumentation import _read_prometheus, configure, instrument, stage
+
+MB = 1024 ** 2
+WORKERS, RUNS_PER_WORKER = 4, 25
+WEIRD_MODEL = 'forest "v2" \\ test'
+
+WORKER = f"""
+from scripts.monitoring.instrumentation import configure, stage
+configure(enabled=True, log_path={{log!r}}, prom_path={{prom!r}}, profile="")
+for _ in range({RUNS_PER_WORKER}):
+    with stage("predict", rows_in=10, model="random_forest") as record:
+        record.rows_out = 10
+"""
+
+
+@instrument("load", rows_in="rows")
+def load(rows):
+    return list(rows)
+
+
+with tempfile.TemporaryDirectory() as workdir:
+    log_path = os.path.join(workdir, "stages.jsonl")
+    prom_path = os.path.join(workdir, "magician.prom")
+    configure(enabled=True, log_path=log_path, prom_path=prom_path, profile="")
+
+    print("🔍 Labels and per-stage memory...")
+    with stage("fit", rows_in=1_000, model="random_forest"):
+        block = np.ones(64 * MB // 8)   # Touched, so it is resident
+    with stage("fit", rows_in=1_000, model="random_forest"):
+        pass
+    with stage("fit", rows_in=1_000, model=WEIRD_MODEL):
+        pass
+    load(range(50))
+    try:
+        with stage("fit", model="random_forest"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    with open(log_path) as f:
+        entries = [json.loads(line) for line in f]
+    big, small = entries[0], entries[1]
+    assert big["labels"] == {"model": "random_forest"}, big
+    assert big["rss_delta_bytes"] >= 48 * MB and big["peak_rss_growth_bytes"] >= 48 * MB, big
+    assert small["peak_rss_growth_bytes"] == 0 and abs(small["rss_delta_bytes"]) < 8 * MB, small
+    print(f"  allocating stage: +{big['rss_delta_bytes'] / MB:.0f} MB RSS, "
+          f"peak +{big['peak_rss_growth_bytes'] / MB:.0f} MB; empty stage: peak +0 MB")
+    del block
+
+    totals = _read_prometheus(prom_path)
+    forest = totals[(("stage", "fit"), ("model", "random_forest"))]
+    assert forest["magician_stage_runs_total"] == 3 and forest["magician_stage_errors_total"] == 1, forest
+    assert forest["magician_stage_rows_in_total"] == 2_000, forest
+    assert totals[(("stage", "fit"), ("model", WEIRD_MODEL))]["magician_stage_runs_total"] == 1
+    assert totals[(("stage", "load"),)]["magician_stage_rows_out_total"] == 50
+    with open(prom_path) as f:
+        text = f.read()
+    assert 'magician_stage_runs_total{stage="fit",model="random_forest"} 3' in text, text
+    print("✅ Labels are kept as Prometheus labels (escaped), and each stage reports its own memory.")
+
+    print(f"🔍 {WORKERS} processes writing at once...")
+    workers = [subprocess.Popen([sys.executable, "-c", WORKER.format(log=log_path, prom=prom_path)],
+                                cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+               for _ in range(WORKERS)]
+    assert all(worker.wait() == 0 for worker in workers)
+    predict = _read_prometheus(prom_path)[(("stage", "predict"), ("model", "random_forest"))]
+    assert predict["magician_stage_runs_total"] == WORKERS * RUNS_PER_WORKER, predict
+    assert predict["magician_stage_rows_out_total"] == WORKERS * RUNS_PER_WORKER * 10, predict
+    assert _read_prometheus(prom_path)[(("stage", "fit"), ("model", "random_forest"))] == forest
+    print(f"✅ {WORKERS * RUNS_PER_WORKER} runs from {WORKERS} processes all counted; earlier series untouched.")
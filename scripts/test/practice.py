@@ -1,6 +1,8 @@
-from scripts.indicators.compute_indicators import get_optimal_timeframe
+from scripts.indicators.timeframes import search_timeframes
+from scripts.indicators.setup_indicators import load_indicators
 from sklearn.model_selection import train_test_split
 
 print("🔍 Running quick test...")
-df = get_optimal_timeframe()
+df, best = search_timeframes(load_indicators(assets="BTC"))
 print(df.head())  # See if we get meaningful output
+print(f"🏆 Best timeframe: {best}")
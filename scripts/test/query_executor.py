@@ -0,0 +1,96 @@
+"""
+⚡ Concurrent query executor check.
+
+Runs a batch of queries against a fake backend with fixed latencies, transient failures
+and a hung query, then the same executor against the local DuckDB backend.
+
+Run: `python -m scripts.test.query_executor`
+"""
+import os
+import time
+import asyncio
+import tempfile
+import threading
+import pandas as pd
+from scripts.benchmarks.synthetic import synthetic_prices
+from scripts.data_processing.query_executor import QueryExecutor, run_queries
+from scripts.data_processing.storage import LocalBackend
+
+
+class FakeBackend:
+    """
+    🧪 Stand-in client: each query is `<seconds>` or `<seconds>:<failures>`. It sleeps that
+    long, and raises a ConnectionError for its first `failures` attempts.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.in_flight = self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def query(self, sql):
+        seconds, _, failures = sql.partition(":")
+        with self._lock:
+            self.calls[sql] = self.calls.get(sql, 0) + 1
+            attempt = self.calls[sql]
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(float(seconds))
+            if attempt <= int(failures or 0):
+                raise ConnectionError(f"flaky attempt {attempt}")
+            return pd.DataFrame({"seconds": [float(seconds)]})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+print("🔍 Fake backend: 12 queries of 0.1-0.5s...")
+queries = {f"q{i}": str(0.1 + 0.4 * (i % 5) / 4) for i in range(12)}
+serial = sum(float(sql) for sql in queries.values())
+fake = FakeBackend()
+started = time.perf_counter()
+results = run_queries(queries, fake, max_concurrency=16)
+wall = time.perf_counter() - started
+assert all(r.ok for r in results.values()) and list(results) == list(queries)
+print(f"  {wall:.2f}s wall vs {serial:.2f}s one after another (slowest query: 0.50s)")
+assert wall < 0.5 * serial
+
+fake = FakeBackend()
+run_queries(queries, fake, max_concurrency=3)
+assert fake.max_in_flight == 3, fake.max_in_flight
+print("✅ Concurrency is bounded.")
+
+print("🔍 Retries, timeouts and completion order...")
+fake = FakeBackend()
+executor = QueryExecutor(fake, timeout=0.3, retries=2, backoff=0.01)
+results = executor.run({"flaky": "0.05:2", "broken": "0.05:5", "hung": "1.0", "fast": "0.01"})
+assert results["flaky"].ok and results["flaky"].attempts == 3
+assert not results["broken"].ok and results["broken"].attempts == 3
+assert isinstance(results["hung"].error, TimeoutError) and results["hung"].attempts == 1   # Never resubmitted
+for result in results.values():
+    print(f"  {result}")
+
+
+async def completion_order():
+    return [r.name async for r in QueryExecutor(FakeBackend()).as_completed({"slow": "0.3", "quick": "0.05"})]
+
+
+assert asyncio.run(completion_order()) == ["quick", "slow"]
+print("✅ Transient failures retried, hung query timed out without a retry, results streamed as they finish.")
+
+print("🔍 Local DuckDB backend, 8 queries at once...")
+with tempfile.TemporaryDirectory() as workdir:
+    backend = LocalBackend(os.path.join(workdir, "warehouse"))
+    table = "proj.dataset.prices"
+    backend.write(synthetic_prices(8, 2000), table)
+    queries = {
+        f"SYN{i:03d}": f"SELECT COUNT(*) AS n, MAX(close_price) AS high FROM `{table}` WHERE asset = 'SYN{i:03d}'"
+        for i in range(8)
+    }
+    concurrent = run_queries(queries, backend)
+    sequential = {name: backend.query(sql) for name, sql in queries.items()}
+    for name, result in concurrent.items():
+        assert result.ok, result
+        pd.testing.assert_frame_equal(result.df, sequential[name])
+print("✅ Concurrent local queries match the sequential ones.")
@@ -0,0 +1,27 @@
+"""
+📐 Compact-schema check (offline, on synthetic prices).
+
+Computes the indicators in float64 for 20 synthetic assets × 90 days, casts them to
+`INDICATOR_SCHEMA` and checks every float32 column against its float64 original.
+
+Run: `python -m scripts.test.schema_tolerance`
+"""
+from scripts.benchmarks.synthetic import synthetic_prices
+from scripts.indicators.panel import compute_panel_indicators
+from scripts.indicators.schema import apply_schema, compare_to_float64
+
+print("🔍 Checking the compact schema against float64...")
+# Reference: the old all-float64 frame with a plain object `asset` column
+reference = compute_panel_indicators(synthetic_prices(20, 24 * 90, seed=5).astype({"asset": object}))
+compact = apply_schema(reference)
+
+errors = compare_to_float64(reference, compact)
+print(errors.to_string(index=False))
+
+before = reference.memory_usage(deep=True).sum() / 1e6
+after = compact.memory_usage(deep=True).sum() / 1e6
+print(f"💾 {before:.1f} MB -> {after:.1f} MB ({after / before:.0%})")
+
+if not errors["ok"].all():
+    raise SystemExit("❌ Some float32 columns drifted past the tolerance!")
+print("✅ Every float32 column is within tolerance.")
@@ -0,0 +1,124 @@
+"""
+⚡ Prediction-server latency check.
+
+Trains a small forest per (asset, horizon) on synthetic data, then:
+  1. fires concurrent single-row requests from many threads at the in-process service
+     (they get coalesced into micro-batches) and reports p50/p99 latency,
+  2. repeats a few requests over HTTP and over a Unix socket,
+  3. exports per-(asset, horizon) forests from synthetic indicators the way training does and
+     serves them.
+
+Run: `python -m scripts.test.serving_latency [n_requests] [n_threads]`
+"""
+import os
+import sys
+import json
+import socket
+import tempfile
+import threading
+import urllib.request
+import numpy as np
+import pandas as pd
+from scripts.benchmarks.synthetic import synthetic_prices
+from scripts.indicators.panel import compute_panel_indicators
+from scripts.models.random_forest import RandomForestModel
+from scripts.models.serving import PredictionService, asset_model_name, make_http_server, make_unix_server
+from scripts.models.train import export_serving_models
+
+ASSETS = ["BTC", "ETH", "SOL"]
+HORIZONS = [1, 6, 24]
+N_FEATURES = 20
+
+
+def train_models(rng):
+    X = pd.DataFrame(rng.normal(size=(3000, N_FEATURES)).astype(np.float32),
+                     columns=[f"f{i}" for i in range(N_FEATURES)])
+    for asset in ASSETS:
+        for horizon in HORIZONS:
+            model = RandomForestModel(n_estimators=50, max_depth=12)
+            model.model_name = asset_model_name(asset, horizon)
+            model.model.fit(X, X["f0"] * horizon + rng.normal(size=len(X)))
+            model.save_model()
+
+
+def main():
+    n_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    n_threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    rng = np.random.default_rng(0)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        print(f"🌲 Training {len(ASSETS) * len(HORIZONS)} models...")
+        train_models(rng)
+        rows = rng.normal(size=(n_requests, N_FEATURES)).tolist()
+
+        with PredictionService() as service:
+            # Warm the cache so the numbers below are hot-path latencies
+            for asset in ASSETS:
+                for horizon in HORIZONS:
+                    service.predict(asset, horizon, rows[0])
+            service.latency.samples.clear()
+
+            print("🔮 Sequential single-row requests (BTC 6h)...")
+            for row in rows[:500]:
+                service.predict("BTC", 6, row)
+            print(json.dumps(service.stats()))
+            service.latency.samples.clear()
+            service.batch_sizes.clear()
+
+            print(f"🔮 {n_requests} single-row requests from {n_threads} threads...")
+            def client(worker):
+                for i in range(worker, n_requests, n_threads):
+                    service.predict(ASSETS[i % len(ASSETS)], HORIZONS[i % len(HORIZONS)], rows[i])
+            threads = [threading.Thread(target=client, args=(w,)) for w in range(n_threads)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            print(json.dumps(service.stats()))
+
+            expected = RandomForestModel()
+            expected.model_name = asset_model_name("ETH", 24)
+            expected.load_model(mmap=False)
+            assert np.isclose(service.predict("ETH", 24, rows[1]), expected.model.predict(
+                pd.DataFrame(rows[1:2], columns=expected.model.feature_names_in_).astype(np.float32))[0])
+
+            # A malformed row fails only its own request, not the rest of its micro-batch
+            futures = [service.submit("BTC", 6, row) for row in (rows[3], rows[4][:5], {"f0": 1.0}, rows[5])]
+            assert isinstance(futures[1].exception(), ValueError) and isinstance(futures[2].exception(), ValueError)
+            assert np.isclose(futures[3].result(), service.predict("BTC", 6, rows[5]))
+            futures[0].result()
+
+            http = make_http_server(service, "127.0.0.1:0")
+            threading.Thread(target=http.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{http.server_address[1]}"
+            body = json.dumps({"asset": "BTC", "horizon": 6, "features": rows[2]}).encode()
+            reply = json.loads(urllib.request.urlopen(urllib.request.Request(f"{url}/predict", body)).read())
+            print(f"🌐 HTTP: {reply}")
+            http.shutdown()
+
+            sock_path = os.path.join(workdir, "predict.sock")
+            unix = make_unix_server(service, sock_path)
+            threading.Thread(target=unix.serve_forever, daemon=True).start()
+            with socket.socket(socket.AF_UNIX) as conn:
+                conn.connect(sock_path)
+                stream = conn.makefile("rwb")
+                stream.write(json.dumps({"asset": "SOL", "horizon": 1, "features": rows[:3]}).encode() + b"\n")
+                stream.flush()
+                print(f"🔌 Unix socket: {json.loads(stream.readline())}")
+            unix.shutdown()
+
+        print("📦 Exporting serving models the way training does...")
+        indicators = compute_panel_indicators(synthetic_prices(2, 600)).dropna()
+        saved = export_serving_models(indicators, [6], n_estimators=10, max_depth=6)
+        assert saved == [asset_model_name(asset, 6) for asset in ["SYN000", "SYN001"]]
+        with PredictionService() as service:
+            row = indicators.drop(columns=["asset", "timestamp"]).iloc[-1].to_dict()
+            predictions = {asset: service.predict(asset, 6, row) for asset in ["SYN000", "SYN001"]}
+        print(f"🔮 {predictions}")
+
+    print("✅ Prediction server works in-process, over HTTP and over a Unix socket.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+✂️ Tuning benchmark: exhaustive GridSearchCV vs successive halving with warm-started forests.
+
+Both search PARAM_GRID over the same purged walk-forward folds on synthetic, autocorrelated
+data; the winners are refit on the training rows and scored on a later holdout. Then a
+multi-asset panel (sorted by timestamp, asset) checks that the folds purge whole hours of
+every asset when the timestamps are passed.
+
+Run: `python -m scripts.test.tuning_benchmark [n_rows]`
+"""
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+import pandas as pd
+from sklearn.metrics import r2_score
+from scripts.models.walk_forward import MAX_HORIZON_HOURS, WalkForwardSplit
+from scripts.models.random_forest import RandomForestModel
+
+
+def synthetic_data(n_rows, n_features=15, seed=0):
+    rng = np.random.default_rng(seed)
+    drift = np.cumsum(rng.normal(size=(n_rows, n_features)), axis=0) * 0.05
+    X = pd.DataFrame((rng.normal(size=(n_rows, n_features)) + drift).astype(np.float32),
+                     columns=[f"f{i}" for i in range(n_features)])
+    y = np.sin(X["f0"]) * 2 + X["f1"] * X["f2"] + 0.5 * X["f3"] + rng.normal(scale=0.5, size=n_rows)
+    return X, y
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    X, y = synthetic_data(n_rows)
+    split = int(n_rows * 0.8)
+    X_train, y_train, X_test, y_test = X[:split], y[:split], X[split:], y[split:]
+
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        for method in ("grid", "halving"):
+            model = RandomForestModel()
+            started = time.perf_counter()
+            best_params = model.tune_hyperparameters(X_train, y_train, method=method)
+            elapsed = time.perf_counter() - started
+            rows.append({
+                "method": method,
+                "seconds": round(elapsed, 2),
+                "holdout_r2": round(r2_score(y_test, model.predict(X_test)), 4),
+                "best_params": best_params,
+            })
+
+    results = pd.DataFrame(rows)
+    print(results.to_string(index=False))
+    print(f"⚡ Successive halving took {results['seconds'].iloc[0] / results['seconds'].iloc[1]:.1f}x less time.")
+
+    print("🔍 Multi-asset panel (4 assets, rows sorted by timestamp, asset)...")
+    n_assets, n_hours = 4, 600
+    X, y = synthetic_data(n_assets * n_hours, seed=1)
+    timestamps = pd.Series(np.repeat(pd.date_range("2025-01-01", periods=n_hours, freq="h", tz="UTC"), n_assets))
+    horizon = pd.Timedelta(hours=MAX_HORIZON_HOURS)
+
+    row_gaps = [timestamps[test].min() - timestamps[train].max() for train, test in WalkForwardSplit().split(X)]
+    print(f"  Counting rows, train ends {min(row_gaps)} before the test block: 24h targets leak")
+    assert min(row_gaps) <= horizon
+    for train, test in WalkForwardSplit().split(X, groups=timestamps):
+        assert timestamps[train].max() + horizon < timestamps[test].min()
+        assert not set(timestamps[train]) & set(timestamps[test])
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        best_params = RandomForestModel().tune_hyperparameters(X, y, method="halving", timestamps=timestamps)
+    print(f"✅ Folds purge {MAX_HORIZON_HOURS}h of every asset; halving on the panel picked {best_params}")
+
+
+if __name__ == "__main__":
+    main()